@@ -2,7 +2,6 @@
 Controlador para manejar descargas de servidores
 """
 import json
-import urllib.request
 import urllib.parse
 import threading
 import os
@@ -10,12 +9,17 @@ from typing import List, Dict, Optional, Callable
 from gi.repository import GLib
 
 from utils.constants import PAPER_API_BASE_URL
+from utils.download_queue import DownloadJob, PRIORITY_USER, get_download_queue
+from utils.download_utils import download_file, format_progress
+from utils.http_client import get_http_client
 
 
 class DownloadController:
     def __init__(self):
         self.download_callback: Optional[Callable[[str], None]] = None
         self.progress_callback: Optional[Callable[[str], None]] = None
+        self.download_queue = get_download_queue()
+        self.http = get_http_client()
     
     def set_download_callback(self, callback: Callable[[str], None]):
         """Establece el callback para mensajes de descarga"""
@@ -39,9 +43,8 @@ class DownloadController:
         """Obtiene las versiones disponibles de PaperMC"""
         try:
             url = f"{PAPER_API_BASE_URL}/projects/paper"
-            with urllib.request.urlopen(url) as response:
-                data = json.loads(response.read().decode())
-                return data.get("versions", [])
+            data = self.http.get_json(url)
+            return data.get("versions", [])
         except Exception as e:
             self._log(f"Error fetching Paper versions: {e}\n")
             return []
@@ -56,35 +59,52 @@ class DownloadController:
     
     def download_paper_jar(self, version: str, target_directory: str, 
                           success_callback: Optional[Callable[[str], None]] = None) -> bool:
-        """Inicia la descarga de un JAR de PaperMC de forma asíncrona"""
-        def download():
-            try:
-                self._log(f"Fetching build information for Paper {version}...\n")
-                
-                # Obtener el último build
-                url = f"{PAPER_API_BASE_URL}/projects/paper/versions/{version}"
-                with urllib.request.urlopen(url) as response:
-                    data = json.loads(response.read().decode())
-                    latest_build = data["builds"][-1]
-                
-                jar_filename = f"paper-{version}-{latest_build}.jar"
-                download_url = f"{PAPER_API_BASE_URL}/projects/paper/versions/{version}/builds/{latest_build}/downloads/{jar_filename}"
-                target_path = os.path.join(target_directory, jar_filename)
-                
-                self._log(f"Downloading {jar_filename}...\n")
-                self._progress("Downloading...")
-                
-                urllib.request.urlretrieve(download_url, target_path)
-                
-                GLib.idle_add(self._log, f"Successfully downloaded {jar_filename}.\n")
-                GLib.idle_add(self._progress, "Download completed!")
-                
-                if success_callback:
-                    GLib.idle_add(success_callback, jar_filename)
-                
-            except Exception as e:
-                GLib.idle_add(self._log, f"Error downloading PaperMC JAR: {e}\n")
-                GLib.idle_add(self._progress, "Download failed!")
-        
-        threading.Thread(target=download, daemon=True).start()
+        """Encola la descarga de un JAR de PaperMC"""
+        def download(job: DownloadJob) -> str:
+            GLib.idle_add(self._log, f"Fetching build information for Paper {version}...\n")
+            
+            # Obtener el último build
+            url = f"{PAPER_API_BASE_URL}/projects/paper/versions/{version}"
+            data = self.http.get_json(url)
+            latest_build = data["builds"][-1]
+            
+            # Obtener el nombre y el hash SHA-256 publicados para el build
+            build_url = f"{PAPER_API_BASE_URL}/projects/paper/versions/{version}/builds/{latest_build}"
+            build_data = self.http.get_json(build_url)
+            application = build_data.get("downloads", {}).get("application", {})
+
+            jar_filename = application.get("name") or f"paper-{version}-{latest_build}.jar"
+            download_url = f"{PAPER_API_BASE_URL}/projects/paper/versions/{version}/builds/{latest_build}/downloads/{jar_filename}"
+            target_path = os.path.join(target_directory, jar_filename)
+            
+            GLib.idle_add(self._log, f"Downloading {jar_filename}...\n")
+            GLib.idle_add(self._progress, "Downloading...")
+            
+            def on_progress(downloaded, total, speed):
+                message = f"Downloading... {format_progress(downloaded, total, speed)}"
+                GLib.idle_add(self._progress, message)
+                job.set_progress(message)
+
+            download_file(
+                download_url,
+                target_path,
+                expected_hashes={"sha256": application.get("sha256", "")},
+                progress_callback=on_progress,
+                cancel_event=job.cancel_event,
+            )
+            return jar_filename
+
+        def on_success(jar_filename: str):
+            GLib.idle_add(self._log, f"Successfully downloaded {jar_filename}.\n")
+            GLib.idle_add(self._progress, "Download completed!")
+            if success_callback:
+                GLib.idle_add(success_callback, jar_filename)
+
+        def on_error(error: Exception):
+            GLib.idle_add(self._log, f"Error downloading PaperMC JAR: {error}\n")
+            GLib.idle_add(self._progress, "Download failed!")
+
+        self.download_queue.submit(
+            download, f"Paper {version}", PAPER_API_BASE_URL, PRIORITY_USER, on_success, on_error
+        )
         return True
@@ -2,29 +2,92 @@
 Controlador para manejar plugins y mods
 """
 import json
-import urllib.request
+import urllib.error
 import urllib.parse
 import threading
+import time
 import os
 import socket
-import zipfile
-import re
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional, Callable
 from gi.repository import GLib
 
 from models.plugin import Plugin
+from models.install_plan import InstallPlan, PlannedInstall
+from models.fleet_install import (
+    STATUS_FAILED, STATUS_INSTALLED, STATUS_SKIPPED, STATUS_UP_TO_DATE, STATUS_UPDATED, FleetInstallResult,
+)
+from models.modpack import Modpack
+from models.plugin_update import PluginUpdate
+from models.server import MinecraftServer
 from utils.constants import (
     MODRINTH_API_BASE_URL,
     SPIGET_API_BASE_URL,
     CURSEFORGE_API_BASE_URL,
 )
-from utils.file_utils import get_plugins_and_mods, load_json_file, save_json_file
+from utils.download_queue import (
+    DownloadJob,
+    PRIORITY_BACKGROUND,
+    PRIORITY_DEPENDENCY,
+    PRIORITY_USER,
+    get_download_queue,
+)
+from utils.download_utils import DownloadCancelledError, curseforge_hashes, download_file, format_progress
+from utils.duplicate_jars import DuplicateGroup, find_duplicate_jars, version_sort_key
+from utils.file_utils import get_plugins_and_mods, hash_file
+from utils.http_client import get_http_client
+from utils.jar_metadata import get_jar_metadata_cache, read_jar_metadata
+from utils.jar_store import get_jar_store
+from utils.modpack_reader import extract_overrides, read_modpack, safe_join
+from utils.plugin_catalog import get_plugin_catalog, parse_timestamp, plugin_to_project
+from utils.plugin_metadata_store import get_plugin_metadata_store
+from utils.server_platform import ServerPlatform, detect_server_platform
+from utils.startup_profiler import StartupProfile, load_startup_history, profile_log_file, save_startup_profile
+from utils.search_utils import SEARCH_PAGE_SIZE, SearchResultCache, append_search_results, merge_search_results
+
+# Loaders de Modrinth válidos para la carpeta plugins/ si no se detecta la plataforma
+PLUGIN_LOADERS = ("bukkit", "spigot", "paper", "purpur", "folia")
+HASH_WORKERS = min(8, os.cpu_count() or 4)
+DEPENDENCY_WORKERS = 4
+SCAN_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+SPIGET_WORKERS = 6
+# Fuentes que se pueden actualizar a partir del project_id guardado en los metadatos
+TRACKED_UPDATE_SOURCES = ("Spigot", "CurseForge")
+INSTALL_METHODS = {method.lower(): method for method in ("Manual", "Modrinth", "Spigot", "CurseForge")}
+DISABLED_SUFFIX = ".disabled"
+# Carpeta de destino de cada classId de CurseForge; el resto (resource packs,
+# shaders, mundos...) no hace falta en un servidor
+CURSEFORGE_CLASS_DIRS = {6: "mods", 5: "plugins"}
+# Sincronización incremental del catálogo local: cada cuánto y cuántas páginas como máximo
+CATALOG_SYNC_INTERVAL_SECONDS = 6 * 3600
+CATALOG_SYNC_PAGE_SIZE = 100
+CATALOG_SYNC_MAX_PAGES = 20
+# Hilos para consultar las fuentes de búsqueda (dos por fuente, para que una
+# consulta sustituida que aún espera respuesta no retrase a la nueva); las que
+# quedan en cola tras ser sustituidas se descartan sin tocar la red
+SEARCH_WORKERS = 6
 
 
 class PluginController:
     def __init__(self):
         self.search_callback: Optional[Callable[[str], None]] = None
         self.plugins_updated_callback: Optional[Callable[[List[Plugin]], None]] = None
+        self.progress_callback: Optional[Callable[[str], None]] = None
+        self.plugin_scanned_callback: Optional[Callable[[int, Plugin, int, int], None]] = None
+        self.download_queue = get_download_queue()
+        self.http = get_http_client()
+        self.jar_cache = get_jar_metadata_cache()
+        self.jar_store = get_jar_store()
+        self._search_lock = threading.Lock()
+        self._search_generation = 0
+        self._scan_generation = 0
+        self._search_cancel_event: Optional[threading.Event] = None
+        self.search_cache = SearchResultCache()
+        self.catalog = get_plugin_catalog()
+        self._search_state: Optional[Dict] = None
+        self._search_executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="plugin-search")
     
     def set_search_callback(self, callback: Callable[[str], None]):
         """Establece el callback para mensajes de búsqueda"""
@@ -34,11 +97,129 @@ class PluginController:
         """Establece el callback para cuando se actualizan los plugins"""
         self.plugins_updated_callback = callback
     
+    def set_progress_callback(self, callback: Callable[[str], None]):
+        """Establece el callback para el progreso de descargas"""
+        self.progress_callback = callback
+    
+    def set_plugin_scanned_callback(self, callback: Callable[[int, Plugin, int, int], None]):
+        """Establece el callback para cada JAR leído durante un refresco (index, plugin, done, total)"""
+        self.plugin_scanned_callback = callback
+    
     def _log(self, message: str):
         """Envía un mensaje de log"""
         if self.search_callback:
             self.search_callback(message)
 
+    def _progress(self, message: str):
+        """Envía un mensaje de progreso de descarga"""
+        if self.progress_callback:
+            self.progress_callback(message)
+
+    def _download(self, url: str, file_path: str, expected_hashes: Optional[Dict[str, str]] = None,
+                  job: Optional[DownloadJob] = None) -> Dict[str, str]:
+        """Descarga un archivo con el motor compartido informando del progreso
+        
+        Si el almacén de JAR ya tiene un archivo con alguno de los hashes
+        esperados se instala desde allí sin descargar nada; lo descargado se
+        añade al almacén para los demás servidores. Los hashes devueltos
+        incluyen el sha256 con el que el archivo quedó en el almacén.
+        """
+        filename = os.path.basename(file_path)
+
+        sha256 = self.jar_store.find(expected_hashes)
+        if sha256:
+            try:
+                method = self.jar_store.deploy(sha256, file_path)
+                GLib.idle_add(self._log, f"{filename}: reused from the shared jar store ({method})\n")
+                return {"sha256": sha256}
+            except (OSError, ValueError) as e:
+                # Blob alterado o ilegible: se descarga de nuevo
+                GLib.idle_add(self._log, f"{filename}: {e}\n")
+
+        def on_progress(downloaded, total, speed):
+            message = f"{filename}: {format_progress(downloaded, total, speed)}"
+            GLib.idle_add(self._progress, message)
+            if job:
+                job.set_progress(message)
+
+        try:
+            digests = download_file(
+                url,
+                file_path,
+                expected_hashes=expected_hashes,
+                progress_callback=on_progress,
+                cancel_event=job.cancel_event if job else None,
+            )
+        finally:
+            GLib.idle_add(self._progress, "")
+
+        try:
+            digests = dict(digests, sha256=self.jar_store.add(file_path, digests))
+        except OSError as e:
+            GLib.idle_add(self._log, f"Could not add {filename} to the shared jar store: {e}\n")
+        return digests
+
+    def collect_jar_store_garbage(self, server_paths: List[str]):
+        """Elimina en segundo plano los archivos del almacén de JAR que ningún servidor usa
+
+        El sha256 de cada JAR instalado sale de la caché de metadatos, que lo
+        guarda por identidad de archivo: solo se leen los JAR nuevos o
+        modificados desde el último refresco.
+        """
+        def perform_collect(job: DownloadJob) -> int:
+            referenced = set()
+            for server_path in server_paths:
+                for _, full_path in get_plugins_and_mods(server_path):
+                    if job.is_cancelled():
+                        raise DownloadCancelledError("Jar store cleanup cancelled")
+                    sha256 = self.jar_cache.get(full_path).get("sha256")
+                    if not sha256:
+                        # Sin hash no se puede saber qué blob usa: no se elimina nada
+                        return 0
+                    referenced.add(sha256)
+            self.jar_cache.save()
+            return self.jar_store.collect_garbage(referenced)
+
+        def on_success(removed: int):
+            if removed:
+                GLib.idle_add(self._log, f"Removed {removed} unused files from the shared jar store.\n")
+
+        def on_error(error: Exception):
+            GLib.idle_add(self._log, f"DEBUG: Jar store cleanup skipped: {error}\n")
+
+        self.download_queue.submit(
+            perform_collect, "Clean up shared jar store", "local", PRIORITY_BACKGROUND, on_success, on_error,
+            retry=False,
+        )
+
+    def _describe_error(self, error: Exception, source: str, action: str = "Download") -> str:
+        """Convierte una excepción de descarga en un mensaje legible"""
+        if isinstance(error, urllib.error.HTTPError):
+            return f"HTTP Error {error.code}: {error.reason}"
+        if isinstance(error, socket.timeout) or (
+            isinstance(error, urllib.error.URLError) and isinstance(error.reason, socket.timeout)
+        ):
+            return f"Connection to {source} timed out"
+        if isinstance(error, urllib.error.URLError):
+            return f"URL Error: {error.reason}"
+        if isinstance(error, (LookupError, ValueError, DownloadCancelledError)):
+            return str(error)
+        return f"{action} error: {str(error)}"
+
+    def _submit_download(self, name: str, url: str, func: Callable[[DownloadJob], str],
+                         callback: Callable[[bool, str], None], source: str,
+                         action: str = "Download", priority: int = PRIORITY_USER) -> DownloadJob:
+        """Encola un trabajo de descarga y traduce su resultado al callback (success, message)"""
+        def on_success(message: str):
+            GLib.idle_add(callback, True, message)
+
+        def on_error(error: Exception):
+            error_msg = self._describe_error(error, source, action)
+            GLib.idle_add(callback, False, error_msg)
+            GLib.idle_add(self._log, f"{action} failed: {error_msg}\n")
+
+        return self.download_queue.submit(func, name, url, priority, on_success, on_error)
+
     def _detect_plugin_type(self, filename: str) -> Optional[str]:
         """Detecta si un archivo es un plugin o mod.
 
@@ -54,31 +235,13 @@ class PluginController:
             return "mod"
         return "plugin"
     
-    def _get_plugin_metadata_file(self, server_path: str) -> str:
-        """Obtiene la ruta del archivo de metadatos de plugins"""
-        return os.path.join(server_path, ".plugin_metadata.json")
-    
+    def _folder_plugin_type(self, file_path: str) -> str:
+        """Tipo de un JAR instalado según su carpeta: "mod" en ``mods/``, "plugin" en el resto"""
+        return "mod" if os.path.basename(os.path.dirname(file_path)) == "mods" else "plugin"
+
     def _load_plugin_metadata(self, server_path: str) -> Dict[str, Dict]:
-        """Carga los metadatos de plugins de un servidor"""
-        metadata_file = self._get_plugin_metadata_file(server_path)
-        if not os.path.exists(metadata_file):
-            return {}
-        try:
-            data = load_json_file(metadata_file)
-            return data if isinstance(data, dict) else {}
-        except Exception as e:
-            GLib.idle_add(self._log, f"Error loading plugin metadata: {e}\n")
-            return {}
-    
-    def _save_plugin_metadata(self, server_path: str, metadata: Dict[str, Dict]) -> bool:
-        """Guarda los metadatos de plugins de un servidor"""
-        metadata_file = self._get_plugin_metadata_file(server_path)
-        try:
-            save_json_file(metadata_file, metadata)
-            return True
-        except Exception as e:
-            GLib.idle_add(self._log, f"Error saving plugin metadata: {e}\n")
-            return False
+        """Copia de los metadatos de plugins de un servidor"""
+        return get_plugin_metadata_store(server_path).snapshot()
     
     def _add_plugin_metadata(
         self,
@@ -89,21 +252,25 @@ class PluginController:
         plugin_type: str = "plugin",
     ):
         """Añade metadatos para un plugin"""
-        metadata = self._load_plugin_metadata(server_path)
-        metadata[plugin_name] = {
-            "install_method": install_method.capitalize(),
+        get_plugin_metadata_store(server_path).set(plugin_name, {
+            "install_method": self._canonical_install_method(install_method),
             "project_id": project_id,
             "installed_at": __import__("datetime").datetime.now().isoformat(),
             "type": plugin_type,
-        }
-        self._save_plugin_metadata(server_path, metadata)
+        })
     
+    def _canonical_install_method(self, install_method: Optional[str]) -> str:
+        """Nombre normalizado de la fuente (los metadatos antiguos guardan "Curseforge")"""
+        install_method = install_method or "Manual"
+        return INSTALL_METHODS.get(install_method.lower(), install_method.capitalize())
+
     def _remove_plugin_metadata(self, server_path: str, plugin_name: str):
         """Elimina metadatos de un plugin"""
-        metadata = self._load_plugin_metadata(server_path)
-        if plugin_name in metadata:
-            del metadata[plugin_name]
-            self._save_plugin_metadata(server_path, metadata)
+        get_plugin_metadata_store(server_path).remove(plugin_name)
+
+    def flush_plugin_metadata(self, server_path: str) -> bool:
+        """Escribe en disco los cambios de metadatos pendientes de un servidor"""
+        return get_plugin_metadata_store(server_path).flush()
 
     def _extract_version_from_jar(self, file_path: str) -> str:
         """Obtiene la versión desde los metadatos del JAR.
@@ -113,260 +280,857 @@ class PluginController:
         (mods.toml). Si no se puede determinar la versión se devuelve
         "Unknown".
         """
-        try:
-            with zipfile.ZipFile(file_path, "r") as jar:
-                if "plugin.yml" in jar.namelist():
-                    data = jar.read("plugin.yml").decode("utf-8", errors="ignore")
-                    match = re.search(r"^version:\s*(.+)$", data, re.MULTILINE)
-                    if match:
-                        return match.group(1).strip()
-
-                for json_file in ["fabric.mod.json", "quilt.mod.json"]:
-                    if json_file in jar.namelist():
-                        try:
-                            meta = json.loads(jar.read(json_file).decode("utf-8"))
-                            version = meta.get("version")
-                            if version:
-                                return str(version)
-                        except Exception:
-                            pass
-
-                for toml_file in ["mods.toml", "META-INF/mods.toml"]:
-                    if toml_file in jar.namelist():
-                        text = jar.read(toml_file).decode("utf-8", errors="ignore")
-                        match = re.search(r'version\s*=\s*"([^"]+)"', text)
-                        if match:
-                            return match.group(1).strip()
-        except Exception as e:
-            GLib.idle_add(self._log, f"Error extracting version from {os.path.basename(file_path)}: {e}\n")
-
-        return "Unknown"
+        return read_jar_metadata(file_path, with_hashes=False).get("version") or "Unknown"
     
-    def get_local_plugins(self, server_path: str) -> List[Plugin]:
-        """Obtiene la lista de plugins locales de un servidor"""
-        plugins = []
+    def _make_local_plugin(self, filename: str, full_path: str, metadata: Dict[str, Dict],
+                           jar_metadata: Dict) -> Plugin:
+        plugin_name = filename.replace('.jar', '')
+        plugin_metadata = metadata.get(plugin_name, {})
+
+        install_method = self._canonical_install_method(plugin_metadata.get("install_method"))
+        project_id = plugin_metadata.get("project_id")
+        version = jar_metadata.get("version") or "Unknown"
+
+        plugin = Plugin(
+            name=plugin_name,
+            source="Local",
+            version=version,
+            file_path=full_path,
+            install_method=install_method
+        )
+        plugin.project_id = project_id
+        plugin.jar_metadata = jar_metadata
+        plugin.client_only = jar_metadata.get("environment") == "client"
+        return plugin
+
+    def _scan_local_plugins(self, server_path: str,
+                            on_plugin: Optional[Callable[[int, Plugin, int, int], None]] = None) -> List[Plugin]:
+        """Lee los JAR del servidor en paralelo
+        
+        ``on_plugin(index, plugin, done, total)`` se invoca (desde este hilo)
+        a medida que termina cada JAR, en orden de finalización; ``index`` es
+        su posición en la lista final.
+        """
         items = get_plugins_and_mods(server_path)
         metadata = self._load_plugin_metadata(server_path)
+        plugins: List[Optional[Plugin]] = [None] * len(items)
+        if not items:
+            return []
+
+        # Solo se abren los JAR nuevos o modificados desde el último refresco
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(items))) as executor:
+            futures = {executor.submit(self.jar_cache.get, full_path): index
+                       for index, (_, full_path) in enumerate(items)}
+            for done, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                filename, full_path = items[index]
+                plugins[index] = self._make_local_plugin(filename, full_path, metadata, future.result())
+                if on_plugin:
+                    on_plugin(index, plugins[index], done, len(items))
+
+        self.jar_cache.save()
+        return plugins
+
+    def get_local_plugins(self, server_path: str) -> List[Plugin]:
+        """Obtiene la lista de plugins locales de un servidor"""
+        return self._scan_local_plugins(server_path)
+    
+    def refresh_local_plugins(self, server_path: str):
+        """Refresca en segundo plano la lista de plugins locales y notifica a la vista
         
-        for filename, full_path in items:
-            plugin_name = filename.replace('.jar', '')
-            plugin_metadata = metadata.get(plugin_name, {})
+        Cada JAR leído se entrega al callback de escaneo en cuanto termina y,
+        al final, la lista completa al callback de plugins actualizados. Si
+        se inicia otro refresco, el anterior deja de notificar.
+        """
+        with self._search_lock:
+            self._scan_generation += 1
+            generation = self._scan_generation
+
+        def is_current() -> bool:
+            return generation == self._scan_generation
+
+        def on_plugin(index: int, plugin: Plugin, done: int, total: int):
+            if self.plugin_scanned_callback and is_current():
+                GLib.idle_add(self._deliver_scan, generation, self.plugin_scanned_callback, index, plugin, done, total)
+
+        def perform_scan():
+            try:
+                plugins = self._scan_local_plugins(server_path, on_plugin)
+            except Exception as e:
+                GLib.idle_add(self._log, f"Error scanning plugins: {e}\n")
+                plugins = []
+            if self.plugins_updated_callback and is_current():
+                GLib.idle_add(self._deliver_scan, generation, self.plugins_updated_callback, plugins)
+
+        threading.Thread(target=perform_scan, daemon=True).start()
+
+    def _deliver_scan(self, generation: int, callback: Callable, *args):
+        """Entrega un resultado de escaneo si sigue siendo el más reciente"""
+        if generation == self._scan_generation:
+            callback(*args)
+        return False
+    
+    def _fetch_modrinth_results(self, query: str, search_type: str = "", page: int = 0) -> List[Plugin]:
+        """Consulta una página de la búsqueda de Modrinth y la devuelve como plugins"""
+        encoded_query = urllib.parse.quote(query)
+        url = (f"{MODRINTH_API_BASE_URL}/search?query={encoded_query}"
+               f"&limit={SEARCH_PAGE_SIZE}&offset={page * SEARCH_PAGE_SIZE}")
+
+        # Agregar facets para filtrar por tipo de proyecto; sin tipo se piden
+        # mods y plugins para que las páginas no lleguen recortadas
+        if search_type in ["plugin", "mod"]:
+            facet = urllib.parse.quote(f'[["project_type:{search_type}"]]')
+        else:
+            facet = urllib.parse.quote('[["project_type:mod","project_type:plugin"]]')
+        url += f"&facets={facet}"
+
+        data = self.http.get_json(url)
+        return [plugin for plugin in map(self._modrinth_hit_to_plugin, (data or {}).get("hits", [])) if plugin]
+
+    def _modrinth_hit_to_plugin(self, hit: Dict) -> Optional[Plugin]:
+        """Convierte un resultado de la búsqueda de Modrinth; None si no es un mod ni un plugin"""
+        # Usar el atributo 'project_type' directamente de la respuesta
+        project_type = sys.intern(hit.get("project_type", "").lower())
+        categories = hit.get("categories", [])
+
+        # Solo incluir mods y plugins, excluir modpacks y otros tipos
+        if project_type not in ["mod", "plugin"]:
+            return None
 
-            install_method = plugin_metadata.get("install_method", "Manual")
-            project_id = plugin_metadata.get("project_id")
-            version = self._extract_version_from_jar(full_path)
+        # Detectar plugins basándose en las categorías
+        plugin_categories = ["spigot", "paper", "bukkit", "purpur", "waterfall", "velocity"]
+        is_plugin = any(cat.lower() in plugin_categories for cat in categories)
+
+        # Si tiene categorías de servidor, es un plugin, no un mod
+        if is_plugin:
+            project_type = "plugin"
+
+        name = hit.get("title", "N/A")
+        description = hit.get("description", "")[:200] + "..." if len(hit.get("description", "")) > 200 else hit.get("description", "")
+        icon_url = hit.get("icon_url", "")
+        project_id = hit.get("project_id", "") or hit.get("id", "")  # Obtener el ID del proyecto
+        version = "Latest"
+        if hit.get("versions"):
+            version = hit["versions"][0] if hit["versions"] else "Latest"
+
+        plugin = Plugin(
+            name=name,
+            source="Modrinth",
+            version=version,
+            description=description
+        )
+        # Usar el tipo de proyecto directamente de la API de Modrinth
+        plugin.project_type = project_type
+        # Añadir la URL del icono como atributo
+        plugin.icon_url = icon_url
+        # Añadir el ID del proyecto
+        plugin.project_id = project_id
+        # Datos usados para deduplicar y ordenar la búsqueda combinada
+        plugin.slug = hit.get("slug", "")
+        plugin.author = hit.get("author", "")
+        plugin.downloads = hit.get("downloads", 0)
+        plugin.client_only = self._is_client_only_project(hit)
+        return plugin
+
+    def _is_client_only_project(self, project: Dict) -> bool:
+        """Un proyecto de Modrinth que no se puede usar en el servidor es solo para el cliente"""
+        return project.get("server_side") == "unsupported"
+
+    def _fetch_spigot_results(self, query: str, page: int = 0) -> List[Plugin]:
+        """Consulta una página de la búsqueda de Spiget y la devuelve como plugins"""
+        encoded_query = urllib.parse.quote(query)
+        # Las páginas de Spiget empiezan en 1
+        url = f"{SPIGET_API_BASE_URL}/search/resources/{encoded_query}?size={SEARCH_PAGE_SIZE}&page={page + 1}"
+        data = self.http.get_json(url)
+        return [self._spigot_item_to_plugin(item) for item in data or []]
+
+    def _spigot_item_to_plugin(self, item: Dict) -> Plugin:
+        """Convierte un recurso de Spiget"""
+        resource_id = str(item.get("id", ""))
+        plugin = Plugin(
+            name=item.get("name", "N/A"),
+            source="Spigot",
+            version="Latest",
+            description=item.get("tag", ""),
+            install_method="Spigot",
+        )
+        plugin.project_id = resource_id
+        plugin.project_type = "plugin"
+        plugin.icon_url = f"{SPIGET_API_BASE_URL}/resources/{resource_id}/icon"
+        plugin.downloads = item.get("downloads", 0)
+        return plugin
+
+    def _fetch_curseforge_results(self, query: str, search_type: str, api_key: str, page: int = 0) -> List[Plugin]:
+        """Consulta una página de la búsqueda de CurseForge y la devuelve como plugins"""
+        encoded_query = urllib.parse.quote(query)
+        url = (f"{CURSEFORGE_API_BASE_URL}/mods/search?gameId=432&searchFilter={encoded_query}"
+               f"&pageSize={SEARCH_PAGE_SIZE}&index={page * SEARCH_PAGE_SIZE}")
+
+        # Filtrar por tipo si se especifica (mods vs plugins)
+        if search_type == "mod":
+            url += "&classId=6"
+        elif search_type == "plugin":
+            url += "&classId=5"
+
+        data = self.http.get_json(url, headers={"x-api-key": api_key})
 
+        plugins = []
+        for item in (data or {}).get("data", []):
+            name = item.get("name", "N/A")
+            description = item.get("summary", "")
+            project_id = str(item.get("id", ""))
+            logo = item.get("logo") or {}
+            icon_url = logo.get("url", "")
+            class_id = item.get("classId", 6)
+            project_type = "plugin" if class_id == 5 else "mod"
             plugin = Plugin(
-                name=plugin_name,
-                source="Local",
-                version=version,
-                file_path=full_path,
-                install_method=install_method
+                name=name,
+                source="CurseForge",
+                version="Latest",
+                description=description,
+                install_method="CurseForge",
             )
             plugin.project_id = project_id
+            plugin.icon_url = icon_url
+            plugin.project_type = project_type
+            plugin.slug = item.get("slug", "")
+            authors = item.get("authors") or []
+            plugin.author = authors[0].get("name", "") if authors else ""
+            plugin.downloads = item.get("downloadCount", 0)
             plugins.append(plugin)
-        
         return plugins
-    
-    def refresh_local_plugins(self, server_path: str):
-        """Refresca la lista de plugins locales y notifica a la vista"""
-        plugins = self.get_local_plugins(server_path)
-        if self.plugins_updated_callback:
-            self.plugins_updated_callback(plugins)
-    
-    def search_modrinth_plugins(self, query: str, callback: Callable[[List[Plugin]], None], search_type: str = ""):
-        """Busca plugins en Modrinth de forma asíncrona
+
+    def _log_search_error(self, source: str, error: Exception):
+        """Registra un error de búsqueda con un mensaje adecuado a su tipo"""
+        if isinstance(error, urllib.error.HTTPError):
+            message = f"DEBUG: HTTP Error {error.code} from {source}: {error.reason}\n"
+        elif isinstance(error, socket.timeout) or (
+            isinstance(error, urllib.error.URLError) and isinstance(error.reason, socket.timeout)
+        ):
+            message = f"DEBUG: Connection to {source} timed out\n"
+        elif isinstance(error, urllib.error.URLError):
+            message = f"DEBUG: URL Error from {source}: {error.reason}\n"
+        else:
+            message = f"DEBUG: Error searching {source}: {error}\n"
+        GLib.idle_add(self._log, message)
+
+    def get_enabled_search_sources(self, search_type: str = "") -> List[str]:
+        """Fuentes que participan en la búsqueda combinada"""
+        sources = ["Modrinth"]
+        # Spigot solo publica plugins
+        if search_type != "mod":
+            sources.append("Spigot")
+        if os.environ.get("CURSEFORGE_API_KEY"):
+            sources.append("CurseForge")
+        return sources
+
+    def _search_fetchers(self, query: str, search_type: str, page: int,
+                         offline: bool = False) -> Dict[str, Callable[[], List[Plugin]]]:
+        """Funciones que consultan una página de cada fuente (o del catálogo local si ``offline``)"""
+        if offline:
+            return {
+                source: lambda source=source: self.catalog.search(
+                    query, search_type, source, SEARCH_PAGE_SIZE, page * SEARCH_PAGE_SIZE
+                )
+                for source in ("Modrinth", "Spigot", "CurseForge")
+            }
+        api_key = os.environ.get("CURSEFORGE_API_KEY", "")
+        return {
+            "Modrinth": lambda: self._fetch_modrinth_results(query, search_type, page),
+            "Spigot": lambda: self._fetch_spigot_results(query, page),
+            "CurseForge": lambda: self._fetch_curseforge_results(query, search_type, api_key, page),
+        }
+
+    def _is_unreachable_error(self, error: Exception) -> bool:
+        """Errores que indican que la API no está disponible (sin red, caída o timeout)"""
+        if isinstance(error, urllib.error.HTTPError):
+            return error.code >= 500
+        return isinstance(error, (urllib.error.URLError, socket.timeout, ConnectionError))
+
+    def _remember_in_catalog(self, plugins: List[Plugin]):
+        """Guarda resultados online en el catálogo local para poder buscarlos sin conexión"""
+        try:
+            self.catalog.add_plugins(plugins)
+        except sqlite3.Error as e:
+            GLib.idle_add(self._log, f"DEBUG: Could not update the offline catalog: {e}\n")
+
+    def _catalog_fallback(self, source: str, query: str, search_type: str, page: int,
+                          error: Exception) -> Optional[List[Plugin]]:
+        """Resultados del catálogo local cuando la API de ``source`` no responde"""
+        if not self._is_unreachable_error(error):
+            return None
+        try:
+            plugins = self.catalog.search(query, search_type, source, SEARCH_PAGE_SIZE, page * SEARCH_PAGE_SIZE)
+        except sqlite3.Error:
+            return None
+        GLib.idle_add(self._log, f"{source} is unreachable: showing {len(plugins)} results from the offline catalog.\n")
+        return plugins
+
+    def search_all_plugins(self, query: str, callback: Callable[[List[Plugin]], None], search_type: str = "",
+                           sources: Optional[List[str]] = None, offline: bool = False):
+        """Busca en todas las fuentes habilitadas a la vez
+        
+        Cada fuente se consulta en un hilo del grupo de búsqueda. Cuando una termina, se
+        entrega al callback la lista combinada (deduplicada y ordenada) con
+        lo recibido hasta ese momento, así una fuente lenta no retrasa a las
+        demás. Las fuentes con la consulta en caché responden al momento y,
+        mientras llega la respuesta del resto, se muestran provisionalmente
+        los resultados filtrados de una consulta prefijo. Una búsqueda nueva
+        cancela la anterior y sus resultados pendientes se descartan.
+        
+        Solo se pide la primera página; las siguientes se obtienen con
+        ``load_more_search_results``. Los resultados online se guardan en el
+        catálogo local, que se consulta en su lugar si una API no responde.
         
         Args:
             query: Término de búsqueda
-            callback: Función callback para los resultados
+            callback: Recibe la lista combinada cada vez que responde una fuente
             search_type: Tipo de búsqueda ("plugin", "mod", o "" para ambos)
+            sources: Fuentes a consultar (por defecto, todas las habilitadas)
+            offline: Buscar solo en el catálogo local, sin usar la red
         """
-        def perform_search():
+        fetchers = self._search_fetchers(query, search_type, 0, offline)
+        sources = sources or (list(fetchers) if offline else self.get_enabled_search_sources(search_type))
+        if "CurseForge" in sources and not offline and not os.environ.get("CURSEFORGE_API_KEY"):
+            GLib.idle_add(self._log, "DEBUG: Missing CurseForge API key\n")
+            sources = [source for source in sources if source != "CurseForge"]
+        sources = [source for source in sources if source in fetchers]
+
+        generation, cancel_event = self._start_search_generation()
+        state = {
+            "generation": generation,
+            "cancel_event": cancel_event,
+            "query": query,
+            "search_type": search_type,
+            "sources": sources,
+            "page": 0,
+            "offline": offline,
+            "exhausted": set(),
+            "shown": [],
+            "loading": True,
+        }
+        results: Dict[str, List[Plugin]] = {}
+        provisional: Dict[str, List[Plugin]] = {}
+        pending = set()
+        for source in sources:
+            cached = None if offline else self.search_cache.get(source, search_type, query)
+            if cached is not None:
+                results[source] = cached
+                if len(cached) < SEARCH_PAGE_SIZE:
+                    state["exhausted"].add(source)
+                continue
+            pending.add(source)
+            partial = None if offline else self.search_cache.get_prefix(source, search_type, query)
+            if partial:
+                provisional[source] = partial
+
+        def perform_search(source: str):
+            if cancel_event.is_set():
+                return
+            fallback = None
             try:
-                encoded_query = urllib.parse.quote(query)
-                url = f"{MODRINTH_API_BASE_URL}/search?query={encoded_query}"
-                
-                # Agregar facets para filtrar por tipo de proyecto si se especifica
-                if search_type in ["plugin", "mod"]:
-                    facet = urllib.parse.quote(f'[["project_type:{search_type}"]]')
-                    url += f"&facets={facet}"
-                
-                request = urllib.request.Request(url)
-                request.add_header('User-Agent', 'MinecraftServerManager/1.0')
-                
-                with urllib.request.urlopen(request, timeout=10) as response:
-                    data = json.loads(response.read().decode())
-                
-                plugins = []
-                if data and "hits" in data:
-                    total_hits = len(data['hits'])
-                    filtered_count = 0
-                    
-                    for hit in data["hits"]:
-                        # Usar el atributo 'project_type' directamente de la respuesta
-                        project_type = hit.get("project_type", "").lower()
-                        title = hit.get('title', 'Unknown')
-                        categories = hit.get("categories", [])
-                        
-                        # Solo incluir mods y plugins, excluir modpacks y otros tipos
-                        if project_type not in ["mod", "plugin"]:
-                            continue
-                        
-                        # Detectar plugins basándose en las categorías
-                        plugin_categories = ["spigot", "paper", "bukkit", "purpur", "waterfall", "velocity"]
-                        is_plugin = any(cat.lower() in plugin_categories for cat in categories)
-                        
-                        # Si tiene categorías de servidor, es un plugin, no un mod
-                        if is_plugin:
-                            project_type = "plugin"
-                            
-                        filtered_count += 1
-                            
-                        name = hit.get("title", "N/A")
-                        description = hit.get("description", "")[:200] + "..." if len(hit.get("description", "")) > 200 else hit.get("description", "")
-                        icon_url = hit.get("icon_url", "")
-                        project_id = hit.get("project_id", "") or hit.get("id", "")  # Obtener el ID del proyecto
-                        version = "Latest"
-                        if hit.get("versions"):
-                            version = hit["versions"][0] if hit["versions"] else "Latest"
-                        
-                        plugin = Plugin(
-                            name=name,
-                            source="Modrinth",
-                            version=version,
-                            description=description
-                        )
-                        # Usar el tipo de proyecto directamente de la API de Modrinth
-                        plugin.project_type = project_type
-                        # Añadir la URL del icono como atributo
-                        plugin.icon_url = icon_url
-                        # Añadir el ID del proyecto
-                        plugin.project_id = project_id
-                        plugins.append(plugin)
-                    
-                    search_type_desc = search_type or 'both plugins and mods'
-                    GLib.idle_add(self._log, f"Found {len(plugins)} {search_type_desc} from Modrinth.\n")
-                else:
-                    GLib.idle_add(self._log, "No results found from Modrinth.\n")
-                
-                GLib.idle_add(callback, plugins)
-                
-            except urllib.error.HTTPError as e:
-                GLib.idle_add(self._log, f"DEBUG: HTTP Error {e.code}: {e.reason}\n")
-                GLib.idle_add(callback, [])
-            except socket.timeout:
-                GLib.idle_add(self._log, "DEBUG: Connection to Modrinth timed out\n")
-                GLib.idle_add(callback, [])
-            except urllib.error.URLError as e:
-                if isinstance(e.reason, socket.timeout):
-                    GLib.idle_add(self._log, "DEBUG: Connection to Modrinth timed out\n")
-                else:
-                    GLib.idle_add(self._log, f"DEBUG: URL Error: {e.reason}\n")
-                GLib.idle_add(callback, [])
+                plugins = fetchers[source]()
             except Exception as e:
-                GLib.idle_add(self._log, f"DEBUG: Error searching Modrinth: {e}\n")
-                GLib.idle_add(callback, [])
+                if cancel_event.is_set():
+                    return
+                self._log_search_error(source, e)
+                plugins = None
+                fallback = self._catalog_fallback(source, query, search_type, 0, e)
+
+            # Aunque la búsqueda ya no esté vigente, el resultado sirve para la caché
+            if plugins is not None and not offline:
+                self.search_cache.put(source, search_type, query, plugins)
+                self._remember_in_catalog(plugins)
+            with self._search_lock:
+                if cancel_event.is_set():
+                    return
+                results[source] = plugins or fallback or []
+                if len(results[source]) < SEARCH_PAGE_SIZE:
+                    state["exhausted"].add(source)
+                pending.discard(source)
+                provisional.pop(source, None)
+                merged = merge_search_results({**provisional, **results})
+                state["shown"] = list(merged)
+                finished = not pending
+                if finished:
+                    state["loading"] = False
+            if plugins is not None:
+                GLib.idle_add(self._log, f"Found {len(plugins)} results from {source}.\n")
+            GLib.idle_add(self._deliver_search_results, generation, callback, merged)
+            if finished:
+                GLib.idle_add(self._log, f"Search finished: {len(merged)} unique results from {len(sources)} sources.\n")
+
+        with self._search_lock:
+            self._search_state = state
+            if results or provisional or not pending:
+                merged = merge_search_results({**provisional, **results})
+                state["shown"] = list(merged)
+                GLib.idle_add(self._deliver_search_results, generation, callback, merged)
+            state["loading"] = bool(pending)
+        for source in pending:
+            self._search_executor.submit(perform_search, source)
+
+    def load_more_search_results(self, callback: Callable[[List[Plugin]], None]) -> bool:
+        """Pide la página siguiente de la búsqueda actual a las fuentes que tengan más
         
-        threading.Thread(target=perform_search, daemon=True).start()
+        El callback recibe solo los resultados nuevos (sin duplicados de los
+        ya mostrados) para añadirlos al final de la lista.
+        
+        Returns:
+            False si no hay búsqueda activa, ya hay una página en curso o no
+            quedan más resultados
+        """
+        with self._search_lock:
+            state = self._search_state
+            if not state or state["loading"] or state["cancel_event"].is_set():
+                return False
+            sources = [source for source in state["sources"] if source not in state["exhausted"]]
+            if not sources:
+                return False
+            state["loading"] = True
+            state["page"] += 1
+            page = state["page"]
+        pending = set(sources)
+        fetchers = self._search_fetchers(state["query"], state["search_type"], page, state["offline"])
+        cancel_event = state["cancel_event"]
+
+        def perform_load(source: str):
+            if cancel_event.is_set():
+                return
+            fallback = None
+            try:
+                plugins = fetchers[source]()
+                if not state["offline"]:
+                    self._remember_in_catalog(plugins)
+            except Exception as e:
+                if cancel_event.is_set():
+                    return
+                self._log_search_error(source, e)
+                plugins = None
+                fallback = self._catalog_fallback(source, state["query"], state["search_type"], page, e)
 
-    def search_spigot_plugins(self, query: str, callback: Callable[[List[Plugin]], None]):
-        """Busca plugins en Spigot (usando Spiget API) de forma asíncrona"""
+            with self._search_lock:
+                if cancel_event.is_set():
+                    return
+                # Ante un error se deja de paginar esa fuente
+                if plugins is None or len(plugins) < SEARCH_PAGE_SIZE:
+                    state["exhausted"].add(source)
+                new_plugins = append_search_results(state["shown"], {source: plugins or fallback or []})
+                state["shown"].extend(new_plugins)
+                pending.discard(source)
+                if not pending:
+                    state["loading"] = False
+            if new_plugins:
+                GLib.idle_add(self._log, f"Loaded {len(new_plugins)} more results from {source}.\n")
+                GLib.idle_add(self._deliver_search_results, state["generation"], callback, new_plugins)
+
+        for source in sources:
+            self._search_executor.submit(perform_load, source)
+        return True
+
+    def _start_search_generation(self):
+        """Invalida la búsqueda en curso y devuelve el token de la nueva"""
+        cancel_event = threading.Event()
+        with self._search_lock:
+            if self._search_cancel_event:
+                self._search_cancel_event.set()
+            self._search_cancel_event = cancel_event
+            self._search_generation += 1
+            return self._search_generation, cancel_event
+
+    def cancel_search(self):
+        """Cancela la búsqueda en curso; sus resultados ya no se entregarán"""
+        self._start_search_generation()
+
+    def _deliver_search_results(self, generation: int, callback: Callable[[List[Plugin]], None], plugins: List[Plugin]):
+        """Entrega resultados en el hilo principal si la búsqueda sigue vigente"""
+        if generation == self._search_generation:
+            callback(plugins)
+        return False
+
+    def _sync_modrinth_catalog(self, cursor: float, job: DownloadJob) -> tuple:
+        """Trae los proyectos de Modrinth modificados desde ``cursor``; devuelve (guardados, nuevo cursor)"""
+        facet = urllib.parse.quote('[["project_type:mod","project_type:plugin"]]')
+        stored, newest = 0, cursor
+        for page in range(CATALOG_SYNC_MAX_PAGES):
+            if job.is_cancelled():
+                break
+            url = (f"{MODRINTH_API_BASE_URL}/search?index=updated&limit={CATALOG_SYNC_PAGE_SIZE}"
+                   f"&offset={page * CATALOG_SYNC_PAGE_SIZE}&facets={facet}")
+            hits = (self.http.get_json(url) or {}).get("hits", [])
+            projects, reached = [], False
+            for hit in hits:
+                updated = parse_timestamp(hit.get("date_modified"))
+                if updated <= cursor:
+                    reached = True
+                    break
+                newest = max(newest, updated)
+                plugin = self._modrinth_hit_to_plugin(hit)
+                if plugin:
+                    project = plugin_to_project(plugin)
+                    project.update(categories=hit.get("categories") or [], updated_at=updated)
+                    projects.append(project)
+            stored += self.catalog.add_projects(projects)
+            job.set_progress(f"Modrinth: {stored} projects")
+            if reached or len(hits) < CATALOG_SYNC_PAGE_SIZE:
+                break
+        return stored, newest
+
+    def _sync_spigot_catalog(self, cursor: float, job: DownloadJob) -> tuple:
+        """Trae los recursos de Spigot actualizados desde ``cursor``; devuelve (guardados, nuevo cursor)"""
+        stored, newest = 0, cursor
+        for page in range(CATALOG_SYNC_MAX_PAGES):
+            if job.is_cancelled():
+                break
+            url = f"{SPIGET_API_BASE_URL}/resources?size={CATALOG_SYNC_PAGE_SIZE}&page={page + 1}&sort=-updateDate"
+            items = self.http.get_json(url) or []
+            projects, reached = [], False
+            for item in items:
+                updated = parse_timestamp(item.get("updateDate", 0))
+                if updated <= cursor:
+                    reached = True
+                    break
+                newest = max(newest, updated)
+                project = plugin_to_project(self._spigot_item_to_plugin(item))
+                project["updated_at"] = updated
+                projects.append(project)
+            stored += self.catalog.add_projects(projects)
+            job.set_progress(f"Spigot: {stored} projects")
+            if reached or len(items) < CATALOG_SYNC_PAGE_SIZE:
+                break
+        return stored, newest
+
+    def sync_catalog(self, force: bool = False, callback: Optional[Callable[[bool, str], None]] = None):
+        """Actualiza en segundo plano el catálogo local con los proyectos modificados
+        
+        Cada fuente se sincroniza como mucho una vez cada
+        ``CATALOG_SYNC_INTERVAL_SECONDS`` (salvo con ``force``) y solo se
+        piden los proyectos cambiados desde la sincronización anterior. La
+        primera vez se traen las ``CATALOG_SYNC_MAX_PAGES`` páginas más
+        recientes; el resto llega con las búsquedas o con una instantánea.
+        """
+        syncers = {"Modrinth": self._sync_modrinth_catalog, "Spigot": self._sync_spigot_catalog}
+
+        def perform_sync(job: DownloadJob) -> int:
+            stored = 0
+            for source, sync in syncers.items():
+                state = self.catalog.sync_state(source)
+                if not force and time.time() - state["synced_at"] < CATALOG_SYNC_INTERVAL_SECONDS:
+                    continue
+                count, cursor = sync(state["cursor"], job)
+                self.catalog.set_sync_state(source, cursor)
+                stored += count
+            return stored
+
+        def on_success(stored: int):
+            message = f"Offline catalog updated: {stored} projects refreshed, {self.catalog.count()} available offline"
+            if stored:
+                GLib.idle_add(self._log, f"{message}.\n")
+            if callback:
+                GLib.idle_add(callback, True, message)
+
+        def on_error(error: Exception):
+            error_msg = self._describe_error(error, "catalog", "Sync")
+            GLib.idle_add(self._log, f"DEBUG: Offline catalog sync skipped: {error_msg}\n")
+            if callback:
+                GLib.idle_add(callback, False, error_msg)
 
-        def perform_search():
+        self.download_queue.submit(
+            perform_sync, "Sync offline catalog", MODRINTH_API_BASE_URL, PRIORITY_BACKGROUND, on_success, on_error,
+            retry=False,
+        )
+
+    def import_catalog_snapshot(self, file_path: str, callback: Callable[[bool, str], None]):
+        """Importa una instantánea del catálogo (por ejemplo exportada en un equipo con conexión)"""
+        def perform_import():
             try:
-                encoded_query = urllib.parse.quote(query)
-                url = f"{SPIGET_API_BASE_URL}/search/resources/{encoded_query}?size=20"
-                request = urllib.request.Request(url)
-                request.add_header("User-Agent", "MinecraftServerManager/1.0")
-                with urllib.request.urlopen(request, timeout=10) as response:
-                    data = json.loads(response.read().decode())
+                count = self.catalog.import_snapshot(file_path)
+                GLib.idle_add(callback, True, f"Imported {count} projects into the offline catalog")
+            except (ValueError, sqlite3.Error) as e:
+                GLib.idle_add(callback, False, str(e))
 
-                plugins = []
-                for item in data:
-                    name = item.get("name", "N/A")
-                    resource_id = str(item.get("id", ""))
-                    description = item.get("tag", "")
-                    plugin = Plugin(
-                        name=name,
-                        source="Spigot",
-                        version="Latest",
-                        description=description,
-                        install_method="Spigot",
-                    )
-                    plugin.project_id = resource_id
-                    plugin.project_type = "plugin"
-                    plugin.icon_url = f"{SPIGET_API_BASE_URL}/resources/{resource_id}/icon"
-                    plugins.append(plugin)
+        threading.Thread(target=perform_import, daemon=True).start()
 
-                GLib.idle_add(self._log, f"Found {len(plugins)} plugins from Spigot.\n")
-                GLib.idle_add(callback, plugins)
+    def export_catalog_snapshot(self, file_path: str, callback: Callable[[bool, str], None]):
+        """Exporta el catálogo local para llevarlo a equipos sin conexión"""
+        def perform_export():
+            try:
+                count = self.catalog.export_snapshot(file_path)
+                GLib.idle_add(callback, True, f"Exported {count} projects to {os.path.basename(file_path)}")
+            except (OSError, sqlite3.Error) as e:
+                GLib.idle_add(callback, False, str(e))
+
+        threading.Thread(target=perform_export, daemon=True).start()
+
+    def get_server_platform(self, server_path: str) -> ServerPlatform:
+        """Detecta la versión de Minecraft y la plataforma del servidor"""
+        return detect_server_platform(server_path)
+
+    def _modrinth_versions_url(self, project_id: str, platform: ServerPlatform,
+                               loaders: Optional[List[str]] = None) -> str:
+        """URL de las versiones de un proyecto filtradas por loader y versión de juego"""
+        url = f"{MODRINTH_API_BASE_URL}/project/{project_id}/version"
+        params = {}
+        loaders = loaders or platform.modrinth_loaders()
+        if loaders:
+            params["loaders"] = json.dumps(loaders)
+        if platform.game_versions():
+            params["game_versions"] = json.dumps(platform.game_versions())
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        return url
+
+    def _modrinth_project_type(self, project_data: Dict, platform: ServerPlatform) -> str:
+        """Decide si un proyecto de Modrinth se instala como plugin o como mod"""
+        # La plataforma del servidor decide la carpeta cuando se conoce
+        if platform.is_plugin_platform():
+            return "plugin"
+        if platform.is_mod_platform():
+            return "mod"
 
-            except Exception as e:
-                GLib.idle_add(self._log, f"DEBUG: Error searching Spigot: {e}\n")
-                GLib.idle_add(callback, [])
+        project_type = project_data.get("project_type", "mod").lower()
+        categories = project_data.get("categories", [])
+        loaders = project_data.get("loaders", [])
+        
+        # Detectar plugins basándose en las categorías O loaders
+        plugin_categories = ["spigot", "paper", "bukkit", "purpur", "waterfall", "velocity"]
+        plugin_loaders = ["bukkit", "spigot", "paper", "purpur", "waterfall", "velocity"]
+        
+        is_plugin_by_categories = any(cat.lower() in plugin_categories for cat in categories)
+        is_plugin_by_loaders = any(loader.lower() in plugin_loaders for loader in loaders)
+        
+        # Si tiene categorías de servidor, es un plugin, no un mod
+        if is_plugin_by_categories or is_plugin_by_loaders:
+            return "plugin"
+        return "plugin" if project_type == "plugin" else "mod"
+
+    def _latest_modrinth_version(self, project_id: str, name: str, platform: ServerPlatform) -> Dict:
+        """Obtiene la versión compatible más reciente de un proyecto"""
+        versions_data = self.http.get_json(self._modrinth_versions_url(project_id, platform))
+        version = next((v for v in versions_data or [] if v.get("files")), None)
+        if not version:
+            raise LookupError(f"No version of {name} is compatible with {platform.describe()}")
+        return version
+
+    def _primary_file(self, version: Dict) -> Dict:
+        files = version["files"]
+        return next((f for f in files if f.get("primary")), files[0])
+
+    def resolve_modrinth_install(self, project_id: str, server_path: str) -> InstallPlan:
+        """Calcula el plan de instalación de un proyecto y sus dependencias requeridas
+        
+        Las dependencias se expanden por niveles: las que fijan una versión
+        concreta se piden juntas a ``/versions`` y las demás se resuelven en
+        paralelo a la última versión compatible con el servidor. Se omiten
+        los proyectos ya instalados y se avisa de las incompatibilidades.
+        """
+        platform = self.get_server_platform(server_path)
+        metadata = self._load_plugin_metadata(server_path)
+        installed = {
+            entry.get("project_id"): name for name, entry in metadata.items()
+            if isinstance(entry, dict) and entry.get("project_id")
+        }
 
-        threading.Thread(target=perform_search, daemon=True).start()
+        project_data = self.http.get_json(f"{MODRINTH_API_BASE_URL}/project/{project_id}")
+        name = project_data.get("title", project_id)
+        root_version = self._latest_modrinth_version(project_id, name, platform)
+        plan = InstallPlan(PlannedInstall(
+            project_id, name, root_version.get("version_number", "Unknown"), root_version.get("id", ""),
+            self._primary_file(root_version), self._modrinth_project_type(project_data, platform),
+        ))
+
+        if self._is_client_only_project(project_data):
+            plan.warnings.append(f"{name} is a client-only mod and does nothing on a dedicated server")
+
+        planned = {project_id: plan.root}
+        level = [(plan.root, root_version)]
+        while level:
+            pinned: Dict[str, str] = {}  # version_id -> nombre del que lo requiere
+            unpinned: Dict[str, str] = {}  # project_id -> nombre del que lo requiere
+            for item, version in level:
+                for dependency in version.get("dependencies") or []:
+                    dep_type = dependency.get("dependency_type")
+                    dep_project = dependency.get("project_id")
+                    if dep_type == "incompatible":
+                        if dep_project in installed:
+                            plan.warnings.append(f"{item.name} is incompatible with installed {installed[dep_project]}")
+                        continue
+                    if dep_type != "required":
+                        continue
+                    if not dep_project and not dependency.get("version_id"):
+                        plan.warnings.append(
+                            f"{item.name} requires {dependency.get('file_name') or 'an external file'}, "
+                            "which must be installed manually"
+                        )
+                        continue
+                    if dep_project in planned:
+                        continue
+                    if dep_project in installed:
+                        if installed[dep_project] not in plan.already_installed:
+                            plan.already_installed.append(installed[dep_project])
+                        continue
+                    if dependency.get("version_id"):
+                        pinned.setdefault(dependency["version_id"], item.name)
+                    elif dep_project:
+                        unpinned.setdefault(dep_project, item.name)
+
+            versions: List[tuple] = []
+            if pinned:
+                ids = urllib.parse.quote(json.dumps(list(pinned)))
+                for version in self.http.get_json(f"{MODRINTH_API_BASE_URL}/versions?ids={ids}") or []:
+                    if version.get("files"):
+                        versions.append((version, pinned.get(version.get("id"))))
+                        unpinned.pop(version.get("project_id"), None)
+            if unpinned:
+                with ThreadPoolExecutor(max_workers=min(DEPENDENCY_WORKERS, len(unpinned))) as executor:
+                    futures = {
+                        executor.submit(self._latest_modrinth_version, dep_project, dep_project, platform): dep_project
+                        for dep_project in unpinned
+                    }
+                    for future in as_completed(futures):
+                        dep_project = futures[future]
+                        try:
+                            versions.append((future.result(), unpinned[dep_project]))
+                        except LookupError:
+                            plan.warnings.append(
+                                f"{unpinned[dep_project]} requires {dep_project}, "
+                                f"which has no version for {platform.describe()}"
+                            )
+
+            # Nombres y tipos de las dependencias con una sola consulta
+            new_projects = [version.get("project_id") for version, _ in versions
+                            if version.get("project_id") not in planned]
+            projects = {}
+            if new_projects:
+                ids = urllib.parse.quote(json.dumps(new_projects))
+                for project in self.http.get_json(f"{MODRINTH_API_BASE_URL}/projects?ids={ids}") or []:
+                    projects[project.get("id")] = project
+
+            level = []
+            for version, required_by in versions:
+                dep_project = version.get("project_id")
+                if dep_project in planned:
+                    if planned[dep_project] is not None and planned[dep_project].version_id != version.get("id"):
+                        plan.warnings.append(
+                            f"{required_by} requires {planned[dep_project].name} {version.get('version_number')}, "
+                            f"but {planned[dep_project].version_number} will be installed"
+                        )
+                    continue
+                project = projects.get(dep_project, {})
+                if self._is_client_only_project(project):
+                    # Las dependencias solo de cliente no se instalan en el servidor
+                    plan.warnings.append(
+                        f"Skipping {project.get('title', dep_project)} (required by {required_by}): client-only"
+                    )
+                    planned[dep_project] = None
+                    continue
+                item = PlannedInstall(
+                    dep_project, project.get("title", dep_project), version.get("version_number", "Unknown"),
+                    version.get("id", ""), self._primary_file(version),
+                    self._modrinth_project_type(project, platform), required_by,
+                )
+                planned[dep_project] = item
+                plan.items.append(item)
+                level.append((item, version))
+        return plan
+
+    def plan_modrinth_install(self, plugin_name: str, project_id: str, server_path: str,
+                              callback: Callable[[Optional[InstallPlan], str], None]):
+        """Resuelve en segundo plano el plan de instalación de un proyecto de Modrinth
+        
+        Args:
+            callback: Recibe (plan, mensaje); el plan es None si falla la resolución
+        """
+        def perform_resolve():
+            GLib.idle_add(self._log, f"Resolving dependencies of {plugin_name}...\n")
+            try:
+                plan = self.resolve_modrinth_install(project_id, server_path)
+            except Exception as e:
+                error_msg = self._describe_error(e, "Modrinth", "Resolve")
+                GLib.idle_add(self._log, f"Dependency resolution failed: {error_msg}\n")
+                GLib.idle_add(callback, None, error_msg)
+                return
+            GLib.idle_add(self._log, f"Install plan for {plugin_name}: {len(plan.items)} projects.\n")
+            GLib.idle_add(callback, plan, "")
 
-    def search_curseforge_plugins(self, query: str, callback: Callable[[List[Plugin]], None], search_type: str = ""):
-        """Busca plugins o mods en CurseForge de forma asíncrona"""
+        threading.Thread(target=perform_resolve, daemon=True).start()
 
-        def perform_search():
-            api_key = os.environ.get("CURSEFORGE_API_KEY")
-            if not api_key:
-                GLib.idle_add(self._log, "DEBUG: Missing CurseForge API key\n")
-                GLib.idle_add(callback, [])
+    def install_plan(self, plan: InstallPlan, server_path: str, callback: Callable[[bool, str], None]):
+        """Descarga en paralelo todos los proyectos del plan a través de la cola
+        
+        El callback se invoca una sola vez, cuando han terminado todas las
+        descargas, con (success, message). Los metadatos de todo el plan se
+        guardan juntos al final, en una sola escritura.
+        """
+        lock = threading.Lock()
+        remaining = [len(plan.items)]
+        failures: List[str] = []
+        installed: List[PlannedInstall] = []
+
+        def finish(item: PlannedInstall, success: bool, message: str):
+            with lock:
+                if not success:
+                    failures.append(f"{item.name}: {message}")
+                remaining[0] -= 1
+                done = remaining[0] == 0
+            if not done:
                 return
+            self._record_plan_metadata(server_path, installed)
+            if failures:
+                callback(False, "; ".join(failures))
+            elif plan.dependencies:
+                callback(True, f"Successfully downloaded {plan.root.name} and {len(plan.dependencies)} dependencies")
+            else:
+                callback(True, f"Successfully downloaded {plan.root.name}")
 
-            try:
-                encoded_query = urllib.parse.quote(query)
-                url = f"{CURSEFORGE_API_BASE_URL}/mods/search?gameId=432&searchFilter={encoded_query}"
+        for item in plan.items:
+            def perform_download(job: DownloadJob, item=item) -> str:
+                GLib.idle_add(self._log, f"Starting download of {item.name} from Modrinth...\n")
+                target_dir = os.path.join(server_path, "plugins" if item.project_type == "plugin" else "mods")
+                os.makedirs(target_dir, exist_ok=True)
+                filename = item.version_file["filename"]
+                file_path = os.path.join(target_dir, filename)
+                self._download(item.version_file["url"], file_path, item.version_file.get("hashes"), job)
 
-                # Filtrar por tipo si se especifica (mods vs plugins)
-                if search_type == "mod":
-                    url += "&classId=6"
-                elif search_type == "plugin":
-                    url += "&classId=5"
+                # Los metadatos se guardan al terminar el plan; la lista se actualiza en el refresh
+                with lock:
+                    installed.append(item)
+                GLib.idle_add(self._log, f"Download completed: {filename}\n")
+                return f"Successfully downloaded {item.name}"
 
-                request = urllib.request.Request(url)
-                request.add_header("x-api-key", api_key)
-                request.add_header("User-Agent", "MinecraftServerManager/1.0")
+            self._submit_download(
+                item.name, item.version_file["url"], perform_download,
+                lambda success, message, item=item: finish(item, success, message), "Modrinth",
+                priority=PRIORITY_DEPENDENCY if item.is_dependency() else PRIORITY_USER,
+            )
 
-                with urllib.request.urlopen(request, timeout=10) as response:
-                    data = json.loads(response.read().decode())
+    def _record_plan_metadata(self, server_path: str, items: List[PlannedInstall]):
+        """Registra de una vez los metadatos de los proyectos instalados por un plan"""
+        self._record_installed_files(server_path, [
+            (item.version_file["filename"], "Modrinth", item.project_id, item.project_type) for item in items
+        ])
 
-                plugins = []
-                for item in data.get("data", []):
-                    name = item.get("name", "N/A")
-                    description = item.get("summary", "")
-                    project_id = str(item.get("id", ""))
-                    logo = item.get("logo") or {}
-                    icon_url = logo.get("url", "")
-                    class_id = item.get("classId", 6)
-                    project_type = "plugin" if class_id == 5 else "mod"
-                    plugin = Plugin(
-                        name=name,
-                        source="CurseForge",
-                        version="Latest",
-                        description=description,
-                        install_method="CurseForge",
-                    )
-                    plugin.project_id = project_id
-                    plugin.icon_url = icon_url
-                    plugin.project_type = project_type
-                    plugins.append(plugin)
+    def _record_installed_files(self, server_path: str, installed: List[tuple]):
+        """Registra en una sola escritura (archivo, fuente, project_id, tipo) de varios JAR"""
+        if not installed:
+            return
+        installed_at = __import__("datetime").datetime.now().isoformat()
 
-                GLib.idle_add(self._log, f"Found {len(plugins)} results from CurseForge.\n")
-                GLib.idle_add(callback, plugins)
+        def add_entries(entries: Dict[str, Dict]):
+            for filename, install_method, project_id, plugin_type in installed:
+                entries[os.path.splitext(filename)[0]] = {
+                    "install_method": install_method,
+                    "project_id": project_id,
+                    "installed_at": installed_at,
+                    "type": plugin_type,
+                }
 
-            except Exception as e:
-                GLib.idle_add(self._log, f"DEBUG: Error searching CurseForge: {e}\n")
-                GLib.idle_add(callback, [])
-
-        threading.Thread(target=perform_search, daemon=True).start()
+        store = get_plugin_metadata_store(server_path)
+        store.modify(add_entries)
+        store.flush()
 
     def download_modrinth_plugin(self, plugin_name: str, project_id: str, server_path: str, callback: Callable[[bool, str], None]):
-        """Descarga un plugin desde Modrinth de forma asíncrona
+        """Descarga un plugin desde Modrinth junto con sus dependencias requeridas
         
         Args:
             plugin_name: Nombre del plugin
@@ -374,207 +1138,470 @@ class PluginController:
             server_path: Ruta del servidor donde instalar
             callback: Función callback con (success: bool, message: str)
         """
-        def perform_download():
-            try:
-                GLib.idle_add(self._log, f"Starting download of {plugin_name} from Modrinth...\n")
-                
-                # Obtener información del proyecto
-                project_url = f"{MODRINTH_API_BASE_URL}/project/{project_id}"
-                request = urllib.request.Request(project_url)
-                request.add_header('User-Agent', 'MinecraftServerManager/1.0')
-                
-                with urllib.request.urlopen(request, timeout=10) as response:
-                    project_data = json.loads(response.read().decode())
-                
-                # Obtener las versiones del proyecto
-                versions_url = f"{MODRINTH_API_BASE_URL}/project/{project_id}/version"
-                request = urllib.request.Request(versions_url)
-                request.add_header('User-Agent', 'MinecraftServerManager/1.0')
-                
-                with urllib.request.urlopen(request, timeout=10) as response:
-                    versions_data = json.loads(response.read().decode())
-                
-                if not versions_data:
-                    GLib.idle_add(callback, False, "No versions available for this plugin")
-                    return
-                
-                # Obtener la última versión compatible
-                latest_version = None
-                for version in versions_data:
-                    # Buscar versión compatible con el servidor (puedes filtrar por game_versions si es necesario)
-                    if version.get("files"):
-                        latest_version = version
-                        break
-                
-                if not latest_version:
-                    GLib.idle_add(callback, False, "No compatible version found")
-                    return
-                
-                # Obtener el archivo de descarga
-                download_file = latest_version["files"][0]  # Tomar el primer archivo
-                download_url = download_file["url"]
-                filename = download_file["filename"]
-                
-                # Crear directorio de plugins/mods según el tipo
-                project_type = project_data.get("project_type", "mod").lower()
-                categories = project_data.get("categories", [])
-                
-                # Verificar si hay información de loaders
-                loaders = project_data.get("loaders", [])
-                
-                # Detectar plugins basándose en las categorías O loaders
-                plugin_categories = ["spigot", "paper", "bukkit", "purpur", "waterfall", "velocity"]
-                plugin_loaders = ["bukkit", "spigot", "paper", "purpur", "waterfall", "velocity"]
-                
-                is_plugin_by_categories = any(cat.lower() in plugin_categories for cat in categories)
-                is_plugin_by_loaders = any(loader.lower() in plugin_loaders for loader in loaders)
-                is_plugin = is_plugin_by_categories or is_plugin_by_loaders
-                
-                # Si tiene categorías de servidor, es un plugin, no un mod
-                if is_plugin:
-                    project_type = "plugin"
-                
-                if project_type == "plugin":
-                    plugins_dir = os.path.join(server_path, "plugins")
-                else:
-                    plugins_dir = os.path.join(server_path, "mods")
-                
-                os.makedirs(plugins_dir, exist_ok=True)
-                
-                # Descargar el archivo
-                file_path = os.path.join(plugins_dir, filename)
-                download_request = urllib.request.Request(download_url)
-                download_request.add_header('User-Agent', 'MinecraftServerManager/1.0')
-                with urllib.request.urlopen(download_request, timeout=10) as response, open(file_path, "wb") as out_file:
-                    out_file.write(response.read())
-                
-                # Solo guardar metadatos, no agregar a la lista (se hará en refresh)
-                plugin_name_clean = os.path.splitext(filename)[0]
-                self._add_plugin_metadata(
-                    server_path,
-                    plugin_name_clean,
-                    "Modrinth",
-                    project_id,
-                    project_type
-                )
-                
-                GLib.idle_add(callback, True, f"Successfully downloaded {plugin_name}")
-                GLib.idle_add(self._log, f"Download completed: {filename}\n")
-                
-            except urllib.error.HTTPError as e:
-                error_msg = f"HTTP Error {e.code}: {e.reason}"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Download failed: {error_msg}\n")
-            except socket.timeout:
-                error_msg = "Connection to Modrinth timed out"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Download failed: {error_msg}\n")
-            except urllib.error.URLError as e:
-                if isinstance(e.reason, socket.timeout):
-                    error_msg = "Connection to Modrinth timed out"
-                else:
-                    error_msg = f"URL Error: {e.reason}"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Download failed: {error_msg}\n")
-            except Exception as e:
-                error_msg = f"Download error: {str(e)}"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Download failed: {error_msg}\n")
-        
-        threading.Thread(target=perform_download, daemon=True).start()
+        def on_plan(plan: Optional[InstallPlan], message: str):
+            if plan is None:
+                callback(False, message)
+            else:
+                self.install_plan(plan, server_path, callback)
+
+        self.plan_modrinth_install(plugin_name, project_id, server_path, on_plan)
 
     def download_spigot_plugin(self, plugin_name: str, resource_id: str, server_path: str, callback: Callable[[bool, str], None]):
-        """Descarga un plugin desde Spigot de forma asíncrona"""
+        """Descarga un plugin desde Spigot a través de la cola de descargas"""
+
+        def perform_download(job: DownloadJob) -> str:
+            GLib.idle_add(self._log, f"Starting download of {plugin_name} from Spigot...\n")
+            download_url = f"{SPIGET_API_BASE_URL}/resources/{resource_id}/download"
+            plugins_dir = os.path.join(server_path, "plugins")
+            os.makedirs(plugins_dir, exist_ok=True)
+            file_path = os.path.join(plugins_dir, f"{plugin_name}.jar")
+            self._download(download_url, file_path, job=job)
+
+            plugin_name_clean = os.path.splitext(os.path.basename(file_path))[0]
+            self._add_plugin_metadata(server_path, plugin_name_clean, "Spigot", resource_id, "plugin")
+
+            GLib.idle_add(self._log, f"Download completed: {os.path.basename(file_path)}\n")
+            return f"Successfully downloaded {plugin_name}"
+
+        self._submit_download(plugin_name, SPIGET_API_BASE_URL, perform_download, callback, "Spigot")
+
+    def _latest_curseforge_file(self, project_id: str, name: str, platform: ServerPlatform, api_key: str) -> Dict:
+        """Obtiene el archivo más reciente de un proyecto de CurseForge compatible con la plataforma"""
+        # Pedir solo archivos para la versión de Minecraft y el loader del servidor
+        params = {}
+        if platform.minecraft_version:
+            params["gameVersion"] = platform.minecraft_version
+        if platform.curseforge_mod_loader_type():
+            params["modLoaderType"] = platform.curseforge_mod_loader_type()
+        files_url = f"{CURSEFORGE_API_BASE_URL}/mods/{project_id}/files"
+        if params:
+            files_url += "?" + urllib.parse.urlencode(params)
+        files_data = self.http.get_json(files_url, headers={"x-api-key": api_key})
+
+        if not (files_data or {}).get("data"):
+            raise LookupError(f"No file of {name} is compatible with {platform.describe()}")
+        return files_data["data"][0]
+
+    def _curseforge_project(self, project_id: str, api_key: str) -> Dict:
+        """Datos de un proyecto de CurseForge (el classId está aquí, no en sus archivos)"""
+        return (self.http.get_json(f"{CURSEFORGE_API_BASE_URL}/mods/{project_id}",
+                                   headers={"x-api-key": api_key}) or {}).get("data") or {}
+
+    def _curseforge_project_type(self, mod: Dict, name: str) -> str:
+        """"plugin" o "mod" según el classId del proyecto, igual que al instalar un modpack"""
+        folder = CURSEFORGE_CLASS_DIRS.get(mod.get("classId"), "mods" if not mod else None)
+        if folder is None:
+            raise LookupError(f"{name} is not a mod or plugin and is not needed on a server")
+        return "plugin" if folder == "plugins" else "mod"
 
-        def perform_download():
-            try:
-                GLib.idle_add(self._log, f"Starting download of {plugin_name} from Spigot...\n")
-                download_url = f"{SPIGET_API_BASE_URL}/resources/{resource_id}/download"
-                request = urllib.request.Request(download_url)
-                request.add_header("User-Agent", "MinecraftServerManager/1.0")
-                plugins_dir = os.path.join(server_path, "plugins")
-                os.makedirs(plugins_dir, exist_ok=True)
-                file_path = os.path.join(plugins_dir, f"{plugin_name}.jar")
-                with urllib.request.urlopen(request, timeout=20) as response, open(file_path, "wb") as out_file:
-                    out_file.write(response.read())
-
-                plugin_name_clean = os.path.splitext(os.path.basename(file_path))[0]
-                self._add_plugin_metadata(server_path, plugin_name_clean, "Spigot", resource_id, "plugin")
-
-                GLib.idle_add(callback, True, f"Successfully downloaded {plugin_name}")
-                GLib.idle_add(self._log, f"Download completed: {os.path.basename(file_path)}\n")
-
-            except urllib.error.HTTPError as e:
-                error_msg = f"HTTP Error {e.code}: {e.reason}"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Download failed: {error_msg}\n")
-            except Exception as e:
-                error_msg = f"Download error: {str(e)}"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Download failed: {error_msg}\n")
+    def download_curseforge_plugin(self, plugin_name: str, project_id: str, server_path: str, callback: Callable[[bool, str], None]):
+        """Descarga un mod o plugin desde CurseForge a través de la cola de descargas"""
 
-        threading.Thread(target=perform_download, daemon=True).start()
+        api_key = os.environ.get("CURSEFORGE_API_KEY")
+        if not api_key:
+            GLib.idle_add(callback, False, "Missing CurseForge API key")
+            return
 
-    def download_curseforge_plugin(self, plugin_name: str, project_id: str, server_path: str, callback: Callable[[bool, str], None]):
-        """Descarga un mod o plugin desde CurseForge de forma asíncrona"""
+        def perform_download(job: DownloadJob) -> str:
+            GLib.idle_add(self._log, f"Starting download of {plugin_name} from CurseForge...\n")
+            platform = self.get_server_platform(server_path)
+            project_type = self._curseforge_project_type(self._curseforge_project(project_id, api_key), plugin_name)
+            latest_file = self._latest_curseforge_file(project_id, plugin_name, platform, api_key)
+            download_url = latest_file.get("downloadUrl")
+            filename = latest_file.get("fileName", f"{plugin_name}.jar")
 
-        def perform_download():
-            api_key = os.environ.get("CURSEFORGE_API_KEY")
-            if not api_key:
-                GLib.idle_add(callback, False, "Missing CurseForge API key")
-                return
+            # Determinar directorio según tipo
+            if project_type == "plugin":
+                target_dir = os.path.join(server_path, "plugins")
+            else:
+                target_dir = os.path.join(server_path, "mods")
+            os.makedirs(target_dir, exist_ok=True)
+
+            file_path = os.path.join(target_dir, filename)
+            self._download(download_url, file_path, curseforge_hashes(latest_file), job)
+
+            plugin_name_clean = os.path.splitext(filename)[0]
+            self._add_plugin_metadata(server_path, plugin_name_clean, "CurseForge", project_id, project_type)
+
+            GLib.idle_add(self._log, f"Download completed: {filename}\n")
+            return f"Successfully downloaded {plugin_name}"
+
+        self._submit_download(plugin_name, CURSEFORGE_API_BASE_URL, perform_download, callback, "CurseForge")
+
+    def _resolve_fleet_file(self, source: str, plugin_name: str, project_id: str, platform: ServerPlatform,
+                            project_data: Dict, api_key: Optional[str]) -> Dict:
+        """Archivo de un proyecto para una plataforma: url, filename, hashes y type"""
+        if source == "Spigot":
+            if platform.is_mod_platform():
+                raise LookupError(f"{plugin_name} is a Spigot plugin and {platform.describe()} only loads mods")
+            return {
+                "url": f"{SPIGET_API_BASE_URL}/resources/{project_id}/download",
+                "filename": f"{plugin_name}.jar",
+                "hashes": None,
+                "type": "plugin",
+            }
+        if source == "CurseForge":
+            latest_file = self._latest_curseforge_file(project_id, plugin_name, platform, api_key)
+            if not latest_file.get("downloadUrl"):
+                raise LookupError(f"{plugin_name} must be downloaded manually from CurseForge")
+            return {
+                "url": latest_file["downloadUrl"],
+                "filename": latest_file.get("fileName", f"{plugin_name}.jar"),
+                "hashes": curseforge_hashes(latest_file),
+                "type": self._curseforge_project_type(project_data, plugin_name),
+            }
+
+        if self._is_client_only_project(project_data) and not platform.is_plugin_platform():
+            raise LookupError(f"{plugin_name} is client-only")
+        version_file = self._primary_file(self._latest_modrinth_version(project_id, plugin_name, platform))
+        return {
+            "url": version_file["url"],
+            "filename": version_file["filename"],
+            "hashes": version_file.get("hashes"),
+            "type": self._modrinth_project_type(project_data, platform),
+        }
 
+    def _file_matches(self, file_path: str, hashes: Optional[Dict[str, str]]) -> bool:
+        """Indica si un archivo coincide con alguno de los hashes conocidos"""
+        algorithm = next((name for name in ("sha1", "sha256", "sha512") if (hashes or {}).get(name)), None)
+        if not algorithm or not os.path.exists(file_path):
+            return False
+        return hash_file(file_path, (algorithm,))[algorithm] == hashes[algorithm].lower()
+
+    def _fetch_fleet_file(self, job: DownloadJob, version_file: Dict) -> Dict[str, str]:
+        """Deja el archivo en el almacén de JAR descargándolo como mucho una vez
+        
+        Devuelve sus hashes (siempre con sha256), que sirven tanto para
+        instalarlo desde el almacén como para saber si un servidor ya lo tiene.
+        """
+        hashes = version_file.get("hashes") or {}
+        sha256 = self.jar_store.find(hashes)
+        if sha256:
+            return dict(hashes, sha256=sha256)
+
+        staging_dir = os.path.join(self.jar_store.directory, "staging")
+        os.makedirs(staging_dir, exist_ok=True)
+        staging_path = os.path.join(staging_dir, f"{os.getpid()}.{threading.get_ident()}.{version_file['filename']}")
+        try:
+            digests = self._download(version_file["url"], staging_path, hashes, job)
+            if "sha256" not in digests:
+                raise OSError(f"Could not add {version_file['filename']} to the shared jar store")
+            return digests
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+
+    def _deploy_fleet_file(self, server_path: str, source: str, project_id: str, version_file: Dict,
+                           digests: Dict[str, str]) -> str:
+        """Instala o actualiza el archivo en un servidor y devuelve el estado resultante"""
+        target_dir = os.path.join(server_path, "mods" if version_file["type"] == "mod" else "plugins")
+        os.makedirs(target_dir, exist_ok=True)
+        target_path = os.path.join(target_dir, version_file["filename"])
+        previous = next((install for install in self._tracked_installs(server_path, source)
+                         if install["project_id"] == str(project_id)), None)
+
+        # Se compara con lo descargado, así también se detectan los archivos sin hashes publicados (Spigot)
+        if previous and previous["path"] == target_path and self._file_matches(target_path, digests):
+            return STATUS_UP_TO_DATE
+
+        self.jar_store.deploy(digests["sha256"], target_path)
+
+        new_name = os.path.splitext(version_file["filename"])[0]
+        if previous and previous["path"] != target_path and os.path.exists(previous["path"]):
+            os.remove(previous["path"])
+        if previous and previous["name"] != new_name:
+            self._remove_plugin_metadata(server_path, previous["name"])
+        self._add_plugin_metadata(server_path, new_name, source, project_id, version_file["type"])
+        return STATUS_UPDATED if previous else STATUS_INSTALLED
+
+    def _install_on_servers(self, job: DownloadJob, source: str, plugin_name: str, project_id: str,
+                            servers: List[MinecraftServer],
+                            is_starting: Optional[Callable[[MinecraftServer], bool]] = None
+                            ) -> List[FleetInstallResult]:
+        """Instala un proyecto en varios servidores descargando cada archivo una sola vez
+        
+        El archivo se resuelve una vez por combinación de plataforma y versión
+        de Minecraft. Los servidores en marcha, arrancando (según
+        ``is_starting``) o incompatibles se omiten.
+        """
+        api_key = os.environ.get("CURSEFORGE_API_KEY")
+        if source == "CurseForge" and not api_key:
+            raise PermissionError("Missing CurseForge API key")
+        if source == "Modrinth":
+            project_data = self.http.get_json(f"{MODRINTH_API_BASE_URL}/project/{project_id}")
+        elif source == "CurseForge":
+            project_data = self._curseforge_project(project_id, api_key)
+        else:
+            project_data = {}
+
+        results: Dict[str, FleetInstallResult] = {}
+        resolved: Dict[tuple, object] = {}
+        targets = []
+        for server in servers:
+            if server.is_running or (is_starting and is_starting(server)):
+                results[server.path] = FleetInstallResult(
+                    server.name, server.path, STATUS_SKIPPED,
+                    "server is running" if server.is_running else "server is starting",
+                )
+                continue
+            platform = self.get_server_platform(server.path)
+            key = (platform.platform, platform.minecraft_version)
+            if key not in resolved:
+                try:
+                    resolved[key] = self._resolve_fleet_file(source, plugin_name, project_id, platform,
+                                                             project_data or {}, api_key)
+                except LookupError as e:
+                    resolved[key] = e
+            if isinstance(resolved[key], LookupError):
+                results[server.path] = FleetInstallResult(server.name, server.path, STATUS_SKIPPED,
+                                                          str(resolved[key]))
+                continue
+            targets.append((server, resolved[key]))
+
+        # Cada archivo se descarga una vez al almacén y desde allí se instala en todos los servidores
+        fetched: Dict[str, object] = {}
+        for server, version_file in targets:
+            url = version_file["url"]
+            if url in fetched:
+                continue
             try:
-                GLib.idle_add(self._log, f"Starting download of {plugin_name} from CurseForge...\n")
-                files_url = f"{CURSEFORGE_API_BASE_URL}/mods/{project_id}/files"
-                request = urllib.request.Request(files_url)
-                request.add_header("x-api-key", api_key)
-                request.add_header("User-Agent", "MinecraftServerManager/1.0")
-                with urllib.request.urlopen(request, timeout=10) as response:
-                    files_data = json.loads(response.read().decode())
-
-                if not files_data.get("data"):
-                    GLib.idle_add(callback, False, "No files available for this project")
-                    return
+                fetched[url] = self._fetch_fleet_file(job, version_file)
+            except DownloadCancelledError:
+                raise
+            except (OSError, ValueError, LookupError) as e:
+                fetched[url] = e
+
+        for index, (server, version_file) in enumerate(targets):
+            job.set_progress(f"{server.name} ({index + 1}/{len(targets)})")
+            try:
+                digests = fetched[version_file["url"]]
+                if isinstance(digests, Exception):
+                    raise digests
+                status = self._deploy_fleet_file(server.path, source, project_id, version_file, digests)
+                results[server.path] = FleetInstallResult(server.name, server.path, status)
+            except DownloadCancelledError:
+                raise
+            except (OSError, ValueError, LookupError) as e:
+                results[server.path] = FleetInstallResult(server.name, server.path, STATUS_FAILED,
+                                                          self._describe_error(e, source, "Install"))
+        return [results[server.path] for server in servers]
+
+    def install_on_servers(self, source: str, plugin_name: str, project_id: str, servers: List[MinecraftServer],
+                           callback: Callable[[Optional[List[FleetInstallResult]], str], None],
+                           is_starting: Optional[Callable[[MinecraftServer], bool]] = None):
+        """Instala o actualiza un proyecto en varios servidores a la vez
+        
+        Las dependencias no se resuelven: se instala solo el proyecto
+        elegido. El callback recibe (resultados por servidor, mensaje) o
+        (None, error) si no se pudo consultar el proyecto. ``is_starting``
+        indica qué servidores están arrancando para omitirlos también.
+        """
+        def perform_install(job: DownloadJob) -> List[FleetInstallResult]:
+            GLib.idle_add(self._log, f"Installing {plugin_name} from {source} on {len(servers)} servers...\n")
+            return self._install_on_servers(job, source, plugin_name, project_id, servers, is_starting)
+
+        def on_success(results: List[FleetInstallResult]):
+            for result in results:
+                GLib.idle_add(self._log, f"{'✓' if result.succeeded() else '✗'} {result.describe()}\n")
+            for result in results:
+                if result.status in (STATUS_INSTALLED, STATUS_UPDATED):
+                    self.flush_plugin_metadata(result.server_path)
+            succeeded = sum(1 for result in results if result.succeeded())
+            GLib.idle_add(callback, results, f"{plugin_name}: {succeeded} of {len(results)} servers ready")
+
+        def on_error(error: Exception):
+            error_msg = str(error) if isinstance(error, PermissionError) else self._describe_error(error, source)
+            GLib.idle_add(self._log, f"Fleet install failed: {error_msg}\n")
+            GLib.idle_add(callback, None, error_msg)
+
+        api_urls = {"Spigot": SPIGET_API_BASE_URL, "CurseForge": CURSEFORGE_API_BASE_URL}
+        self.download_queue.submit(
+            perform_install, f"{plugin_name} → {len(servers)} servers", api_urls.get(source, MODRINTH_API_BASE_URL),
+            PRIORITY_USER, on_success, on_error,
+        )
+
+    def _resolve_curseforge_modpack(self, modpack: Modpack, api_key: str) -> List[str]:
+        """Completa rutas, URLs y hashes de los archivos de un pack de CurseForge
+        
+        Usa dos consultas por lotes (``/mods/files`` y ``/mods``). Devuelve
+        avisos para los archivos que el autor no permite descargar fuera de
+        CurseForge.
+        """
+        headers = {"x-api-key": api_key}
+        file_ids = [item.file_id for item in modpack.files]
+        project_ids = sorted({int(item.project_id) for item in modpack.files if item.project_id})
+        files = {data.get("id"): data for data in (self.http.post_json(
+            f"{CURSEFORGE_API_BASE_URL}/mods/files", {"fileIds": file_ids}, headers=headers
+        ) or {}).get("data", [])}
+        mods = {str(data.get("id")): data for data in (self.http.post_json(
+            f"{CURSEFORGE_API_BASE_URL}/mods", {"modIds": project_ids}, headers=headers
+        ) or {}).get("data", [])}
+
+        warnings = []
+        resolved = []
+        for item in modpack.files:
+            data = files.get(item.file_id)
+            mod = mods.get(item.project_id, {})
+            name = mod.get("name") or (data or {}).get("displayName") or f"file {item.file_id}"
+            if not data:
+                warnings.append(f"{name} was not found on CurseForge")
+                continue
+            folder = CURSEFORGE_CLASS_DIRS.get(mod.get("classId"), "mods" if not mod else None)
+            if folder is None:
+                modpack.client_only_files.append(data.get("fileName", name))
+                continue
+            if not data.get("downloadUrl"):
+                warnings.append(f"{name} must be downloaded manually: its author disabled third-party downloads")
+                continue
+            item.path = f"{folder}/{data.get('fileName')}"
+            item.urls = [data["downloadUrl"]]
+            item.hashes = curseforge_hashes(data)
+            item.size = data.get("fileLength")
+            resolved.append(item)
+        modpack.files = resolved
+        return warnings
+
+    def import_modpack(self, pack_path: str, server_path: str, callback: Callable[[bool, str], None]):
+        """Instala un modpack (.mrpack o zip de CurseForge) en un servidor
+        
+        Lee el índice, omite los archivos que solo sirven en el cliente,
+        copia los overrides y descarga todos los archivos en paralelo a
+        través de la cola, verificando los hashes del índice. Los metadatos
+        de los JAR se guardan de una vez al terminar. El callback se invoca
+        una sola vez con (success, message).
+        """
+        def prepare(job: DownloadJob):
+            modpack = read_modpack(pack_path)
+            GLib.idle_add(self._log, f"Importing modpack {modpack.describe()}...\n")
+            warnings: List[str] = []
+            if modpack.source == "CurseForge":
+                api_key = os.environ.get("CURSEFORGE_API_KEY")
+                if not api_key:
+                    raise PermissionError("Missing CurseForge API key")
+                job.set_progress("Resolving files")
+                warnings += self._resolve_curseforge_modpack(modpack, api_key)
+
+            platform = self.get_server_platform(server_path)
+            if modpack.loader and platform.platform and modpack.loader != platform.platform:
+                warnings.append(f"The pack needs {modpack.loader} but the server runs {platform.platform}")
+            if modpack.minecraft_version and platform.minecraft_version \
+                    and modpack.minecraft_version != platform.minecraft_version:
+                warnings.append(
+                    f"The pack is for Minecraft {modpack.minecraft_version}, "
+                    f"the server runs {platform.minecraft_version}"
+                )
 
-                latest_file = files_data["data"][0]
-                download_url = latest_file.get("downloadUrl")
-                filename = latest_file.get("fileName", f"{plugin_name}.jar")
+            job.set_progress("Applying overrides")
+            overrides = extract_overrides(pack_path, modpack, server_path)
+            return modpack, overrides, warnings
+
+        def on_prepared(result):
+            modpack, overrides, warnings = result
+            for warning in warnings:
+                GLib.idle_add(self._log, f"⚠ {warning}\n")
+            if modpack.client_only_files:
+                GLib.idle_add(self._log, f"Skipping {len(modpack.client_only_files)} client-only files\n")
+            self._download_modpack_files(modpack, server_path, overrides, callback)
+
+        def on_error(error: Exception):
+            error_msg = str(error) if isinstance(error, (ValueError, PermissionError)) else \
+                self._describe_error(error, "Modpack", "Import")
+            GLib.idle_add(self._log, f"Modpack import failed: {error_msg}\n")
+            GLib.idle_add(callback, False, error_msg)
+
+        self.download_queue.submit(
+            prepare, f"Import {os.path.basename(pack_path)}", "local", PRIORITY_USER, on_prepared, on_error,
+            retry=False,
+        )
+
+    def _download_modpack_files(self, modpack: Modpack, server_path: str, overrides: int,
+                                callback: Callable[[bool, str], None]):
+        """Encola la descarga de todos los archivos del pack y avisa una vez al terminar"""
+        lock = threading.Lock()
+        remaining = [len(modpack.files)]
+        failures: List[str] = []
+        installed: List[tuple] = []
+
+        def finish(item, success: bool, message: str):
+            with lock:
+                if not success:
+                    failures.append(f"{os.path.basename(item.path)}: {message}")
+                remaining[0] -= 1
+                done = remaining[0] <= 0
+            if not done:
+                return
+            self._record_installed_files(server_path, installed)
+            summary = f"Installed {modpack.name}: {len(installed)} files, {overrides} override files"
+            if failures:
+                GLib.idle_add(callback, False, f"{summary}; {len(failures)} failed: " + "; ".join(failures))
+            else:
+                GLib.idle_add(callback, True, summary)
 
-                request = urllib.request.Request(download_url)
-                request.add_header("User-Agent", "MinecraftServerManager/1.0")
+        if not modpack.files:
+            remaining[0] = 1
+            finish(None, True, "")
+            return
 
-                # Determinar directorio según tipo
-                project_type = "plugin" if latest_file.get("classId") == 5 else "mod"
-                if project_type == "plugin":
-                    target_dir = os.path.join(server_path, "plugins")
+        for item in modpack.files:
+            def perform_download(job: DownloadJob, item=item) -> str:
+                target_path = safe_join(server_path, item.path)
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                last_error: Optional[Exception] = None
+                # Los .mrpack pueden listar varias URL espejo del mismo archivo
+                for url in item.urls:
+                    try:
+                        self._download(url, target_path, item.hashes, job)
+                        break
+                    except (urllib.error.URLError, ValueError) as e:
+                        last_error = e
                 else:
-                    target_dir = os.path.join(server_path, "mods")
-                os.makedirs(target_dir, exist_ok=True)
+                    raise last_error or LookupError("No download URL")
+
+                folder = os.path.basename(os.path.dirname(target_path))
+                if folder == "mods" and target_path.endswith(".jar") \
+                        and self.jar_cache.get(target_path).get("environment") == "client":
+                    # Los packs de CurseForge no marcan los mods de cliente: se desactivan
+                    self.jar_cache.forget(target_path)
+                    os.replace(target_path, target_path + DISABLED_SUFFIX)
+                    return f"Disabled client-only mod {item.path}"
+                if folder in ("mods", "plugins") and target_path.endswith(".jar"):
+                    with lock:
+                        installed.append((os.path.basename(target_path), modpack.source, item.project_id,
+                                          "mod" if folder == "mods" else "plugin"))
+                return f"Downloaded {item.path}"
+
+            self._submit_download(
+                os.path.basename(item.path), item.urls[0] if item.urls else "", perform_download,
+                lambda success, message, item=item: finish(item, success, message), modpack.source,
+                priority=PRIORITY_DEPENDENCY,
+            )
 
-                file_path = os.path.join(target_dir, filename)
-                with urllib.request.urlopen(request, timeout=20) as response, open(file_path, "wb") as out_file:
-                    out_file.write(response.read())
+    def _install_version_file(self, job: DownloadJob, server_path: str, plugin_name: str,
+                              old_file_path: Optional[str], version_file: Dict, install_method: str,
+                              project_id: Optional[str], plugin_type: str = "plugin") -> str:
+        """Descarga el archivo de una versión nueva y sustituye al anterior"""
+        filename = version_file["filename"]
+        plugin_dir = os.path.dirname(old_file_path) if old_file_path else os.path.join(server_path, "plugins")
+        os.makedirs(plugin_dir, exist_ok=True)
+        new_file_path = os.path.join(plugin_dir, filename)
 
-                plugin_name_clean = os.path.splitext(filename)[0]
-                self._add_plugin_metadata(server_path, plugin_name_clean, "CurseForge", project_id, project_type)
+        GLib.idle_add(self._log, f"Downloading {filename}...\n")
+        self._download(version_file["url"], new_file_path, version_file.get("hashes"), job)
 
-                GLib.idle_add(callback, True, f"Successfully downloaded {plugin_name}")
-                GLib.idle_add(self._log, f"Download completed: {filename}\n")
+        # Eliminar el archivo antiguo
+        if old_file_path and old_file_path != new_file_path and os.path.exists(old_file_path):
+            os.remove(old_file_path)
 
-            except urllib.error.HTTPError as e:
-                error_msg = f"HTTP Error {e.code}: {e.reason}"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Download failed: {error_msg}\n")
-            except Exception as e:
-                error_msg = f"Download error: {str(e)}"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Download failed: {error_msg}\n")
+        # Actualizar metadatos (una sola escritura gracias al almacén en memoria)
+        self._remove_plugin_metadata(server_path, plugin_name)
+        new_plugin_name = os.path.splitext(filename)[0]
+        self._add_plugin_metadata(server_path, new_plugin_name, install_method, project_id, plugin_type)
 
-        threading.Thread(target=perform_download, daemon=True).start()
+        GLib.idle_add(self._log, f"Update completed: {filename}\n")
+        return new_file_path
 
     def update_plugin(self, plugin: Plugin, server_path: str, callback: Callable[[bool, str], None]):
-        """Actualiza un plugin instalado desde Modrinth
+        """Actualiza un plugin instalado desde Modrinth, Spigot o CurseForge
 
         Args:
             plugin: Plugin a actualizar. Debe tener project_id válido
@@ -582,79 +1609,496 @@ class PluginController:
             callback: Función callback con (success: bool, message: str)
         """
 
-        if getattr(plugin, "install_method", "Modrinth") != "Modrinth":
+        install_method = self._canonical_install_method(getattr(plugin, "install_method", "Modrinth"))
+        if install_method != "Modrinth" and install_method not in TRACKED_UPDATE_SOURCES:
             GLib.idle_add(callback, False, f"Update from {plugin.install_method} is not supported")
             return
 
-        def perform_update():
-            if not plugin.project_id:
-                GLib.idle_add(callback, False, "No project ID available for this plugin")
-                return
+        if not plugin.project_id:
+            GLib.idle_add(callback, False, "No project ID available for this plugin")
+            return
 
-            try:
-                GLib.idle_add(self._log, f"Checking Modrinth for updates of {plugin.name}...\n")
+        if install_method in TRACKED_UPDATE_SOURCES:
+            self._update_tracked_plugin(plugin, server_path, callback)
+            return
 
-                # Obtener versiones del proyecto
-                versions_url = f"{MODRINTH_API_BASE_URL}/project/{plugin.project_id}/version"
-                request = urllib.request.Request(versions_url)
-                request.add_header('User-Agent', 'MinecraftServerManager/1.0')
+        def perform_update(job: DownloadJob) -> str:
+            GLib.idle_add(self._log, f"Checking Modrinth for updates of {plugin.name}...\n")
 
-                with urllib.request.urlopen(request) as response:
-                    versions_data = json.loads(response.read().decode())
+            # Obtener solo las versiones compatibles con el servidor
+            platform = self.get_server_platform(server_path)
+            latest_version = self._latest_modrinth_version(plugin.project_id, plugin.name, platform)
+            version_file = self._primary_file(latest_version)
+            filename = version_file["filename"]
 
-                if not versions_data:
-                    GLib.idle_add(callback, False, "No versions available for this plugin")
-                    return
+            # Verificar si ya está actualizado comparando el nombre del archivo
+            if plugin.file_path and os.path.basename(plugin.file_path) == filename:
+                return "Plugin is already up to date"
 
-                # Tomar la primera versión que tenga archivos
-                latest_version = None
-                for version in versions_data:
-                    if version.get("files"):
-                        latest_version = version
-                        break
+            plugin_type = self._folder_plugin_type(plugin.file_path) if plugin.file_path else "plugin"
+            self._install_version_file(
+                job, server_path, plugin.name, plugin.file_path, version_file,
+                plugin.install_method, plugin.project_id, plugin_type
+            )
+            return f"Updated {plugin.name}"
+
+        self._submit_download(
+            f"Update {plugin.name}", MODRINTH_API_BASE_URL, perform_update, callback, "Modrinth", action="Update"
+        )
+
+    def _update_tracked_plugin(self, plugin: Plugin, server_path: str, callback: Callable[[bool, str], None]):
+        """Actualiza un plugin instalado desde Spigot o CurseForge"""
+        source = self._canonical_install_method(plugin.install_method)
+        api_key = os.environ.get("CURSEFORGE_API_KEY")
+        if source == "CurseForge" and not api_key:
+            GLib.idle_add(callback, False, "Missing CurseForge API key")
+            return
 
-                if not latest_version:
-                    GLib.idle_add(callback, False, "No compatible version found")
-                    return
+        def perform_update(job: DownloadJob) -> str:
+            GLib.idle_add(self._log, f"Checking {source} for updates of {plugin.name}...\n")
+            install = {
+                "name": plugin.name,
+                "path": plugin.file_path,
+                "project_id": str(plugin.project_id),
+                "type": self._folder_plugin_type(plugin.file_path),
+            }
+            if source == "Spigot":
+                updates = self._spigot_updates([install])
+            else:
+                updates = self._curseforge_updates([install], self.get_server_platform(server_path), api_key)
+            if not updates:
+                # Error de consulta o JAR sin versión legible (ver el log)
+                return f"Could not tell whether {plugin.name} is up to date"
+            if not updates[0].has_update():
+                return "Plugin is already up to date"
+
+            update = updates[0]
+            version_file = {"url": update.download_url, "filename": update.filename, "hashes": update.hashes}
+            self._install_version_file(
+                job, server_path, plugin.name, plugin.file_path, version_file, source, plugin.project_id, install["type"]
+            )
+            return f"Updated {plugin.name} to {update.latest_version}"
 
-                download_file = latest_version["files"][0]
-                download_url = download_file["url"]
-                filename = download_file["filename"]
+        base_url = SPIGET_API_BASE_URL if source == "Spigot" else CURSEFORGE_API_BASE_URL
+        self._submit_download(f"Update {plugin.name}", base_url, perform_update, callback, source, action="Update")
 
-                # Verificar si ya está actualizado comparando el nombre del archivo
-                if plugin.file_path and os.path.basename(plugin.file_path) == filename:
-                    GLib.idle_add(callback, True, "Plugin is already up to date")
-                    return
+    def _hash_local_jars(self, server_path: str) -> Dict[str, Dict[str, str]]:
+        """Calcula en paralelo el SHA-1 de todos los JAR de plugins/ y mods/
+        
+        Returns:
+            Diccionario ruta -> {"sha1": ...}; los archivos ilegibles se omiten
+        """
+        items = get_plugins_and_mods(server_path)
+        hashes: Dict[str, Dict[str, str]] = {}
+        if not items:
+            return hashes
+        # La caché de metadatos evita volver a leer los JAR que no han cambiado
+        with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(items))) as executor:
+            futures = {executor.submit(self.jar_cache.get, full_path): full_path for _, full_path in items}
+            for future in as_completed(futures):
+                jar_metadata = future.result()
+                if jar_metadata.get("sha1"):
+                    hashes[futures[future]] = {"sha1": jar_metadata["sha1"]}
+                else:
+                    GLib.idle_add(self._log, f"Error hashing {os.path.basename(futures[future])}\n")
+        self.jar_cache.save()
+        return hashes
 
-                plugin_dir = os.path.dirname(plugin.file_path) if plugin.file_path else os.path.join(server_path, "plugins")
-                os.makedirs(plugin_dir, exist_ok=True)
-                new_file_path = os.path.join(plugin_dir, filename)
+    def find_modrinth_updates(self, server_path: str, game_versions: Optional[List[str]] = None) -> List[PluginUpdate]:
+        """Busca actualizaciones de todos los plugins y mods con consultas por lotes
+        
+        Identifica cada JAR por su hash con ``/version_files`` y obtiene la
+        última versión de todos ellos con ``/version_files/update``, en lugar
+        de consultar cada proyecto por separado. Los plugins se filtran por
+        los loaders de la plataforma del servidor (Bukkit si no se detecta) y
+        los mods por los del loader del servidor o, si se desconoce, por los de
+        su versión actual.
+        
+        Args:
+            server_path: Ruta del servidor
+            game_versions: Versiones de Minecraft aceptadas (por defecto, la
+                detectada en el servidor)
+        
+        Returns:
+            Una entrada por cada JAR reconocido por Modrinth
+        """
+        file_hashes = self._hash_local_jars(server_path)
+        if not file_hashes:
+            return []
+        platform = self.get_server_platform(server_path)
+        if game_versions is None:
+            game_versions = platform.game_versions()
+        plugin_loaders = tuple(platform.modrinth_loaders()) if platform.is_plugin_platform() else PLUGIN_LOADERS
+        path_by_hash = {hashes["sha1"]: path for path, hashes in file_hashes.items()}
+
+        current = self.http.post_json(
+            f"{MODRINTH_API_BASE_URL}/version_files",
+            {"hashes": list(path_by_hash), "algorithm": "sha1"},
+        ) or {}
+
+        # Agrupar por loaders: una consulta por grupo (normalmente una o dos)
+        groups: Dict[tuple, List[str]] = {}
+        for file_hash, version in current.items():
+            path = path_by_hash.get(file_hash)
+            if not path:
+                continue
+            if os.path.basename(os.path.dirname(path)) == "plugins":
+                loaders = plugin_loaders
+            elif platform.is_mod_platform():
+                loaders = tuple(platform.modrinth_loaders())
+            else:
+                loaders = tuple(sorted(version.get("loaders") or ()))
+            groups.setdefault(loaders, []).append(file_hash)
+
+        latest: Dict[str, Dict] = {}
+        for loaders, group_hashes in groups.items():
+            payload = {"hashes": group_hashes, "algorithm": "sha1", "loaders": list(loaders)}
+            if game_versions:
+                payload["game_versions"] = list(game_versions)
+            latest.update(self.http.post_json(f"{MODRINTH_API_BASE_URL}/version_files/update", payload) or {})
+
+        updates = []
+        for file_hash, version in current.items():
+            path = path_by_hash.get(file_hash)
+            if not path:
+                continue
+            newest = latest.get(file_hash) or version
+            files = newest.get("files") or []
+            primary = next((f for f in files if f.get("primary")), files[0] if files else None)
+            updates.append(PluginUpdate(
+                name=os.path.splitext(os.path.basename(path))[0],
+                file_path=path,
+                project_id=version.get("project_id", ""),
+                current_version=version.get("version_number", "Unknown"),
+                latest_version=newest.get("version_number", "Unknown"),
+                current_version_id=version.get("id", ""),
+                latest_version_id=newest.get("id", ""),
+                download_url=primary.get("url") if primary else None,
+                filename=primary.get("filename") if primary else None,
+                hashes=primary.get("hashes") if primary else None,
+                plugin_type=self._folder_plugin_type(path),
+            ))
+        updates.sort(key=lambda update: (not update.has_update(), update.name.lower()))
+        return updates
+
+    def _tracked_installs(self, server_path: str, source: str) -> List[Dict]:
+        """JAR instalados desde ``source`` según los metadatos, con su project_id"""
+        metadata = self._load_plugin_metadata(server_path)
+        tracked = []
+        for filename, full_path in get_plugins_and_mods(server_path):
+            name = filename[:-4]
+            entry = metadata.get(name) or {}
+            if self._canonical_install_method(entry.get("install_method")) == source and entry.get("project_id"):
+                tracked.append({
+                    "name": name,
+                    "path": full_path,
+                    "project_id": str(entry["project_id"]),
+                    "type": self._folder_plugin_type(full_path),
+                })
+        return tracked
+
+    def _spigot_updates(self, installs: List[Dict]) -> List[PluginUpdate]:
+        """Consulta en paralelo la última versión de cada recurso en Spiget
+        
+        Spiget no tiene consulta por lotes ni hashes, así que se compara la
+        versión del ``plugin.yml`` local con el nombre de la última versión.
+        Los JAR sin versión legible se omiten: no se puede saber si están al día.
+        """
+        def latest_version(install: Dict) -> Dict:
+            return self.http.get_json(f"{SPIGET_API_BASE_URL}/resources/{install['project_id']}/versions/latest")
+
+        updates = []
+        with ThreadPoolExecutor(max_workers=max(1, min(SPIGET_WORKERS, len(installs)))) as executor:
+            futures = {executor.submit(latest_version, install): install for install in installs}
+            for future in as_completed(futures):
+                install = futures[future]
+                try:
+                    latest = future.result() or {}
+                except Exception as e:
+                    GLib.idle_add(self._log, f"Could not check {install['name']} on Spigot: {e}\n")
+                    continue
+                current = self.jar_cache.get(install["path"]).get("version")
+                if not current or current == "Unknown":
+                    # Sin versión legible no se puede comparar; ofrecerla siempre la descargaría en cada revisión
+                    GLib.idle_add(self._log, f"Cannot tell whether {install['name']} is up to date: "
+                                             f"its JAR has no readable version.\n")
+                    continue
+                latest_name = str(latest.get("name") or "Unknown")
+                newer = version_sort_key(latest_name) > version_sort_key(current)
+                updates.append(PluginUpdate(
+                    name=install["name"],
+                    file_path=install["path"],
+                    project_id=install["project_id"],
+                    current_version=current,
+                    latest_version=latest_name,
+                    current_version_id=current,
+                    latest_version_id=str(latest.get("id", "")) if newer else current,
+                    download_url=f"{SPIGET_API_BASE_URL}/resources/{install['project_id']}/download",
+                    filename=os.path.basename(install["path"]),
+                    plugin_type=install["type"],
+                    source="Spigot",
+                ))
+        return updates
+
+    def _curseforge_updates(self, installs: List[Dict], platform: ServerPlatform, api_key: str) -> List[PluginUpdate]:
+        """Última versión compatible de todos los proyectos con dos consultas por lotes
+        
+        ``POST /mods`` devuelve el índice de últimos archivos de cada proyecto
+        y ``POST /mods/files`` los datos de descarga de los elegidos. Un JAR
+        está al día si su nombre coincide con el del último archivo.
+        """
+        headers = {"x-api-key": api_key}
+        mods = self.http.post_json(
+            f"{CURSEFORGE_API_BASE_URL}/mods",
+            {"modIds": [int(install["project_id"]) for install in installs]},
+            headers=headers,
+        ) or {}
+        mod_loader = platform.curseforge_mod_loader_type()
+
+        latest_file_ids: Dict[str, int] = {}
+        for mod in mods.get("data", []):
+            candidates = [
+                index for index in mod.get("latestFilesIndexes") or []
+                if (not platform.minecraft_version or index.get("gameVersion") == platform.minecraft_version)
+                and (mod.get("classId") == 5 or not mod_loader or index.get("modLoader") in (None, mod_loader))
+            ]
+            releases = [index for index in candidates if index.get("releaseType") == 1] or candidates
+            if releases:
+                latest_file_ids[str(mod.get("id"))] = max(index["fileId"] for index in releases)
+
+        files_by_id: Dict[int, Dict] = {}
+        if latest_file_ids:
+            files = self.http.post_json(
+                f"{CURSEFORGE_API_BASE_URL}/mods/files",
+                {"fileIds": list(latest_file_ids.values())},
+                headers=headers,
+            ) or {}
+            files_by_id = {file_data.get("id"): file_data for file_data in files.get("data", [])}
+
+        updates = []
+        for install in installs:
+            current_filename = os.path.basename(install["path"])
+            current = self.jar_cache.get(install["path"]).get("version") or "Unknown"
+            latest_file = files_by_id.get(latest_file_ids.get(install["project_id"]))
+            if not latest_file:
+                continue
+            latest_filename = latest_file.get("fileName") or current_filename
+            updates.append(PluginUpdate(
+                name=install["name"],
+                file_path=install["path"],
+                project_id=install["project_id"],
+                current_version=current,
+                latest_version=latest_file.get("displayName") or latest_filename,
+                current_version_id=current_filename,
+                latest_version_id=latest_filename,
+                download_url=latest_file.get("downloadUrl"),
+                filename=latest_filename,
+                hashes=curseforge_hashes(latest_file),
+                plugin_type=install["type"],
+                source="CurseForge",
+            ))
+        return updates
+
+    def find_tracked_updates(self, server_path: str) -> List[PluginUpdate]:
+        """Busca actualizaciones de los plugins y mods instalados desde Spigot y CurseForge"""
+        updates = []
+        spigot = self._tracked_installs(server_path, "Spigot")
+        if spigot:
+            updates.extend(self._spigot_updates(spigot))
+
+        curseforge = self._tracked_installs(server_path, "CurseForge")
+        api_key = os.environ.get("CURSEFORGE_API_KEY")
+        if curseforge and api_key:
+            try:
+                updates.extend(self._curseforge_updates(curseforge, self.get_server_platform(server_path), api_key))
+            except Exception as e:
+                error_msg = self._describe_error(e, "CurseForge", "Update check")
+                GLib.idle_add(self._log, f"CurseForge update check failed: {error_msg}\n")
+        elif curseforge:
+            GLib.idle_add(self._log, "Skipping CurseForge updates: missing CurseForge API key\n")
+        return updates
+
+    def check_all_updates(self, server_path: str, callback: Callable[[Optional[List[PluginUpdate]], str], None],
+                          game_versions: Optional[List[str]] = None):
+        """Comprueba en segundo plano las actualizaciones de todos los plugins y mods
+        
+        Args:
+            server_path: Ruta del servidor
+            callback: Recibe (actualizaciones, mensaje); las actualizaciones son
+                None si la comprobación falla
+            game_versions: Versiones de Minecraft aceptadas
+        """
+        def perform_check(job: DownloadJob) -> List[PluginUpdate]:
+            GLib.idle_add(self._log, "Checking all plugins and mods for updates...\n")
+            job.set_progress("Hashing files")
+            updates = self.find_modrinth_updates(server_path, game_versions)
+            job.set_progress("Checking Spigot and CurseForge")
+            tracked = self.find_tracked_updates(server_path)
+            # Un JAR instalado desde Spigot o CurseForge se actualiza desde su origen
+            tracked_paths = {update.file_path for update in tracked}
+            updates = [update for update in updates if update.file_path not in tracked_paths] + tracked
+            updates.sort(key=lambda update: (not update.has_update(), update.name.lower()))
+            available = sum(1 for update in updates if update.has_update())
+            GLib.idle_add(self._log, f"Found {available} updates for {len(updates)} projects.\n")
+            return updates
+
+        def on_success(updates: List[PluginUpdate]):
+            available = sum(1 for update in updates if update.has_update())
+            GLib.idle_add(callback, updates, f"{available} updates available")
+
+        def on_error(error: Exception):
+            error_msg = self._describe_error(error, "Modrinth", "Update check")
+            GLib.idle_add(self._log, f"Update check failed: {error_msg}\n")
+            GLib.idle_add(callback, None, error_msg)
+
+        self.download_queue.submit(
+            perform_check, "Check for updates", MODRINTH_API_BASE_URL, PRIORITY_BACKGROUND, on_success, on_error
+        )
+
+    def apply_plugin_updates(self, server_path: str, updates: List[PluginUpdate],
+                             callback: Callable[[bool, str], None]):
+        """Encola la descarga de las actualizaciones indicadas
+        
+        El callback se invoca una vez por cada actualización con (success, message).
+        """
+        for update in updates:
+            if not update.has_update():
+                continue
+            install_method = update.source
+            version_file = {"url": update.download_url, "filename": update.filename, "hashes": update.hashes}
+
+            def perform_update(job: DownloadJob, update=update, version_file=version_file,
+                               install_method=install_method) -> str:
+                self._install_version_file(
+                    job, server_path, update.name, update.file_path, version_file,
+                    install_method, update.project_id, update.plugin_type
+                )
+                return f"Updated {update.name} to {update.latest_version}"
 
-                GLib.idle_add(self._log, f"Downloading {filename}...\n")
-                urllib.request.urlretrieve(download_url, new_file_path)
+            self._submit_download(
+                f"Update {update.name}", update.download_url, perform_update, callback, update.source, action="Update"
+            )
 
-                # Eliminar el archivo antiguo
-                if plugin.file_path and os.path.exists(plugin.file_path):
-                    os.remove(plugin.file_path)
+    def load_startup_profiles(self, server_path: str,
+                              callback: Callable[[List[StartupProfile], str], None]):
+        """Carga en segundo plano el historial de arranques de un servidor
+        
+        Si aún no hay historial se analiza ``logs/latest.log`` y, si recoge un
+        arranque completo, se guarda como primera entrada.
+        """
+        def perform_load():
+            history = load_startup_history(server_path)
+            if not history:
+                profile = profile_log_file(os.path.join(server_path, "logs", "latest.log"))
+                if profile:
+                    history = [profile]
+                    if profile.complete:
+                        save_startup_profile(server_path, profile)
+            message = f"{len(history)} startups recorded" if history else "No plugin startup data found"
+            GLib.idle_add(callback, history, message)
+
+        threading.Thread(target=perform_load, daemon=True).start()
+
+    def find_duplicates(self, server_path: str, callback: Callable[[List[DuplicateGroup]], None]):
+        """Busca en segundo plano JAR repetidos (mismo contenido o mismo id) en plugins/ y mods/"""
+        def perform_search():
+            paths = [full_path for _, full_path in get_plugins_and_mods(server_path)]
+            try:
+                groups = find_duplicate_jars(self.jar_cache.get_many(paths))
+                self.jar_cache.save()
+            except Exception as e:
+                GLib.idle_add(self._log, f"Error looking for duplicates: {e}\n")
+                groups = []
+            GLib.idle_add(callback, groups)
 
-                # Actualizar metadatos
-                self._remove_plugin_metadata(server_path, plugin.name)
-                new_plugin_name = os.path.splitext(filename)[0]
-                self._add_plugin_metadata(server_path, new_plugin_name, plugin.install_method, plugin.project_id)
+        threading.Thread(target=perform_search, daemon=True).start()
 
-                GLib.idle_add(callback, True, f"Updated {plugin.name}")
-                GLib.idle_add(self._log, f"Update completed: {filename}\n")
+    def remove_duplicates(self, server_path: str, groups: List[DuplicateGroup]) -> int:
+        """Conserva la copia más nueva de cada grupo y borra el resto
+        
+        Si la copia conservada no tiene metadatos de instalación hereda los
+        de la copia borrada, para no perder el proyecto de origen.
+        
+        Returns:
+            Número de archivos eliminados
+        """
+        store = get_plugin_metadata_store(server_path)
+        removed = 0
+        for group in groups:
+            keep_name = group.newest().file_name[:-4]
+            for item in group.to_remove():
+                try:
+                    os.remove(item.file_path)
+                except OSError as e:
+                    self._log(f"Could not remove {item.file_name}: {e}\n")
+                    continue
+                self.jar_cache.forget(item.file_path)
+                def inherit(entries, old_name=item.file_name[:-4]):
+                    entry = entries.pop(old_name, None)
+                    if entry and keep_name not in entries:
+                        entries[keep_name] = entry
+
+                store.modify(inherit)
+                removed += 1
+                self._log(f"Removed duplicate {item.file_name}, keeping {keep_name}.jar\n")
+        return removed
+
+    def find_client_only_mods(self, server_path: str) -> List[Plugin]:
+        """Mods de ``mods/`` que solo funcionan en el cliente
+        
+        Se usan los metadatos del JAR (``environment`` de Fabric/Quilt,
+        ``displayTest`` de Forge) y, para el resto, el ``server_side`` de
+        Modrinth identificando los JAR por hash con dos consultas por lotes.
+        """
+        mods = [plugin for plugin in self._scan_local_plugins(server_path)
+                if os.path.basename(os.path.dirname(plugin.file_path)) == "mods"]
+        unknown = {plugin.jar_metadata.get("sha1"): plugin for plugin in mods
+                   if not plugin.client_only and plugin.jar_metadata.get("sha1")}
 
-            except urllib.error.HTTPError as e:
-                error_msg = f"HTTP Error {e.code}: {e.reason}"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Update failed: {error_msg}\n")
+        if unknown:
+            try:
+                versions = self.http.post_json(
+                    f"{MODRINTH_API_BASE_URL}/version_files", {"hashes": list(unknown), "algorithm": "sha1"}
+                ) or {}
+                project_by_hash = {file_hash: version.get("project_id") for file_hash, version in versions.items()}
+                if project_by_hash:
+                    ids = urllib.parse.quote(json.dumps(sorted(set(project_by_hash.values()))))
+                    projects = {project.get("id"): project for project in
+                                self.http.get_json(f"{MODRINTH_API_BASE_URL}/projects?ids={ids}") or []}
+                    for file_hash, project_id in project_by_hash.items():
+                        if self._is_client_only_project(projects.get(project_id, {})):
+                            unknown[file_hash].client_only = True
             except Exception as e:
-                error_msg = f"Update error: {str(e)}"
-                GLib.idle_add(callback, False, error_msg)
-                GLib.idle_add(self._log, f"Update failed: {error_msg}\n")
+                error_msg = self._describe_error(e, "Modrinth", "Client-only check")
+                GLib.idle_add(self._log, f"Could not check mods on Modrinth: {error_msg}\n")
+
+        return [plugin for plugin in mods if plugin.client_only]
 
-        threading.Thread(target=perform_update, daemon=True).start()
+    def audit_client_only_mods(self, server_path: str, callback: Callable[[List[Plugin]], None]):
+        """Busca en segundo plano los mods solo de cliente de un servidor"""
+        def perform_audit():
+            GLib.idle_add(self._log, "Looking for client-only mods...\n")
+            GLib.idle_add(callback, self.find_client_only_mods(server_path))
+
+        threading.Thread(target=perform_audit, daemon=True).start()
+
+    def disable_mods(self, plugins: List[Plugin]) -> int:
+        """Desactiva mods renombrándolos a ``.jar.disabled`` (se pueden restaurar quitando el sufijo)
+        
+        Returns:
+            Número de mods desactivados
+        """
+        disabled = 0
+        for plugin in plugins:
+            try:
+                os.replace(plugin.file_path, plugin.file_path + DISABLED_SUFFIX)
+            except OSError as e:
+                self._log(f"Could not disable {plugin.name}: {e}\n")
+                continue
+            self.jar_cache.forget(plugin.file_path)
+            disabled += 1
+            self._log(f"Disabled client-only mod {os.path.basename(plugin.file_path)}\n")
+        return disabled
 
     def remove_local_plugin(self, plugin: Plugin, server_path: str = None) -> bool:
         """Elimina un plugin local"""
@@ -685,10 +2129,12 @@ class PluginController:
             return False
     
     def add_local_plugin(self, source_path: str, server_path: str, install_method: str = "Manual", project_id: Optional[str] = None) -> bool:
-        """Añade un plugin o mod local copiándolo al directorio correspondiente"""
+        """Añade un plugin o mod local copiándolo al directorio correspondiente
+        
+        El archivo pasa por el almacén de JAR compartido, así que añadir el
+        mismo JAR a varios servidores solo ocupa espacio una vez.
+        """
         try:
-            import shutil
-
             filename = os.path.basename(source_path)
             plugin_type = self._detect_plugin_type(source_path)
 
@@ -704,7 +2150,8 @@ class PluginController:
             os.makedirs(target_dir, exist_ok=True)
 
             target_path = os.path.join(target_dir, filename)
-            shutil.copy2(source_path, target_path)
+            sha256 = self.jar_store.add(source_path)
+            self.jar_store.deploy(sha256, target_path)
 
             # Guardar metadatos
             plugin_name = filename.replace('.jar', '')
@@ -2,26 +2,31 @@
 Controlador para manejar resource packs
 """
 import os
-import urllib.request
 import urllib.parse
-import threading
-import hashlib
 import json
 from typing import Optional, Callable, List, Tuple, Dict
 from gi.repository import GLib
 
 from models.server import MinecraftServer
+from utils.download_queue import DownloadJob, PRIORITY_USER, get_download_queue
+from utils.download_utils import download_file, format_progress
 
 
 class ResourcePackController:
     def __init__(self):
         self.log_callback: Optional[Callable[[str], None]] = None
+        self.progress_callback: Optional[Callable[[str], None]] = None
+        self.download_queue = get_download_queue()
         self.packs_updated_callback: Optional[Callable[[List[Tuple[str, str]], Tuple[str, str]], None]] = None
 
     def set_log_callback(self, callback: Callable[[str], None]):
         """Establece el callback para mensajes de log"""
         self.log_callback = callback
 
+    def set_progress_callback(self, callback: Callable[[str], None]):
+        """Establece el callback para el progreso de descarga"""
+        self.progress_callback = callback
+
     def set_packs_updated_callback(self, callback: Callable[[List[Tuple[str, str]], Tuple[str, str]], None]):
         """Establece el callback para cuando se actualizan los packs"""
         self.packs_updated_callback = callback
@@ -30,6 +35,10 @@ class ResourcePackController:
         if self.log_callback:
             self.log_callback(message)
 
+    def _progress(self, message: str):
+        if self.progress_callback:
+            self.progress_callback(message)
+
     def _metadata_file(self, server_path: str) -> str:
         return os.path.join(server_path, ".resource_pack_metadata.json")
 
@@ -52,16 +61,6 @@ class ResourcePackController:
         os.makedirs(resource_dir, exist_ok=True)
         return resource_dir
 
-    def _compute_sha1(self, file_path: str) -> str:
-        sha1 = hashlib.sha1()
-        with open(file_path, "rb") as f:
-            while True:
-                data = f.read(8192)
-                if not data:
-                    break
-                sha1.update(data)
-        return sha1.hexdigest()
-
     def get_resource_packs(self, server_path: str) -> List[Tuple[str, str]]:
         """Obtiene los resource packs disponibles"""
         resource_dir = self._get_resource_dir(server_path)
@@ -86,32 +85,45 @@ class ResourcePackController:
 
     def download_resource_pack(self, url: str, server: MinecraftServer,
                                callback: Optional[Callable[[bool, str], None]] = None):
-        """Descarga un resource pack desde una URL"""
-        def download():
-            try:
-                resource_dir = self._get_resource_dir(server.path)
-                parsed = urllib.parse.urlparse(url)
-                filename = os.path.basename(parsed.path) or "resource_pack.zip"
-                target_path = os.path.join(resource_dir, filename)
-
-                GLib.idle_add(self._log, f"Downloading resource pack from {url}...\n")
-                urllib.request.urlretrieve(url, target_path)
-                sha1 = self._compute_sha1(target_path)
-
-                metadata = self._load_metadata(server.path)
-                metadata[filename] = {"url": url, "sha1": sha1}
-                self._save_metadata(server.path, metadata)
-
-                GLib.idle_add(self._log, f"Downloaded resource pack '{filename}'.\n")
-                GLib.idle_add(self.refresh_resource_packs, server.path)
-                if callback:
-                    GLib.idle_add(callback, True, filename)
-            except Exception as e:
-                GLib.idle_add(self._log, f"Error downloading resource pack: {e}\n")
-                if callback:
-                    GLib.idle_add(callback, False, str(e))
-
-        threading.Thread(target=download, daemon=True).start()
+        """Encola la descarga de un resource pack desde una URL"""
+        resource_dir = self._get_resource_dir(server.path)
+        parsed = urllib.parse.urlparse(url)
+        filename = os.path.basename(parsed.path) or "resource_pack.zip"
+        target_path = os.path.join(resource_dir, filename)
+
+        def download(job: DownloadJob) -> str:
+            GLib.idle_add(self._log, f"Downloading resource pack from {url}...\n")
+
+            def on_progress(downloaded, total, speed):
+                message = format_progress(downloaded, total, speed)
+                GLib.idle_add(self._progress, message)
+                job.set_progress(message)
+
+            # El SHA-1 se calcula durante la descarga, sin releer el archivo
+            return download_file(
+                url, target_path, progress_callback=on_progress, cancel_event=job.cancel_event
+            )["sha1"]
+
+        def on_success(sha1: str):
+            metadata = self._load_metadata(server.path)
+            metadata[filename] = {"url": url, "sha1": sha1}
+            self._save_metadata(server.path, metadata)
+
+            GLib.idle_add(self._log, f"Downloaded resource pack '{filename}'.\n")
+            GLib.idle_add(self._progress, "")
+            GLib.idle_add(self.refresh_resource_packs, server.path)
+            if callback:
+                GLib.idle_add(callback, True, filename)
+
+        def on_error(error: Exception):
+            GLib.idle_add(self._log, f"Error downloading resource pack: {error}\n")
+            GLib.idle_add(self._progress, "")
+            if callback:
+                GLib.idle_add(callback, False, str(error))
+
+        self.download_queue.submit(
+            download, f"Resource pack {filename}", url, PRIORITY_USER, on_success, on_error
+        )
 
     def activate_resource_pack(self, server: MinecraftServer, filename: str) -> bool:
         """Activa un resource pack"""
@@ -10,7 +10,11 @@ from gi.repository import GLib
 
 from models.server import MinecraftServer
 from utils.constants import SERVER_CONFIG_FILE, EULA_ERROR_MESSAGE, DEFAULT_JAVA_MEMORY, DEFAULT_JAR_ARGS
+from utils.dependency_graph import PreflightReport, build_server_dependency_graph
 from utils.file_utils import load_json_file, save_json_file
+from utils.jar_metadata import get_jar_metadata_cache
+from utils.server_platform import detect_server_platform
+from utils.startup_profiler import StartupProfile, StartupProfiler, save_startup_profile
 
 
 class ServerController:
@@ -19,6 +23,9 @@ class ServerController:
         self.running_servers: Dict[str, subprocess.Popen] = {}
         self.console_callback: Optional[Callable[[str], None]] = None
         self.server_finished_callback: Optional[Callable[[str, int], None]] = None
+        self.startup_profile_callback: Optional[Callable[[str, StartupProfile], None]] = None
+        self.startup_profilers: Dict[str, StartupProfiler] = {}
+        self.starting_servers = set()  # Rutas de servidores en revisión previa al arranque
         self.eula_dialogs_active = set()
     
     def set_console_callback(self, callback: Callable[[str], None]):
@@ -29,6 +36,10 @@ class ServerController:
         """Establece el callback para cuando un servidor termina"""
         self.server_finished_callback = callback
     
+    def set_startup_profile_callback(self, callback: Callable[[str, StartupProfile], None]):
+        """Establece el callback para cuando se completa el perfil de arranque de un servidor"""
+        self.startup_profile_callback = callback
+
     def _log(self, message: str):
         """Envía un mensaje a la consola si hay callback configurado"""
         if self.console_callback:
@@ -107,9 +118,20 @@ class ServerController:
     def is_server_running(self, server: MinecraftServer) -> bool:
         """Verifica si un servidor está ejecutándose"""
         return server.path in self.running_servers
+
+    def is_server_starting(self, server: MinecraftServer) -> bool:
+        """Verifica si un servidor está en la revisión previa al arranque"""
+        return server.path in self.starting_servers
     
-    def start_server(self, server: MinecraftServer) -> bool:
-        """Inicia un servidor"""
+    def start_server(self, server: MinecraftServer, callback: Optional[Callable[[bool], None]] = None) -> bool:
+        """Inicia un servidor
+        
+        Las comprobaciones rápidas se hacen al momento. La revisión de
+        dependencias (que con la caché vacía abre todos los JAR) se hace en un
+        hilo y el proceso se lanza después desde el hilo principal;
+        ``callback(started)`` se invoca entonces. Devuelve False si el
+        arranque ni siquiera empieza.
+        """
         if not server.has_jar_file():
             self._log("Please download a server JAR first or select an existing one.\n")
             return False
@@ -117,6 +139,10 @@ class ServerController:
         if self.is_server_running(server):
             self._log(f"Server '{server.name}' is already running.\n")
             return False
+
+        if self.is_server_starting(server):
+            self._log(f"Server '{server.name}' is already starting.\n")
+            return False
         
         # Verificar EULA antes de iniciar
         if not self._check_eula(server):
@@ -126,7 +152,26 @@ class ServerController:
         if not os.path.exists(full_jar_path):
             self._log(f"Error: Server JAR not found at '{full_jar_path}'. Please check the path.\n")
             return False
-        
+
+        self.starting_servers.add(server.path)
+
+        def check_and_launch():
+            self.preflight_check(server)
+            GLib.idle_add(self._launch_server, server, callback)
+
+        threading.Thread(target=check_and_launch, daemon=True).start()
+        return True
+
+    def _launch_server(self, server: MinecraftServer, callback: Optional[Callable[[bool], None]]):
+        """Lanza el proceso del servidor tras la revisión previa (hilo principal)"""
+        self.starting_servers.discard(server.path)
+        started = self._spawn_server_process(server)
+        if callback:
+            callback(started)
+        return False
+
+    def _spawn_server_process(self, server: MinecraftServer) -> bool:
+        """Arranca el proceso Java del servidor y los hilos que leen su salida"""
         try:
             self._log(f"Starting server '{server.name}' using {server.jar}...\n")
             
@@ -158,6 +203,7 @@ class ServerController:
                 )
             
             self.running_servers[server.path] = process
+            self.startup_profilers[server.path] = StartupProfiler()
             server.process = process
             server.is_running = True
             
@@ -174,6 +220,29 @@ class ServerController:
             self._log(f"Failed to start server: {e}\n")
             return False
     
+    def preflight_check(self, server: MinecraftServer) -> Optional[PreflightReport]:
+        """Revisa las dependencias de plugins y mods antes de arrancar
+        
+        Los problemas se muestran en la consola pero no impiden el arranque.
+        Se ejecuta en un hilo de trabajo.
+        """
+        try:
+            jar_cache = get_jar_metadata_cache()
+            graph = build_server_dependency_graph(server.path, jar_cache)
+            jar_cache.save()
+            platform = detect_server_platform(server.path, server.jar)
+            report = graph.preflight(platform.minecraft_version)
+        except Exception as e:
+            GLib.idle_add(self._log, f"Dependency check failed: {e}\n")
+            return None
+
+        problems = report.describe()
+        if problems:
+            GLib.idle_add(self._log, f"Dependency check found {len(problems)} problems:\n")
+            for problem in problems:
+                GLib.idle_add(self._log, f"  ⚠ {problem}\n")
+        return report
+
     def stop_server(self, server: MinecraftServer) -> bool:
         """Detiene un servidor de forma elegante"""
         process = self.running_servers.get(server.path)
@@ -271,12 +340,23 @@ class ServerController:
         try:
             for line in process.stdout:
                 GLib.idle_add(self._log, line)
+                self._profile_startup_line(server, line)
                 if EULA_ERROR_MESSAGE in line and server.path not in self.eula_dialogs_active:
                     self.eula_dialogs_active.add(server.path)
                     # Aquí se podría emitir una señal para mostrar diálogo EULA
         except Exception as e:
             GLib.idle_add(self._log, f"Error reading stdout: {e}\n")
     
+    def _profile_startup_line(self, server: MinecraftServer, line: str):
+        """Pasa una línea de salida al perfil de arranque mientras el servidor arranca"""
+        profiler = self.startup_profilers.get(server.path)
+        if profiler is None or not profiler.feed_line(line, time.time()):
+            return
+        self.startup_profilers.pop(server.path, None)
+        save_startup_profile(server.path, profiler.profile)
+        if self.startup_profile_callback:
+            GLib.idle_add(self.startup_profile_callback, server.path, profiler.profile)
+
     def _read_stderr(self, process: subprocess.Popen, server: MinecraftServer):
         """Lee la salida de error del proceso"""
         try:
@@ -297,6 +377,8 @@ class ServerController:
         """Maneja cuando un servidor termina"""
         if server.path in self.running_servers:
             del self.running_servers[server.path]
+        # Un arranque interrumpido no se guarda en el historial
+        self.startup_profilers.pop(server.path, None)
         
         server.process = None
         server.is_running = False
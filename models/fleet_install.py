@@ -0,0 +1,34 @@
+"""
+Modelo para el resultado de instalar un proyecto en varios servidores a la vez
+"""
+
+STATUS_INSTALLED = "installed"
+STATUS_UPDATED = "updated"
+STATUS_UP_TO_DATE = "up_to_date"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+
+class FleetInstallResult:
+    def __init__(self, server_name: str, server_path: str, status: str, message: str = ""):
+        self.server_name = server_name
+        self.server_path = server_path
+        self.status = status
+        self.message = message
+
+    def succeeded(self) -> bool:
+        return self.status in (STATUS_INSTALLED, STATUS_UPDATED, STATUS_UP_TO_DATE)
+
+    def describe(self) -> str:
+        labels = {
+            STATUS_INSTALLED: "installed",
+            STATUS_UPDATED: "updated",
+            STATUS_UP_TO_DATE: "already up to date",
+            STATUS_SKIPPED: "skipped",
+            STATUS_FAILED: "failed",
+        }
+        text = f"{self.server_name}: {labels.get(self.status, self.status)}"
+        return f"{text} ({self.message})" if self.message else text
+
+    def __str__(self) -> str:
+        return f"FleetInstallResult(server='{self.server_name}', status='{self.status}')"
@@ -0,0 +1,38 @@
+"""
+Modelo para representar un plan de instalación con sus dependencias
+"""
+from typing import Dict, List, Optional
+
+
+class PlannedInstall:
+    def __init__(self, project_id: str, name: str, version_number: str, version_id: str,
+                 version_file: Dict, project_type: str = "plugin", required_by: Optional[str] = None):
+        self.project_id = project_id
+        self.name = name
+        self.version_number = version_number
+        self.version_id = version_id
+        self.version_file = version_file  # Archivo principal: url, filename, hashes
+        self.project_type = project_type
+        self.required_by = required_by  # Nombre del proyecto que lo requiere (None en el raíz)
+
+    def is_dependency(self) -> bool:
+        return self.required_by is not None
+
+    def __str__(self) -> str:
+        return f"PlannedInstall(name='{self.name}', version='{self.version_number}')"
+
+
+class InstallPlan:
+    def __init__(self, root: PlannedInstall):
+        self.root = root
+        self.items: List[PlannedInstall] = [root]
+        self.already_installed: List[str] = []  # Dependencias que ya están en el servidor
+        self.warnings: List[str] = []
+
+    @property
+    def dependencies(self) -> List[PlannedInstall]:
+        return [item for item in self.items if item.is_dependency()]
+
+    def needs_confirmation(self) -> bool:
+        """Hay algo más que el proyecto pedido que el usuario debería revisar"""
+        return bool(self.dependencies or self.warnings)
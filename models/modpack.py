@@ -0,0 +1,43 @@
+"""
+Modelo para representar un modpack (.mrpack de Modrinth o zip de CurseForge)
+"""
+from typing import Dict, List, Optional
+
+
+class ModpackFile:
+    def __init__(self, path: str, urls: Optional[List[str]] = None, hashes: Optional[Dict[str, str]] = None,
+                 size: Optional[int] = None, project_id: Optional[str] = None, file_id: Optional[int] = None):
+        self.path = path  # Ruta relativa a la carpeta del servidor (mods/x.jar)
+        self.urls = urls or []
+        self.hashes = hashes or {}
+        self.size = size
+        self.project_id = project_id
+        self.file_id = file_id  # Solo CurseForge: se resuelve a URL con la API
+
+    def __str__(self) -> str:
+        return f"ModpackFile(path='{self.path}')"
+
+
+class Modpack:
+    def __init__(self, name: str, version: str, source: str, minecraft_version: Optional[str] = None,
+                 loader: Optional[str] = None, loader_version: Optional[str] = None):
+        self.name = name
+        self.version = version
+        self.source = source  # "Modrinth" o "CurseForge"
+        self.minecraft_version = minecraft_version
+        self.loader = loader  # fabric, quilt, forge, neoforge
+        self.loader_version = loader_version
+        self.files: List[ModpackFile] = []
+        self.client_only_files: List[str] = []  # Archivos omitidos por no servir en el servidor
+        self.override_dirs: List[str] = []  # Carpetas del zip que se copian tal cual, en orden
+
+    def describe(self) -> str:
+        parts = [f"{self.name} {self.version}".strip()]
+        if self.loader:
+            parts.append(f"{self.loader.capitalize()} {self.loader_version or ''}".strip())
+        if self.minecraft_version:
+            parts.append(f"Minecraft {self.minecraft_version}")
+        return ", ".join(parts)
+
+    def __str__(self) -> str:
+        return f"Modpack(name='{self.name}', files={len(self.files)})"
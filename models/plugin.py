@@ -1,18 +1,37 @@
 """
 Modelo para representar plugins/mods
 """
-from typing import Optional
+import sys
+from typing import Dict, Optional, Sequence
 
 
 class Plugin:
+    # Una búsqueda combinada puede devolver miles de resultados: sin __dict__
+    # cada objeto ocupa bastante menos memoria
+    __slots__ = (
+        "name", "source", "version", "file_path", "description", "install_method", "project_id",
+        "client_only", "project_type", "icon_url", "slug", "author", "downloads", "also_on", "jar_metadata",
+    )
+
     def __init__(self, name: str, source: str = "Local", version: str = "Unknown", file_path: Optional[str] = None, description: str = "", install_method: str = "Manual"):
         self.name = name
-        self.source = source  # "Local", "Modrinth", etc.
+        # Los valores que se repiten en todos los resultados se comparten (intern)
+        self.source = sys.intern(source)  # "Local", "Modrinth", etc.
         self.version = version
         self.file_path = file_path
         self.description = description
-        self.install_method = install_method  # "Manual", "Modrinth", "CurseForge", etc.
+        self.install_method = sys.intern(install_method)  # "Manual", "Modrinth", "CurseForge", etc.
         self.project_id = None  # ID del proyecto en la fuente externa (para actualizaciones)
+        self.client_only = False  # Mod solo para el cliente: no hace nada en un servidor dedicado
+        # Datos de los resultados de búsqueda
+        self.project_type = "plugin"  # "plugin" o "mod"
+        self.icon_url = ""
+        self.slug = ""
+        self.author = ""
+        self.downloads = 0
+        self.also_on: Sequence[str] = ()  # Otras fuentes que publican el mismo proyecto
+        # Descriptor leído del JAR (solo plugins locales)
+        self.jar_metadata: Optional[Dict] = None
     
     def is_local(self) -> bool:
         """Verifica si el plugin es local"""
@@ -0,0 +1,31 @@
+"""
+Modelo para representar una actualización disponible de un plugin/mod
+"""
+from typing import Dict, Optional
+
+
+class PluginUpdate:
+    def __init__(self, name: str, file_path: str, project_id: str, current_version: str,
+                 latest_version: str, current_version_id: str, latest_version_id: str,
+                 download_url: Optional[str] = None, filename: Optional[str] = None,
+                 hashes: Optional[Dict[str, str]] = None, plugin_type: str = "plugin",
+                 source: str = "Modrinth"):
+        self.name = name
+        self.file_path = file_path
+        self.project_id = project_id
+        self.current_version = current_version
+        self.latest_version = latest_version
+        self.current_version_id = current_version_id
+        self.latest_version_id = latest_version_id
+        self.download_url = download_url  # Archivo principal de la última versión
+        self.filename = filename
+        self.hashes = hashes or {}
+        self.plugin_type = plugin_type
+        self.source = source  # Modrinth, Spigot o CurseForge
+    
+    def has_update(self) -> bool:
+        """Verifica si hay una versión más reciente descargable"""
+        return bool(self.download_url) and self.latest_version_id != self.current_version_id
+    
+    def __str__(self) -> str:
+        return f"PluginUpdate(name='{self.name}', current='{self.current_version}', latest='{self.latest_version}')"
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.dependency_graph import build_dependency_graph
+
+
+def _plugin(name, depend=(), **extra):
+    return dict({"id": name, "name": name, "type": "plugin", "dependencies": list(depend)}, **extra)
+
+
+def test_preflight_reports_missing_cycles_duplicates_and_api_version():
+    graph = build_dependency_graph({
+        "plugins/Shop.jar": _plugin("Shop", ["Vault", "Economy"]),
+        "plugins/Vault.jar": _plugin("Vault", provides=["VaultAPI"]),
+        "plugins/A.jar": _plugin("A", ["B"]),
+        "plugins/B.jar": _plugin("B", ["A"]),
+        "plugins/Self.jar": _plugin("Self", ["Self"]),
+        "plugins/Uses.jar": _plugin("Uses", ["VaultAPI"], api_version="1.21"),
+        "plugins/Vault-old.jar": _plugin("Vault"),
+        "mods/sodium.jar": {"id": "sodium", "type": "mod", "dependencies": ["Vault"]},
+    })
+
+    report = graph.preflight("1.20.4")
+
+    assert report.missing == [("Shop", "Economy"), ("sodium", "Vault")]
+    assert sorted(report.cycles) == [["A", "B"], ["Self"]]
+    assert report.duplicates == {"Vault": ["Vault.jar", "Vault-old.jar"]}
+    assert report.incompatible == [("Uses", "1.21")]
+    assert len(report.describe()) == 6
+
+
+def test_clean_graph_has_no_problems():
+    graph = build_dependency_graph({
+        "plugins/Shop.jar": _plugin("Shop", ["Vault"], api_version="1.13"),
+        "plugins/Vault.jar": _plugin("Vault"),
+    })
+    assert not graph.preflight("1.20.4").has_problems()
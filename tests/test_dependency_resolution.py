@@ -0,0 +1,96 @@
+import json
+import sys
+import urllib.parse
+from pathlib import Path
+import types
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+gi = types.ModuleType("gi")
+repository = types.ModuleType("repository")
+gi.repository = repository
+repository.GLib = types.SimpleNamespace(idle_add=lambda *args, **kwargs: None)
+sys.modules.setdefault("gi", gi)
+sys.modules.setdefault("gi.repository", repository)
+sys.modules.setdefault("gi.repository.GLib", repository.GLib)
+
+from controllers.plugin_controller import PluginController
+
+
+def _version(version_id, project_id, dependencies=()):
+    return {
+        "id": version_id,
+        "project_id": project_id,
+        "version_number": version_id,
+        "files": [{"url": f"https://cdn/{version_id}.jar", "filename": f"{version_id}.jar", "primary": True}],
+        "dependencies": list(dependencies),
+    }
+
+
+class _FakeModrinth:
+    projects = {
+        "root": {"id": "root", "title": "Root Mod", "project_type": "mod"},
+        "api": {"id": "api", "title": "Fabric API", "project_type": "mod"},
+        "lib": {"id": "lib", "title": "Cloth Config", "project_type": "mod"},
+        "installed": {"id": "installed", "title": "Installed Lib", "project_type": "mod"},
+    }
+    latest = {
+        "root": _version("root-2", "root", [
+            {"project_id": "api", "dependency_type": "required"},
+            {"project_id": "lib", "version_id": "lib-1", "dependency_type": "required"},
+            {"project_id": "installed", "dependency_type": "required"},
+            {"project_id": "extra", "dependency_type": "optional"},
+        ]),
+        "api": _version("api-9", "api", [{"project_id": "lib", "dependency_type": "required"}]),
+    }
+    pinned = {"lib-1": _version("lib-1", "lib")}
+
+    def __init__(self):
+        self.urls = []
+
+    def get_json(self, url, headers=None):
+        self.urls.append(url)
+        path, _, query = url.split("/v2/", 1)[-1].partition("?")
+        params = dict(urllib.parse.parse_qsl(query))
+        if path == "versions":
+            return [self.pinned[i] for i in json.loads(params["ids"])]
+        if path == "projects":
+            return [self.projects[i] for i in json.loads(params["ids"])]
+        if path.endswith("/version"):
+            assert json.loads(params["loaders"]) == ["fabric"]
+            return [self.latest[path.split("/")[1]]]
+        return self.projects[path.split("/")[1]]
+
+
+def test_resolves_required_dependencies_transitively(tmp_path):
+    (tmp_path / ".fabric").mkdir()
+    (tmp_path / ".plugin_metadata.json").write_text(json.dumps({"installed-1.0": {"project_id": "installed"}}))
+    controller = PluginController()
+    controller.http = _FakeModrinth()
+
+    plan = controller.resolve_modrinth_install("root", str(tmp_path))
+
+    assert [(item.name, item.version_id, item.required_by) for item in plan.items] == [
+        ("Root Mod", "root-2", None),
+        ("Cloth Config", "lib-1", "Root Mod"),
+        ("Fabric API", "api-9", "Root Mod"),
+    ]
+    assert plan.already_installed == ["installed-1.0"]
+    assert all(item.project_type == "mod" for item in plan.items)
+    assert plan.needs_confirmation()
+    # La dependencia fija de lib-1 se pidió junto al resto en una sola consulta
+    assert sum(1 for url in controller.http.urls if "/versions?" in url) == 1
+
+
+def test_skips_client_only_dependencies(tmp_path):
+    (tmp_path / ".fabric").mkdir()
+    (tmp_path / ".plugin_metadata.json").write_text(json.dumps({"installed-1.0": {"project_id": "installed"}}))
+    controller = PluginController()
+    controller.http = _FakeModrinth()
+    controller.http.projects = dict(_FakeModrinth.projects, api=dict(_FakeModrinth.projects["api"],
+                                                                     server_side="unsupported"))
+
+    plan = controller.resolve_modrinth_install("root", str(tmp_path))
+
+    assert [item.name for item in plan.items] == ["Root Mod", "Cloth Config"]
+    assert plan.warnings == ["Skipping Fabric API (required by Root Mod): client-only"]
@@ -0,0 +1,111 @@
+import sys
+import threading
+import urllib.error
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import utils.download_queue as download_queue
+from utils.download_queue import (
+    DownloadQueue,
+    PRIORITY_BACKGROUND,
+    PRIORITY_USER,
+    STATUS_CANCELLED,
+    STATUS_DONE,
+)
+
+
+def test_user_jobs_run_before_background_jobs():
+    queue = DownloadQueue(max_workers=1)
+    gate = threading.Event()
+    order = []
+    finished = threading.Event()
+
+    queue.submit(lambda job: gate.wait(5), "blocker", "http://a.example")
+    queue.submit(lambda job: order.append("background"), "bg", "http://b.example", PRIORITY_BACKGROUND)
+    queue.submit(lambda job: order.append("user"), "user", "http://c.example", PRIORITY_USER,
+                 on_success=lambda result: finished.set())
+    queue.submit(lambda job: order.append("late"), "late", "http://d.example", PRIORITY_BACKGROUND,
+                 on_success=lambda result: finished.set())
+    gate.set()
+    assert finished.wait(5)
+    assert order[0] == "user"
+
+
+def test_per_host_limit():
+    queue = DownloadQueue(max_workers=4, max_per_host=1)
+    lock = threading.Lock()
+    running = []
+    peak = []
+    done = threading.Semaphore(0)
+
+    def work(job):
+        with lock:
+            running.append(job.id)
+            peak.append(len(running))
+        threading.Event().wait(0.05)
+        with lock:
+            running.remove(job.id)
+
+    for i in range(4):
+        queue.submit(work, f"job{i}", "https://api.example.com/x", on_success=lambda r: done.release())
+    for _ in range(4):
+        assert done.acquire(timeout=5)
+    assert max(peak) == 1
+
+
+def test_retries_on_server_errors(monkeypatch):
+    monkeypatch.setattr(download_queue, "BACKOFF_BASE_SECONDS", 0.01)
+    queue = DownloadQueue(max_workers=1)
+    attempts = []
+    finished = threading.Event()
+
+    def flaky(job):
+        attempts.append(job.attempts)
+        if len(attempts) < 3:
+            raise urllib.error.HTTPError("http://x", 503, "Unavailable", {}, None)
+        return "ok"
+
+    job = queue.submit(flaky, "flaky", "http://x", on_success=lambda result: finished.set())
+    assert finished.wait(5)
+    assert attempts == [1, 2, 3]
+    assert job.status == STATUS_DONE
+
+
+def test_cancel_pending_job():
+    queue = DownloadQueue(max_workers=1)
+    gate = threading.Event()
+    errors = []
+    queue.submit(lambda job: gate.wait(5), "blocker", "http://a")
+    job = queue.submit(lambda job: None, "pending", "http://b", on_error=errors.append)
+    job.cancel()
+    gate.set()
+    assert job.status == STATUS_CANCELLED
+    assert len(errors) == 1
+
+
+def test_only_transient_errors_are_retried():
+    import socket
+    assert download_queue.is_retryable_error(urllib.error.HTTPError("http://x", 429, "Too Many", {}, None))
+    assert download_queue.is_retryable_error(urllib.error.URLError(socket.timeout("timed out")))
+    assert download_queue.is_retryable_error(ConnectionResetError())
+    assert not download_queue.is_retryable_error(urllib.error.HTTPError("http://x", 404, "Not Found", {}, None))
+    assert not download_queue.is_retryable_error(urllib.error.URLError(socket.gaierror("Name not known")))
+    assert not download_queue.is_retryable_error(urllib.error.URLError(ConnectionRefusedError()))
+
+
+def test_failing_callback_keeps_worker_alive_and_finished_jobs_are_pruned(monkeypatch):
+    monkeypatch.setattr(download_queue, "MAX_FINISHED_JOBS", 2)
+    queue = DownloadQueue(max_workers=1)
+    done = threading.Semaphore(0)
+
+    def broken_callback(result):
+        done.release()
+        raise RuntimeError("callback bug")
+
+    for i in range(4):
+        queue.submit(lambda job: None, f"job{i}", "http://a", on_success=broken_callback)
+    for _ in range(4):
+        assert done.acquire(timeout=5)
+
+    assert [job.name for job in queue.get_jobs()] == ["job2", "job3"]
@@ -0,0 +1,76 @@
+import hashlib
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.download_utils import curseforge_hashes, download_file
+from utils.http_client import get_http_client
+
+PAYLOAD = bytes(range(256)) * 1024
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        body = PAYLOAD[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(("127.0.0.1", 0), _RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/file.jar"
+    # Las descargas usan el cliente compartido: liberar sus conexiones
+    get_http_client().close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_verifies_hash_and_renames(tmp_path, server_url):
+    target = tmp_path / "file.jar"
+    expected = hashlib.sha512(PAYLOAD).hexdigest()
+    digests = download_file(server_url, str(target), expected_hashes={"sha512": expected})
+    assert target.read_bytes() == PAYLOAD
+    assert digests["sha1"] == hashlib.sha1(PAYLOAD).hexdigest()
+    assert not (tmp_path / "file.jar.part").exists()
+
+
+def test_download_resumes_partial_file(tmp_path, server_url):
+    target = tmp_path / "file.jar"
+    (tmp_path / "file.jar.part").write_bytes(PAYLOAD[:1000])
+    progress = []
+    digests = download_file(server_url, str(target), progress_callback=lambda *args: progress.append(args))
+    assert target.read_bytes() == PAYLOAD
+    assert digests["sha256"] == hashlib.sha256(PAYLOAD).hexdigest()
+    assert progress[-1][0] == len(PAYLOAD)
+
+
+def test_download_rejects_hash_mismatch(tmp_path, server_url):
+    target = tmp_path / "file.jar"
+    with pytest.raises(ValueError):
+        download_file(server_url, str(target), expected_hashes={"sha1": "0" * 40})
+    assert not target.exists()
+    assert not (tmp_path / "file.jar.part").exists()
+
+
+def test_curseforge_hashes():
+    data = {"hashes": [{"value": "abc", "algo": 1}, {"value": "def", "algo": 2}]}
+    assert curseforge_hashes(data) == {"sha1": "abc", "md5": "def"}
@@ -0,0 +1,38 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.duplicate_jars import REASON_IDENTICAL, REASON_SAME_ID, find_duplicate_jars, version_sort_key
+
+
+def test_version_sort_key_orders_numbers_and_prereleases():
+    versions = ["1.10.2", "1.9", "2.0-SNAPSHOT", "2.0", "Unknown", "v1.10"]
+    assert sorted(versions, key=version_sort_key) == ["Unknown", "1.9", "v1.10", "1.10.2", "2.0-SNAPSHOT", "2.0"]
+
+
+def test_groups_by_id_across_folders_and_by_hash(tmp_path):
+    paths = {name: str(tmp_path / name) for name in ("Foo-1.2.jar", "Foo-1.3.jar", "foo-mod.jar",
+                                                    "a.jar", "b.jar", "Bar.jar")}
+    for path in paths.values():
+        Path(path).write_bytes(b"x")
+    os.utime(paths["Foo-1.2.jar"], (0, 10**9 * 2))
+    metadata = {
+        paths["Foo-1.2.jar"]: {"id": "Foo", "name": "Foo", "version": "1.2", "sha1": "f12"},
+        paths["Foo-1.3.jar"]: {"id": "Foo", "name": "Foo", "version": "1.3", "sha1": "f13"},
+        paths["foo-mod.jar"]: {"id": "foo", "version": "Unknown", "sha1": "fm"},
+        paths["a.jar"]: {"id": None, "sha1": "same"},
+        paths["b.jar"]: {"id": None, "sha1": "same"},
+        paths["Bar.jar"]: {"id": "Bar", "version": "1.0", "sha1": "bar"},
+    }
+
+    groups = find_duplicate_jars(metadata)
+
+    assert [(g.name, g.reason, len(g.files)) for g in groups] == [
+        ("a", REASON_IDENTICAL, 2),
+        ("Foo", REASON_SAME_ID, 3),
+    ]
+    foo = groups[1]
+    assert foo.newest().file_name == "Foo-1.3.jar"
+    assert sorted(item.file_name for item in foo.to_remove()) == ["Foo-1.2.jar", "foo-mod.jar"]
@@ -0,0 +1,104 @@
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.http_cache import HttpCache, parse_cache_control
+from utils.http_client import HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = []
+
+    def do_GET(self):
+        _Handler.hits.append(self.path)
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        if self.path == "/fresh":
+            self.send_header("Cache-Control", "max-age=60")
+        elif self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+            self.send_header("Cache-Control", "no-cache")
+        elif self.path == "/nostore":
+            self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.delenv("http_proxy", raising=False)
+    monkeypatch.delenv("HTTP_PROXY", raising=False)
+    _Handler.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache = HttpCache(str(tmp_path / "http"), ttl_overrides={})
+    http_client = HttpClient(cache=cache)
+    http_client.base_url = f"http://127.0.0.1:{server.server_port}"
+    yield http_client
+    http_client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_fresh_response_served_without_network(client):
+    first = client.get(f"{client.base_url}/fresh")
+    second = client.get(f"{client.base_url}/fresh")
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.json() == {"path": "/fresh"}
+    assert _Handler.hits == ["/fresh"]
+    assert client.cache.get_metrics()["hits"] == 1
+
+
+def test_etag_revalidation(client):
+    client.get(f"{client.base_url}/etag")
+    second = client.get(f"{client.base_url}/etag")
+    assert second.from_cache
+    assert second.json() == {"path": "/etag"}
+    assert len(_Handler.hits) == 2
+    assert client.cache.get_metrics()["revalidated"] == 1
+
+
+def test_no_store_and_ttl_override(client):
+    client.get(f"{client.base_url}/nostore")
+    client.get(f"{client.base_url}/nostore")
+    assert _Handler.hits == ["/nostore", "/nostore"]
+
+    client.cache.set_ttl(f"{client.base_url}/plain", 60)
+    client.get(f"{client.base_url}/plain")
+    assert client.get(f"{client.base_url}/plain").from_cache
+
+
+def test_eviction_respects_size_cap(tmp_path):
+    cache = HttpCache(str(tmp_path / "http"), max_bytes=3000, ttl_overrides={"http://x/": 60})
+    for i in range(10):
+        cache.store(f"http://x/{i}", {}, 200, {}, b"a" * 500)
+    assert cache.get_metrics()["evictions"] > 0
+    assert cache.lookup("http://x/9") is not None
+    assert cache.lookup("http://x/0") is None
+
+
+def test_parse_cache_control():
+    assert parse_cache_control("public, max-age=300, no-cache") == {
+        "public": None,
+        "max-age": "300",
+        "no-cache": None,
+    }
@@ -0,0 +1,83 @@
+import gzip
+import json
+import sys
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.http_client import HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/json")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"path": self.path, "agent": self.headers.get("User-Agent")}).encode()
+        self.send_response(200)
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.delenv("http_proxy", raising=False)
+    monkeypatch.delenv("HTTP_PROXY", raising=False)
+    client = HttpClient()
+    yield client
+    # Libera las conexiones del pool para no dejar sockets abiertos
+    client.close()
+
+
+def test_reuses_connections_and_decodes_gzip(base_url, client):
+    for _ in range(3):
+        data = client.get_json(f"{base_url}/json")
+        assert data["path"] == "/json"
+        assert data["agent"].startswith("MinecraftServerManager")
+
+    metrics = client.get_metrics()
+    assert metrics["requests"] == 3
+    assert metrics["new_connections"] == 1
+    assert metrics["reused_connections"] == 2
+
+
+def test_follows_redirects(base_url, client):
+    assert client.get_json(f"{base_url}/redirect")["path"] == "/json"
+
+
+def test_raises_http_error(base_url, client):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        client.get(f"{base_url}/missing")
+    assert excinfo.value.code == 404
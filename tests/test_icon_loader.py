@@ -0,0 +1,52 @@
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.icon_loader import ICON_MISSING, IconLoader
+
+
+def test_loader_deduplicates_in_flight_requests_and_bounds_cache():
+    release = threading.Event()
+    fetched = []
+    done = threading.Semaphore(0)
+
+    def fetch(url):
+        fetched.append(url)
+        release.wait(5)
+        if url.endswith("broken.png"):
+            raise OSError("404")
+        return url.encode()
+
+    loader = IconLoader(lambda data: data.decode().upper(), fetch, workers=2, max_entries=2)
+    received = []
+
+    def callback(url, icon):
+        received.append((url, icon))
+        done.release()
+
+    for _ in range(50):
+        assert loader.request("https://cdn/a.png", callback) is None
+    loader.request("https://cdn/broken.png", callback)
+    release.set()
+    assert done.acquire(timeout=5) and done.acquire(timeout=5)
+
+    assert sorted(fetched) == ["https://cdn/a.png", "https://cdn/broken.png"]
+    assert sorted(received) == [("https://cdn/a.png", "HTTPS://CDN/A.PNG"), ("https://cdn/broken.png", ICON_MISSING)]
+    # Los fallos también se recuerdan y no se vuelven a descargar
+    assert loader.request("https://cdn/broken.png", callback) is ICON_MISSING
+
+    loader.request("https://cdn/c.png", callback)
+    assert done.acquire(timeout=5)
+    # Caché LRU de dos entradas: a.png era la menos usada
+    assert loader.get("https://cdn/a.png") is None
+    assert loader.get("https://cdn/c.png") == "HTTPS://CDN/C.PNG"
+
+
+def test_clear_pending_drops_queued_requests():
+    loader = IconLoader(lambda data: data, lambda url: b"", workers=0)
+    for index in range(5):
+        loader.request(f"https://cdn/{index}.png")
+    loader.clear_pending()
+    assert not loader._pending and not loader._callbacks
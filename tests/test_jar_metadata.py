@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import utils.jar_metadata as jar_metadata
+from utils.jar_metadata import JarMetadataCache, read_jar_metadata
+
+
+def _jar(path, files):
+    with zipfile.ZipFile(path, "w") as jar:
+        for name, content in files.items():
+            jar.writestr(name, content)
+    return str(path)
+
+
+def test_reads_plugin_yml(tmp_path):
+    path = _jar(tmp_path / "p.jar", {
+        "plugin.yml": "name: Shop\nversion: 2.0\nmain: com.example.Shop\ndepend: [Vault]\nsoftdepend: [PlaceholderAPI]\n"
+                      "loadbefore: [Essentials]\napi-version: '1.20'\n",
+    })
+    meta = read_jar_metadata(path)
+    assert (meta["name"], meta["version"], meta["type"], meta["main"]) == ("Shop", "2.0", "plugin", "com.example.Shop")
+    assert meta["dependencies"] == ["Vault"]
+    assert meta["soft_dependencies"] == ["PlaceholderAPI"]
+    assert (meta["load_before"], meta["api_version"]) == (["Essentials"], "1.20")
+    assert len(meta["sha1"]) == 40 and len(meta["sha512"]) == 128
+
+
+def test_reads_fabric_and_forge_metadata(tmp_path):
+    fabric = _jar(tmp_path / "f.jar", {"fabric.mod.json": json.dumps({
+        "id": "sodium", "version": "0.5.8", "environment": "client",
+        "depends": {"fabricloader": ">=0.12", "minecraft": "1.20.4", "fabric-api": "*"},
+    })})
+    meta = read_jar_metadata(fabric, with_hashes=False)
+    assert (meta["id"], meta["version"], meta["environment"]) == ("sodium", "0.5.8", "client")
+    assert meta["dependencies"] == ["fabric-api"]
+
+    forge = _jar(tmp_path / "g.jar", {
+        "META-INF/mods.toml": (
+            'modLoader="javafml"\nloaderVersion="[47,)"\n[[mods]]\nmodId="jei"\nversion="${file.jarVersion}"\n'
+            'displayName="Just Enough Items"\n[[dependencies.jei]]\nmodId="forge"\nmandatory=true\n'
+            '[[dependencies.jei]]\nmodId="architectury"\nmandatory=true\n'
+        ),
+        "META-INF/MANIFEST.MF": "Manifest-Version: 1.0\nImplementation-Version: 15.3.0\n",
+    })
+    meta = read_jar_metadata(forge, with_hashes=False)
+    assert (meta["id"], meta["name"], meta["version"], meta["loader"]) == ("jei", "Just Enough Items", "15.3.0", "forge")
+    assert meta["dependencies"] == ["architectury"]
+
+
+def test_cache_only_rereads_changed_files(tmp_path, monkeypatch):
+    path = _jar(tmp_path / "p.jar", {"plugin.yml": "name: A\nversion: 1\n"})
+    cache_file = str(tmp_path / "cache.json")
+    reads = []
+    original = jar_metadata.read_jar_metadata
+    monkeypatch.setattr(jar_metadata, "read_jar_metadata", lambda p, **kw: reads.append(p) or original(p, **kw))
+
+    cache = JarMetadataCache(cache_file)
+    assert cache.get(path)["version"] == "1"
+    cache.save()
+
+    # Una instancia nueva usa el archivo persistido
+    cache = JarMetadataCache(cache_file)
+    assert cache.get(path)["version"] == "1"
+    assert len(reads) == 1
+
+    _jar(tmp_path / "p.jar", {"plugin.yml": "name: A\nversion: 2\n"})
+    os.utime(path, ns=(1, 1))
+    assert cache.get(path)["version"] == "2"
+    assert len(reads) == 2
+
+
+def test_fabric_nested_jars_are_provided(tmp_path):
+    import io
+
+    module = io.BytesIO()
+    with zipfile.ZipFile(module, "w") as jar:
+        jar.writestr("fabric.mod.json", json.dumps({"id": "fabric-networking-api-v1", "version": "1.3"}))
+    fabric_api = _jar(tmp_path / "fabric-api.jar", {
+        "fabric.mod.json": json.dumps({"id": "fabric-api", "version": "0.92.0"}),
+        "META-INF/jars/fabric-networking-api-v1.jar": module.getvalue(),
+        "META-INF/jars/broken.jar": b"not a zip",
+    })
+    meta = read_jar_metadata(fabric_api, with_hashes=False)
+    assert meta["provides"] == ["fabric-networking-api-v1"]
+
+    from utils.dependency_graph import build_dependency_graph
+    graph = build_dependency_graph({
+        fabric_api: meta,
+        "mods/lithium.jar": {"id": "lithium", "type": "mod", "dependencies": ["fabric-networking-api-v1"]},
+    })
+    assert not graph.preflight("1.20.4").missing
+
+    # Un fabric.mod.json cuya raíz no es un objeto no rompe la lectura
+    odd = _jar(tmp_path / "odd.jar", {"fabric.mod.json": "[1, 2]"})
+    assert read_jar_metadata(odd, with_hashes=False)["id"] is None
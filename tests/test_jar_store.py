@@ -0,0 +1,76 @@
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.jar_store import DEPLOY_COPY, DEPLOY_HARDLINK, DEPLOY_REFLINK, JarStore
+
+
+def test_store_finds_blobs_by_provider_hashes_and_deploys(tmp_path):
+    data = b"plugin jar contents"
+    source = tmp_path / "Shop.jar"
+    source.write_bytes(data)
+    store = JarStore(str(tmp_path / "store"))
+
+    sha256 = store.add(str(source))
+
+    assert sha256 == hashlib.sha256(data).hexdigest()
+    assert store.find({"sha512": hashlib.sha512(data).hexdigest()}) == sha256
+    assert store.find({"sha1": hashlib.sha1(data).hexdigest().upper()}) == sha256
+    assert store.find({"sha1": "0" * 40}) is None
+
+    # El índice se conserva entre instancias
+    reopened = JarStore(str(tmp_path / "store"))
+    assert reopened.find({"sha1": hashlib.sha1(data).hexdigest()}) == sha256
+
+    target_dir = tmp_path / "server" / "plugins"
+    target_dir.mkdir(parents=True)
+    method = reopened.deploy(sha256, str(target_dir / "Shop.jar"))
+    assert method in (DEPLOY_REFLINK, DEPLOY_HARDLINK, DEPLOY_COPY)
+    assert (target_dir / "Shop.jar").read_bytes() == data
+    assert [name for name in os.listdir(target_dir)] == ["Shop.jar"]
+
+    # Sin enlaces duros cada servidor tiene su propia copia
+    copies = JarStore(str(tmp_path / "store"), use_hardlinks=False)
+    assert copies.deploy(sha256, str(target_dir / "Copy.jar")) in (DEPLOY_REFLINK, DEPLOY_COPY)
+    assert not os.path.samefile(str(target_dir / "Copy.jar"), copies.blob_path(sha256))
+
+
+def test_user_files_are_never_hardlinked_into_the_store(tmp_path):
+    source = tmp_path / "Mine.jar"
+    source.write_bytes(b"user file")
+    store = JarStore(str(tmp_path / "store"))
+
+    sha256 = store.add(str(source))
+
+    assert not os.path.samefile(str(source), store.blob_path(sha256))
+
+
+def test_corrupted_blobs_are_rejected_and_unused_blobs_collected(tmp_path, monkeypatch):
+    store = JarStore(str(tmp_path / "store"))
+    kept, dropped = tmp_path / "Kept.jar", tmp_path / "Dropped.jar"
+    kept.write_bytes(b"kept")
+    dropped.write_bytes(b"dropped")
+    kept_sha, dropped_sha = store.add(str(kept)), store.add(str(dropped))
+
+    assert store.collect_garbage({kept_sha}) == 0  # Recién añadidos: se conservan
+    assert store.collect_garbage({kept_sha}, grace_seconds=0) == 1
+    assert sorted(store.blob_hashes()) == [kept_sha]
+    assert store.find({"sha1": hashlib.sha1(b"dropped").hexdigest()}) is None
+
+    # Un blob sin cambios no se vuelve a leer para instalarlo
+    blob = Path(store.blob_path(kept_sha))
+    with monkeypatch.context() as patch:
+        patch.setattr("utils.jar_store.hash_file", pytest.fail)
+        store.deploy(kept_sha, str(tmp_path / "First.jar"))
+    (tmp_path / "First.jar").unlink()
+
+    blob.chmod(0o644)
+    blob.write_bytes(b"tampered")
+    with pytest.raises(ValueError):
+        store.deploy(kept_sha, str(tmp_path / "Target.jar"))
+    assert not blob.exists() and not (tmp_path / "Target.jar").exists()
@@ -0,0 +1,93 @@
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.modpack_reader import extract_overrides, read_modpack, safe_join
+
+
+def _write_pack(path, index_name, index, extra=None):
+    with zipfile.ZipFile(path, "w") as pack:
+        pack.writestr(index_name, json.dumps(index))
+        for name, data in (extra or {}).items():
+            pack.writestr(name, data)
+
+
+def test_mrpack_skips_client_files_and_extracts_overrides(tmp_path):
+    pack_path = tmp_path / "pack.mrpack"
+    _write_pack(pack_path, "modrinth.index.json", {
+        "formatVersion": 1,
+        "name": "Test Pack",
+        "versionId": "1.0",
+        "dependencies": {"minecraft": "1.20.1", "fabric-loader": "0.14.21"},
+        "files": [
+            {
+                "path": "mods/lithium.jar",
+                "hashes": {"sha1": "a" * 40},
+                "downloads": ["https://cdn.modrinth.com/data/gvQqBUqZ/versions/abc/lithium.jar"],
+                "env": {"client": "optional", "server": "required"},
+                "fileSize": 10,
+            },
+            {
+                "path": "mods/sodium.jar",
+                "hashes": {"sha1": "b" * 40},
+                "downloads": ["https://cdn.modrinth.com/data/AANobbMI/versions/def/sodium.jar"],
+                "env": {"client": "required", "server": "unsupported"},
+            },
+        ],
+    }, {
+        "overrides/config/lithium.properties": "a=1",
+        "server-overrides/server.properties": "motd=Test",
+        "client-overrides/options.txt": "fov=90",
+    })
+
+    modpack = read_modpack(str(pack_path))
+
+    assert (modpack.source, modpack.loader, modpack.loader_version) == ("Modrinth", "fabric", "0.14.21")
+    assert modpack.minecraft_version == "1.20.1"
+    assert [item.path for item in modpack.files] == ["mods/lithium.jar"]
+    assert modpack.files[0].project_id == "gvQqBUqZ"
+    assert modpack.client_only_files == ["mods/sodium.jar"]
+
+    server = tmp_path / "server"
+    assert extract_overrides(str(pack_path), modpack, str(server)) == 2
+    assert (server / "config" / "lithium.properties").read_text() == "a=1"
+    assert (server / "server.properties").read_text() == "motd=Test"
+    assert not (server / "options.txt").exists()
+
+
+def test_curseforge_manifest_lists_required_files(tmp_path):
+    pack_path = tmp_path / "pack.zip"
+    _write_pack(pack_path, "manifest.json", {
+        "manifestType": "minecraftModpack",
+        "name": "CF Pack",
+        "version": "2.0",
+        "minecraft": {"version": "1.19.2", "modLoaders": [{"id": "forge-43.2.0", "primary": True}]},
+        "files": [
+            {"projectID": 238222, "fileID": 4000000, "required": True},
+            {"projectID": 1, "fileID": 2, "required": False},
+        ],
+        "overrides": "overrides",
+    })
+
+    modpack = read_modpack(str(pack_path))
+
+    assert (modpack.source, modpack.loader, modpack.loader_version) == ("CurseForge", "forge", "43.2.0")
+    assert [(item.project_id, item.file_id) for item in modpack.files] == [("238222", 4000000)]
+
+
+def test_unknown_archives_and_unsafe_paths_are_rejected(tmp_path):
+    not_a_pack = tmp_path / "other.zip"
+    _write_pack(not_a_pack, "readme.json", {})
+    with pytest.raises(ValueError):
+        read_modpack(str(not_a_pack))
+
+    with pytest.raises(ValueError):
+        safe_join(str(tmp_path), "../outside.jar")
+    with pytest.raises(ValueError):
+        safe_join(str(tmp_path), "/etc/passwd")
+    assert safe_join(str(tmp_path), "mods/a.jar") == str(tmp_path / "mods" / "a.jar")
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.plugin_catalog import PluginCatalog, parse_timestamp
+
+
+def _projects():
+    return [
+        {"source": "Modrinth", "project_id": "Vebnzrzj", "name": "LuckPerms", "slug": "luckperms",
+         "description": "A permissions plugin", "project_type": "plugin", "downloads": 900,
+         "categories": ["utility", "paper"]},
+        {"source": "Spigot", "project_id": "28140", "name": "LuckPerms", "project_type": "plugin", "downloads": 500},
+        {"source": "Modrinth", "project_id": "AANobbMI", "name": "Sodium", "slug": "sodium",
+         "description": "Rendering engine", "project_type": "mod", "downloads": 5000, "client_only": True},
+        {"source": "Modrinth", "project_id": "gvQqBUqZ", "name": "Lithium", "slug": "lithium",
+         "description": "Server optimization mod", "project_type": "mod", "downloads": 3000},
+    ]
+
+
+def test_catalog_search_tolerates_typos_and_filters(tmp_path):
+    catalog = PluginCatalog(str(tmp_path / "catalog.sqlite3"))
+    assert catalog.add_projects(_projects()) == 4
+
+    results = catalog.search("luckprems")
+    assert [(plugin.source, plugin.name) for plugin in results[:2]] == [("Modrinth", "LuckPerms"), ("Spigot", "LuckPerms")]
+
+    assert [plugin.name for plugin in catalog.search("lith", "mod")] == ["Lithium"]
+    assert catalog.search("lithium", "plugin") == []
+    assert [plugin.source for plugin in catalog.search("luckperms", source="Spigot")] == ["Spigot"]
+
+    sodium = catalog.search("sodium")[0]
+    assert sodium.client_only and sodium.project_id == "AANobbMI" and sodium.project_type == "mod"
+    # Las descripciones también cuentan
+    assert [plugin.name for plugin in catalog.search("optimization")] == ["Lithium"]
+
+
+def test_updates_keep_known_fields_and_snapshots_round_trip(tmp_path):
+    catalog = PluginCatalog(str(tmp_path / "catalog.sqlite3"))
+    catalog.add_projects(_projects())
+    # Una búsqueda online sin descripción ni categorías no borra lo sincronizado
+    catalog.add_projects([{"source": "Modrinth", "project_id": "Vebnzrzj", "name": "LuckPerms",
+                           "project_type": "plugin", "downloads": 1000}])
+    assert catalog.search("permissions")[0].downloads == 1000
+    assert catalog.count() == 4
+
+    snapshot = tmp_path / "catalog.json.gz"
+    assert catalog.export_snapshot(str(snapshot)) == 4
+
+    other = PluginCatalog(str(tmp_path / "other.sqlite3"))
+    assert other.import_snapshot(str(snapshot)) == 4
+    assert other.count("Modrinth") == 3
+    assert other.search("permissions")[0].description == "A permissions plugin"
+
+
+def test_parse_timestamp_formats():
+    assert parse_timestamp("2024-01-01T00:00:00Z") == 1704067200.0
+    assert parse_timestamp(1704067200) == 1704067200.0
+    assert parse_timestamp(1704067200000) == 1704067200.0
+    assert parse_timestamp("not a date") == 0.0
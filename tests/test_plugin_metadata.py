@@ -3,6 +3,8 @@ import sys
 from pathlib import Path
 import types
 
+import pytest
+
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 gi = types.ModuleType("gi")
@@ -21,6 +23,7 @@ def test_add_plugin_metadata_capitalizes_install_method(tmp_path):
     controller = PluginController()
     server_path = str(tmp_path)
     controller._add_plugin_metadata(server_path, "TestPlugin", "modrinth", "123")
+    controller.flush_plugin_metadata(server_path)
     data = json.loads((tmp_path / ".plugin_metadata.json").read_text())
     assert data["TestPlugin"]["install_method"] == "Modrinth"
 
@@ -34,3 +37,61 @@ def test_get_install_method_display():
 
     curse = Plugin(name="CFPlugin", install_method="CurseForge")
     assert curse.get_install_method_display() == "🔥 CurseForge"
+
+
+def test_metadata_changes_are_batched_into_one_write(tmp_path):
+    controller = PluginController()
+    server_path = str(tmp_path)
+    controller._add_plugin_metadata(server_path, "Old", "modrinth", "abc")
+    controller._remove_plugin_metadata(server_path, "Old")
+    controller._add_plugin_metadata(server_path, "New", "modrinth", "abc")
+
+    # Nada se escribe hasta que vence el retardo o se fuerza el guardado
+    assert not (tmp_path / ".plugin_metadata.json").exists()
+    assert set(controller._load_plugin_metadata(server_path)) == {"New"}
+
+    controller.flush_plugin_metadata(server_path)
+    data = json.loads((tmp_path / ".plugin_metadata.json").read_text())
+    assert set(data) == {"New"}
+    assert [path.name for path in tmp_path.iterdir()] == [".plugin_metadata.json"]
+
+
+def test_concurrent_json_saves_do_not_share_a_temp_file(tmp_path):
+    import threading
+    from utils.file_utils import save_json_file
+
+    target = str(tmp_path / "servers.json")
+    errors = []
+
+    def write(value):
+        try:
+            for _ in range(50):
+                save_json_file(target, {"writer": value})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert json.loads(Path(target).read_text())["writer"] in range(4)
+    assert [path.name for path in tmp_path.iterdir()] == ["servers.json"]
+
+
+def test_failed_atomic_write_keeps_old_file_and_removes_temp(tmp_path):
+    from utils.file_utils import atomic_write
+
+    target = tmp_path / "snapshot.json"
+    atomic_write(str(target), "old")
+    # Un directorio con el nombre del destino hace fallar el os.replace
+    blocked = tmp_path / "blocked"
+    blocked.mkdir()
+    (blocked / "child").write_text("x")
+    with pytest.raises(OSError):
+        atomic_write(str(blocked), b"new")
+
+    assert target.read_text() == "old"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["blocked", "snapshot.json"]
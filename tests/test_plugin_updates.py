@@ -0,0 +1,202 @@
+import hashlib
+import sys
+from pathlib import Path
+import types
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+gi = types.ModuleType("gi")
+repository = types.ModuleType("repository")
+gi.repository = repository
+repository.GLib = types.SimpleNamespace(idle_add=lambda *args, **kwargs: None)
+sys.modules.setdefault("gi", gi)
+sys.modules.setdefault("gi.repository", repository)
+sys.modules.setdefault("gi.repository.GLib", repository.GLib)
+
+from controllers.plugin_controller import PluginController
+from utils.file_utils import get_plugins_and_mods
+from utils.jar_metadata import JarMetadataCache
+
+
+class _FakeHttp:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def post_json(self, url, payload, headers=None, timeout=None):
+        endpoint = url.split("/v2/", 1)[-1]
+        self.calls.append((endpoint, payload))
+        return self.responses[endpoint](payload)
+
+
+def _version(version_id, number, project_id, loaders, url=None):
+    files = [{"url": url, "filename": f"{project_id}-{number}.jar", "primary": True, "hashes": {}}] if url else []
+    return {"id": version_id, "version_number": number, "project_id": project_id, "loaders": loaders, "files": files}
+
+
+def test_find_modrinth_updates_uses_bulk_lookups(tmp_path):
+    (tmp_path / "plugins").mkdir()
+    (tmp_path / "mods").mkdir()
+    (tmp_path / "plugins" / "Essentials.jar").write_bytes(b"essentials")
+    (tmp_path / "mods" / "sodium.jar").write_bytes(b"sodium")
+    (tmp_path / "mods" / "unknown.jar").write_bytes(b"unknown")
+    sha = lambda data: hashlib.sha1(data).hexdigest()
+
+    responses = {
+        "version_files": lambda payload: {
+            sha(b"essentials"): _version("e1", "2.19", "ess", ["paper"]),
+            sha(b"sodium"): _version("s1", "0.5", "sod", ["fabric"]),
+        },
+        "version_files/update": lambda payload: {
+            h: _version("e2", "2.20", "ess", ["paper"], "https://cdn/ess.jar") if "paper" in payload["loaders"]
+            else _version("s1", "0.5", "sod", ["fabric"], "https://cdn/sod.jar")
+            for h in payload["hashes"]
+        },
+    }
+    controller = PluginController()
+    controller.http = _FakeHttp(responses)
+
+    updates = controller.find_modrinth_updates(str(tmp_path), game_versions=["1.20.4"])
+
+    assert [(u.name, u.has_update()) for u in updates] == [("Essentials", True), ("sodium", False)]
+    assert updates[0].latest_version == "2.20"
+    assert updates[0].plugin_type == "plugin"
+    assert updates[1].plugin_type == "mod"
+    # Una consulta de hashes y una de actualizaciones por grupo de loaders
+    assert [endpoint for endpoint, _ in controller.http.calls].count("version_files/update") == 2
+    assert len(controller.http.calls) == 3
+    assert all(payload.get("game_versions") == ["1.20.4"] for _, payload in controller.http.calls[1:])
+
+
+def test_scan_local_plugins_reports_each_jar_in_final_order(tmp_path):
+    (tmp_path / "plugins").mkdir()
+    for name in ("Alpha", "Beta", "Gamma"):
+        (tmp_path / "plugins" / f"{name}.jar").write_bytes(name.encode())
+    controller = PluginController()
+    controller.jar_cache = JarMetadataCache(str(tmp_path / "cache.json"))
+    reported = []
+
+    plugins = controller._scan_local_plugins(
+        str(tmp_path), lambda index, plugin, done, total: reported.append((index, plugin.name, done, total))
+    )
+
+    expected = [filename[:-4] for filename, _ in get_plugins_and_mods(str(tmp_path))]
+    assert [plugin.name for plugin in plugins] == expected
+    assert sorted((index, name) for index, name, _, _ in reported) == list(enumerate(expected))
+    assert all(total == 3 for _, _, _, total in reported)
+    assert sorted(done for _, _, done, _ in reported) == [1, 2, 3]
+
+
+class _FakeSourceHttp:
+    def __init__(self):
+        self.posts = []
+
+    def get_json(self, url, headers=None, timeout=None):
+        resource_id = url.split("/resources/", 1)[1].split("/", 1)[0]
+        return {"1": {"id": 11, "name": "2.0"}, "2": {"id": 22, "name": "v1.0"}}[resource_id]
+
+    def post_json(self, url, payload, headers=None, timeout=None):
+        self.posts.append(url.rsplit("/v1/", 1)[1])
+        if url.endswith("/mods"):
+            return {"data": [{"id": 300, "classId": 6, "latestFilesIndexes": [
+                {"gameVersion": "1.20.4", "fileId": 5, "modLoader": 4, "releaseType": 1},
+                {"gameVersion": "1.20.4", "fileId": 9, "modLoader": 1, "releaseType": 1},
+                {"gameVersion": "1.19.2", "fileId": 12, "modLoader": 4, "releaseType": 1},
+            ]}]}
+        return {"data": [{"id": 5, "fileName": "jei-new.jar", "displayName": "JEI 2", "downloadUrl": "https://cdn/j"}]}
+
+
+def test_tracked_updates_batch_spigot_and_curseforge(tmp_path, monkeypatch):
+    import zipfile
+    plugins, mods = tmp_path / "plugins", tmp_path / "mods"
+    plugins.mkdir()
+    mods.mkdir()
+    for name, version in (("Shop", "1.5"), ("Chat", "1.0")):
+        with zipfile.ZipFile(plugins / f"{name}.jar", "w") as jar:
+            jar.writestr("plugin.yml", f"name: {name}\nversion: '{version}'\n")
+    (mods / "jei-old.jar").write_bytes(b"jei")
+    (tmp_path / "fabric-server-mc.1.20.4-loader.jar").write_bytes(b"")
+
+    controller = PluginController()
+    controller.http = _FakeSourceHttp()
+    controller.jar_cache = JarMetadataCache(str(tmp_path / "cache.json"))
+    controller._add_plugin_metadata(str(tmp_path), "Shop", "spigot", "1")
+    controller._add_plugin_metadata(str(tmp_path), "Chat", "spigot", "2")
+    controller._add_plugin_metadata(str(tmp_path), "jei-old", "curseforge", "300", "mod")
+    monkeypatch.setenv("CURSEFORGE_API_KEY", "key")
+
+    updates = {update.name: update for update in controller.find_tracked_updates(str(tmp_path))}
+
+    assert updates["Shop"].has_update() and updates["Shop"].source == "Spigot"
+    assert not updates["Chat"].has_update()
+    jei = updates["jei-old"]
+    assert jei.has_update() and (jei.filename, jei.latest_version) == ("jei-new.jar", "JEI 2")
+    assert controller.http.posts == ["mods", "mods/files"]
+
+
+def test_install_on_servers_downloads_once_and_skips_others(tmp_path, monkeypatch):
+    import controllers.plugin_controller as plugin_controller
+    from models.server import MinecraftServer
+    from utils.file_utils import hash_file
+    from utils.jar_store import JarStore
+
+    servers = []
+    for name, jar in (("lobby", "paper-1.20.4-496.jar"), ("survival", "paper-1.20.4-496.jar"),
+                      ("modded", "fabric-server-mc.1.20.4-loader.jar"), ("live", "paper-1.20.4-496.jar")):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / jar).write_bytes(b"")
+        servers.append(MinecraftServer(name, str(tmp_path / name), jar))
+    servers[3].is_running = True
+
+    downloads = []
+
+    def fake_download(url, target_path, expected_hashes=None, **kwargs):
+        downloads.append(url)
+        Path(target_path).write_bytes(b"luckperms")
+        return hash_file(target_path, ("sha1", "sha256", "sha512"))
+
+    monkeypatch.setattr(plugin_controller, "download_file", fake_download)
+    controller = PluginController()
+    controller.jar_store = JarStore(str(tmp_path / "store"))
+    job = types.SimpleNamespace(set_progress=lambda message: None, cancel_event=None)
+
+    results = controller._install_on_servers(job, "Spigot", "LuckPerms", "28140", servers)
+
+    assert [result.status for result in results] == ["installed", "installed", "skipped", "skipped"]
+    assert len(downloads) == 1
+    assert (tmp_path / "survival" / "plugins" / "LuckPerms.jar").read_bytes() == b"luckperms"
+    assert not (tmp_path / "modded" / "plugins").exists()
+    assert results[3].message == "server is running"
+    assert controller._tracked_installs(str(tmp_path / "lobby"), "Spigot")[0]["project_id"] == "28140"
+
+    # Spiget no publica hashes: se compara con lo descargado y se detecta que ya está al día
+    results = controller._install_on_servers(job, "Spigot", "LuckPerms", "28140", servers[:2])
+    assert [result.status for result in results] == ["up_to_date", "up_to_date"]
+    assert len(downloads) == 2
+
+    # Un servidor que está arrancando tampoco se toca
+    results = controller._install_on_servers(job, "Spigot", "LuckPerms", "28140", servers[:1],
+                                             is_starting=lambda server: True)
+    assert [(result.status, result.message) for result in results] == [("skipped", "server is starting")]
+
+
+def test_curseforge_type_comes_from_the_project_class(tmp_path):
+    from utils.server_platform import ServerPlatform
+
+    class FakeCurseForge:
+        def get_json(self, url, headers=None, timeout=None):
+            if url.endswith("/mods/77"):
+                return {"data": {"id": 77, "classId": 5}}
+            return {"data": [{"id": 1, "fileName": "Essentials.jar", "downloadUrl": "https://cdn/e"}]}
+
+    controller = PluginController()
+    controller.http = FakeCurseForge()
+    project = controller._curseforge_project("77", "key")
+    version_file = controller._resolve_fleet_file("CurseForge", "Essentials", "77", ServerPlatform("1.20.4", "paper"),
+                                                  project, "key")
+    assert version_file["type"] == "plugin"
+    assert controller._curseforge_project_type({}, "Unknown") == "mod"
+    with pytest.raises(LookupError):
+        controller._curseforge_project_type({"classId": 12}, "Texture pack")
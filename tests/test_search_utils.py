@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from models.plugin import Plugin
+from utils.search_utils import SearchResultCache, append_search_results, merge_search_results, normalize_name
+
+
+def _plugin(name, source, slug=None, author=None, downloads=0):
+    plugin = Plugin(name, source)
+    plugin.slug = slug
+    plugin.author = author
+    plugin.downloads = downloads
+    return plugin
+
+
+def test_normalize_name():
+    assert normalize_name("LuckPerms") == "luckperms"
+    assert normalize_name("Luck-Perms [1.20]") == "luckperms"
+    assert normalize_name("EssentialsX Plugin") == "essentialsx"
+    assert normalize_name("Plugin") == "plugin"
+
+
+def test_merge_deduplicates_across_sources():
+    results = {
+        "Spigot": [_plugin("LuckPerms", "Spigot"), _plugin("Vault", "Spigot")],
+        "Modrinth": [_plugin("LuckPerms", "Modrinth", slug="luckperms", author="Luck")],
+        "CurseForge": [_plugin("Luck Perms", "CurseForge", slug="luckperms", author="luck")],
+    }
+    merged = merge_search_results(results)
+
+    assert [p.name for p in merged] == ["LuckPerms", "Vault"]
+    assert merged[0].source == "Modrinth"
+    assert merged[0].also_on == ["CurseForge", "Spigot"]
+    # Los resultados originales (que puede tener la caché) no se modifican
+    assert results["Modrinth"][0].also_on == () and merged[0] is not results["Modrinth"][0]
+
+
+def test_merge_keeps_projects_by_different_authors():
+    results = {
+        "Modrinth": [_plugin("Chunky", "Modrinth", author="pop4959")],
+        "CurseForge": [_plugin("Chunky", "CurseForge", author="someone-else")],
+    }
+    assert len(merge_search_results(results)) == 2
+
+
+def test_merge_ranks_multi_source_results_first():
+    results = {
+        "Modrinth": [_plugin("Alpha", "Modrinth"), _plugin("Beta", "Modrinth")],
+        "Spigot": [_plugin("Gamma", "Spigot"), _plugin("Beta", "Spigot")],
+    }
+    assert [p.name for p in merge_search_results(results)][0] == "Beta"
+
+
+def test_search_cache_exact_and_prefix_lookup():
+    cache = SearchResultCache(max_entries=2)
+    cache.put("Modrinth", "", "luck", [_plugin("LuckPerms", "Modrinth"), _plugin("Lucky Blocks", "Modrinth")])
+
+    assert [p.name for p in cache.get("Modrinth", "", " Luck ")] == ["LuckPerms", "Lucky Blocks"]
+    assert cache.get("Spigot", "", "luck") is None
+    assert [p.name for p in cache.get_prefix("Modrinth", "", "luckperm")] == ["LuckPerms"]
+
+    cache.put("Modrinth", "", "a", [])
+    cache.put("Modrinth", "", "b", [])
+    assert cache.get("Modrinth", "", "luck") is None
+
+
+def test_append_skips_results_already_shown():
+    shown = merge_search_results({"Modrinth": [_plugin("LuckPerms", "Modrinth")]})
+    new = append_search_results(shown, {"Spigot": [_plugin("LuckPerms", "Spigot"), _plugin("Vault", "Spigot")]})
+
+    assert [p.name for p in new] == ["Vault"]
+    assert shown[0].also_on == ["Spigot"]
+
+
+def test_plugin_records_use_slots_and_shared_strings():
+    plugin = Plugin("Sodium", "".join(["Mod", "rinth"]))
+    assert not hasattr(plugin, "__dict__")
+    assert plugin.source is sys.intern("Modrinth")
+    assert (plugin.project_type, plugin.icon_url, plugin.downloads, plugin.also_on) == ("plugin", "", 0, ())
+    with pytest.raises(AttributeError):
+        plugin.unknown_attribute = 1
@@ -0,0 +1,44 @@
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.server_platform import detect_server_platform
+
+
+def test_detects_from_jar_name(tmp_path):
+    (tmp_path / "paper-1.20.4-496.jar").write_bytes(b"")
+    platform = detect_server_platform(str(tmp_path))
+    assert (platform.platform, platform.minecraft_version) == ("paper", "1.20.4")
+    assert platform.modrinth_loaders() == ["paper", "spigot", "bukkit"]
+
+
+def test_detects_from_version_history(tmp_path):
+    (tmp_path / "server.jar").write_bytes(b"")
+    (tmp_path / "version_history.json").write_text(json.dumps({"currentVersion": "git-Purpur-2176 (MC: 1.20.4)"}))
+    platform = detect_server_platform(str(tmp_path))
+    assert (platform.platform, platform.minecraft_version) == ("purpur", "1.20.4")
+
+
+def test_detects_fabric_from_jar_contents(tmp_path):
+    with zipfile.ZipFile(tmp_path / "server.jar", "w") as jar:
+        jar.writestr("version.json", json.dumps({"id": "1.20.1"}))
+        jar.writestr("net/fabricmc/loader/launch/server/FabricServerLauncher.class", b"")
+    platform = detect_server_platform(str(tmp_path))
+    assert (platform.platform, platform.minecraft_version) == ("fabric", "1.20.1")
+    assert platform.curseforge_mod_loader_type() == 4
+
+
+def test_detects_forge_from_libraries(tmp_path):
+    (tmp_path / "libraries" / "net" / "minecraftforge" / "forge" / "1.20.1-47.2.0").mkdir(parents=True)
+    platform = detect_server_platform(str(tmp_path))
+    assert (platform.platform, platform.minecraft_version) == ("forge", "1.20.1")
+    assert platform.is_mod_platform()
+
+
+def test_unknown_server(tmp_path):
+    platform = detect_server_platform(str(tmp_path))
+    assert platform.platform is None and platform.minecraft_version is None
+    assert platform.describe() == "Unknown platform"
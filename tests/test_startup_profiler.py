@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.startup_profiler import (
+    StartupProfiler,
+    average_timings,
+    load_startup_history,
+    profile_log_file,
+    save_startup_profile,
+)
+
+LATEST_LOG = """\
+[23:59:50] [Server thread/INFO]: Starting minecraft server version 1.20.4
+[23:59:51] [Server thread/INFO]: [LuckPerms] Loading server plugin LuckPerms v5.4.102
+[23:59:53] [Server thread/INFO]: [WorldEdit] Loading server plugin WorldEdit v7.2.15
+[23:59:54] [Server thread/INFO]: Server permissions file permissions.yml is empty, ignoring it
+[23:59:54] [Server thread/INFO]: [LuckPerms] Enabling LuckPerms v5.4.102
+[23:59:55] [Server thread/INFO]: [LuckPerms] Loading configuration...
+[23:59:58] [Server thread/INFO]: Preparing level "world"
+[00:00:05] [Server thread/INFO]: [WorldEdit] Enabling WorldEdit v7.2.15
+[00:00:06] [Server thread/INFO]: Done (16.021s)! For help, type "help"
+[00:00:07] [Server thread/INFO]: [LuckPerms] Enabling LuckPerms v5.4.102
+"""
+
+
+def test_profiles_latest_log_across_midnight(tmp_path):
+    log = tmp_path / "latest.log"
+    log.write_text(LATEST_LOG)
+
+    profile = profile_log_file(str(log))
+
+    assert profile.complete and profile.total_seconds == 16.021
+    assert [(t.name, t.load_seconds, t.enable_seconds) for t in profile.ranked()] == [
+        ("LuckPerms", 2.0, 4.0),
+        ("WorldEdit", 1.0, 1.0),
+    ]
+    assert profile.timings["WorldEdit"].version == "7.2.15"
+
+
+def test_live_lines_use_arrival_time_and_history_keeps_newest_first(tmp_path):
+    profiler = StartupProfiler()
+    assert not profiler.feed_line("[12:00:00 INFO]: [Vault] Enabling Vault v1.7.3\n", 100.0)
+    assert not profiler.feed_line("[12:00:00 INFO]: [Vault] Hooked economy\n", 100.2)
+    assert profiler.feed_line("[12:00:00 INFO]: Done (3.500s)! For help, type \"help\"\n", 100.25)
+    assert profiler.profile.timings["Vault"].enable_seconds == 0.25
+
+    save_startup_profile(str(tmp_path), profiler.profile)
+    second = StartupProfiler()
+    second.feed_line("[12:10:00 INFO]: [Vault] Enabling Vault v1.7.3\n", 200.0)
+    second.feed_line("[12:10:00 INFO]: Done (2.000s)! For help, type \"help\"\n", 200.75)
+    save_startup_profile(str(tmp_path), second.profile, max_runs=2)
+
+    history = load_startup_history(str(tmp_path))
+    assert [run.total_seconds for run in history] == [2.0, 3.5]
+    assert average_timings(history) == {"Vault": 0.5}
@@ -0,0 +1,66 @@
+import os
+import sys
+import urllib.error
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.http_client import HttpResponse
+from utils.thumbnail_cache import ThumbnailCache
+
+
+class FakeHttp:
+    def __init__(self):
+        self.requests = []
+        self.status = 200
+        self.offline = False
+
+    def get(self, url, headers=None, timeout=None, use_cache=True):
+        self.requests.append((url, dict(headers or {})))
+        if self.offline:
+            raise urllib.error.URLError("offline")
+        if self.status == 304:
+            return HttpResponse(url, 304, "Not Modified", {}, b"", 0.0)
+        return HttpResponse(url, 200, "OK", {"etag": '"v1"'}, b"icon:" + url.encode() * 50, 0.0)
+
+
+def scale(data, size):
+    return b"png%d:" % size + data[:size]
+
+
+def test_thumbnails_are_reused_and_revalidated(tmp_path):
+    http = FakeHttp()
+    cache = ThumbnailCache(str(tmp_path), http=http)
+    url = "https://cdn.modrinth.com/icon.png"
+
+    first = cache.get_thumbnail(url, 24, scale)
+    assert first.startswith(b"png24:") and len(http.requests) == 1
+    # Se guardan los dos tamaños de una vez
+    assert cache.lookup(url, 48).startswith(b"png48:")
+
+    # Otra sesión: sale del disco sin tocar la red
+    reopened = ThumbnailCache(str(tmp_path), http=http)
+    assert reopened.get_thumbnail(url, 24, scale) == first
+    assert len(http.requests) == 1
+
+    # Caducada: petición condicional y, con 304, se usa la copia guardada
+    stale = ThumbnailCache(str(tmp_path), revalidate_after=0, http=http)
+    http.status = 304
+    assert stale.get_thumbnail(url, 48, scale).startswith(b"png48:")
+    assert http.requests[-1][1] == {"If-None-Match": '"v1"'}
+
+    # Sin red también se muestra lo que hay en disco
+    http.offline = True
+    assert stale.get_thumbnail(url, 24, scale) == first
+
+
+def test_cache_size_is_capped(tmp_path):
+    http = FakeHttp()
+    cache = ThumbnailCache(str(tmp_path), max_bytes=1000, http=http)
+    for index in range(20):
+        cache.get_thumbnail(f"https://cdn/{index}.png", 24, scale)
+        os.utime(cache._meta_path(cache.make_key(f"https://cdn/{index}.png")), (index, index))
+
+    assert sum(size for _, _, size in cache._iter_entries()) <= 1000
+    assert cache.lookup("https://cdn/19.png", 24) is not None
+    assert cache.lookup("https://cdn/0.png", 24) is None
@@ -8,6 +8,12 @@ from pathlib import Path
 USER_DATA_DIR = os.path.join(Path.home(), ".local", "share", "minecraft-server-manager")
 os.makedirs(USER_DATA_DIR, exist_ok=True)
 
+# Directorio de caché (XDG); se crea bajo demanda
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache"),
+    "minecraft-server-manager",
+)
+
 # Archivos de configuración
 SERVER_CONFIG_FILE = os.path.join(USER_DATA_DIR, "servers.json")
 
@@ -20,6 +26,9 @@ MODRINTH_API_BASE_URL = "https://api.modrinth.com/v2"
 SPIGET_API_BASE_URL = "https://api.spiget.org/v2"
 CURSEFORGE_API_BASE_URL = "https://api.curseforge.com/v1"
 
+# Cabecera User-Agent enviada en todas las peticiones HTTP
+HTTP_USER_AGENT = "MinecraftServerManager/1.0"
+
 # Configuración de servidor por defecto
 DEFAULT_JAVA_MEMORY = "1024M"
 DEFAULT_JAR_ARGS = ["nogui"]
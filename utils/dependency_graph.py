@@ -0,0 +1,181 @@
+"""Grafo de dependencias de los plugins y mods instalados.
+
+Se construye a partir de los metadatos de ``read_jar_metadata`` y permite
+comprobar antes de arrancar el servidor lo que haría fallar la carga:
+dependencias obligatorias que faltan, ciclos entre dependencias de plugins,
+nombres duplicados y plugins que piden una ``api-version`` más nueva que el
+servidor. Plugins y mods se tratan por separado: un plugin solo puede
+depender de otros plugins y un mod de otros mods.
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+
+from utils.file_utils import get_plugins_and_mods
+
+
+class DependencyNode:
+    """Un plugin o mod instalado y sus relaciones"""
+
+    def __init__(self, node_id: str, file_path: str, metadata: Dict):
+        self.id = node_id
+        self.file_path = file_path
+        self.kind = metadata.get("type") or "plugin"
+        self.version = metadata.get("version") or "Unknown"
+        self.api_version = metadata.get("api_version")
+        self.dependencies: List[str] = list(metadata.get("dependencies") or [])
+        self.soft_dependencies: List[str] = list(metadata.get("soft_dependencies") or [])
+        self.load_before: List[str] = list(metadata.get("load_before") or [])
+        self.provides: List[str] = list(metadata.get("provides") or [])
+
+    @property
+    def file_name(self) -> str:
+        return os.path.basename(self.file_path)
+
+
+class PreflightReport:
+    """Problemas detectados en el grafo de dependencias"""
+
+    def __init__(self):
+        self.missing: List[Tuple[str, str]] = []  # (plugin, dependencia que falta)
+        self.cycles: List[List[str]] = []
+        self.duplicates: Dict[str, List[str]] = {}  # nombre -> archivos
+        self.incompatible: List[Tuple[str, str]] = []  # (plugin, api-version pedida)
+
+    def has_problems(self) -> bool:
+        return bool(self.missing or self.cycles or self.duplicates or self.incompatible)
+
+    def describe(self) -> List[str]:
+        """Una línea legible por problema"""
+        lines = [f"{name} requires {dependency}, which is not installed" for name, dependency in self.missing]
+        lines += [f"Circular dependency: {' -> '.join(cycle + cycle[:1])}" for cycle in self.cycles]
+        lines += [f"Duplicate {name}: {', '.join(files)}" for name, files in sorted(self.duplicates.items())]
+        lines += [f"{name} needs Minecraft API {api_version} or newer" for name, api_version in self.incompatible]
+        return lines
+
+
+class DependencyGraph:
+    def __init__(self, nodes: List[DependencyNode]):
+        self.nodes: Dict[Tuple[str, str], DependencyNode] = {}
+        self.duplicates: Dict[str, List[str]] = {}
+        self._provided: Dict[Tuple[str, str], str] = {}
+        for node in nodes:
+            key = (node.kind, node.id)
+            if key in self.nodes:
+                files = self.duplicates.setdefault(node.id, [self.nodes[key].file_name])
+                files.append(node.file_name)
+                continue
+            self.nodes[key] = node
+        for node in self.nodes.values():
+            for alias in node.provides:
+                self._provided.setdefault((node.kind, alias), node.id)
+
+    def resolve(self, kind: str, name: str) -> Optional[str]:
+        """Id del plugin/mod instalado que satisface ``name`` (directamente o por ``provides``)"""
+        if (kind, name) in self.nodes:
+            return name
+        return self._provided.get((kind, name))
+
+    def missing_dependencies(self) -> List[Tuple[str, str]]:
+        missing = []
+        for node in self.nodes.values():
+            for dependency in node.dependencies:
+                if self.resolve(node.kind, dependency) is None:
+                    missing.append((node.id, dependency))
+        return missing
+
+    def dependency_cycles(self) -> List[List[str]]:
+        """Ciclos entre dependencias obligatorias de plugins (Bukkit no puede cargarlos)
+
+        Componentes fuertemente conexas de Tarjan, en versión iterativa.
+        """
+        edges: Dict[str, List[str]] = {}
+        for (kind, node_id), node in self.nodes.items():
+            if kind != "plugin":
+                continue
+            targets = (self.resolve(kind, dependency) for dependency in node.dependencies)
+            edges[node_id] = [target for target in targets if target is not None]
+
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack = set()
+        stack: List[str] = []
+        cycles: List[List[str]] = []
+
+        for root in sorted(edges):
+            if root in index:
+                continue
+            work = [(root, iter(edges[root]))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node_id, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(edges.get(child, []))))
+                    elif child in on_stack:
+                        lowlink[node_id] = min(lowlink[node_id], index[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node_id])
+                if lowlink[node_id] == index[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node_id:
+                            break
+                    if len(component) > 1 or node_id in edges[node_id]:
+                        cycles.append(list(reversed(component)))
+        return cycles
+
+    def incompatible_api_versions(self, minecraft_version: Optional[str]) -> List[Tuple[str, str]]:
+        """Plugins cuya ``api-version`` es más nueva que la versión del servidor"""
+        server = _version_key(minecraft_version)
+        if not server:
+            return []
+        incompatible = []
+        for node in self.nodes.values():
+            required = _version_key(node.api_version)
+            if node.kind == "plugin" and required and required[:2] > server[:2]:
+                incompatible.append((node.id, node.api_version))
+        return incompatible
+
+    def preflight(self, minecraft_version: Optional[str] = None) -> PreflightReport:
+        report = PreflightReport()
+        report.missing = self.missing_dependencies()
+        report.cycles = self.dependency_cycles()
+        report.duplicates = {name: list(files) for name, files in self.duplicates.items()}
+        report.incompatible = self.incompatible_api_versions(minecraft_version)
+        return report
+
+
+def _version_key(version: Optional[str]) -> Tuple[int, ...]:
+    parts = []
+    for part in str(version or "").split("."):
+        if not part.isdigit():
+            break
+        parts.append(int(part))
+    return tuple(parts)
+
+
+def build_dependency_graph(metadata_by_path: Dict[str, Dict]) -> DependencyGraph:
+    """Crea el grafo a partir de ``{ruta del JAR: metadatos}``"""
+    nodes = []
+    for file_path, metadata in metadata_by_path.items():
+        node_id = metadata.get("id") or metadata.get("name") or os.path.basename(file_path)[:-4]
+        nodes.append(DependencyNode(node_id, file_path, metadata))
+    return DependencyGraph(nodes)
+
+
+def build_server_dependency_graph(server_path: str, jar_cache) -> DependencyGraph:
+    """Grafo de los JAR de ``plugins/`` y ``mods/`` de un servidor"""
+    paths = [full_path for _, full_path in get_plugins_and_mods(server_path)]
+    return build_dependency_graph(jar_cache.get_many(paths))
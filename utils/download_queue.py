@@ -0,0 +1,307 @@
+"""Cola central de descargas.
+
+Limita el número de descargas simultáneas (global y por host), ordena los
+trabajos por prioridad, reintenta con espera exponencial ante errores
+temporales (429/5xx, timeouts) y permite cancelar trabajos pendientes o en
+curso. Los callbacks se invocan desde los hilos de trabajo; quien necesite
+tocar la interfaz debe usar ``GLib.idle_add``.
+"""
+import http.client
+import itertools
+import logging
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.download_utils import DownloadCancelledError
+
+# Prioridades: un número menor se atiende antes
+PRIORITY_USER = 0
+PRIORITY_DEPENDENCY = 5
+PRIORITY_BACKGROUND = 10
+
+STATUS_QUEUED = "Queued"
+STATUS_RUNNING = "Running"
+STATUS_RETRYING = "Retrying"
+STATUS_DONE = "Done"
+STATUS_FAILED = "Failed"
+STATUS_CANCELLED = "Cancelled"
+
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PER_HOST = 2
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+# Trabajos terminados que se conservan para mostrarlos; los más antiguos se olvidan
+MAX_FINISHED_JOBS = 100
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Indica si un error es temporal y merece reintentarse
+
+    Solo se reintentan 429/5xx, timeouts y conexiones cortadas; los fallos de
+    DNS, las conexiones rechazadas o los errores de SSL no se arreglan solos.
+    """
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code == 429 or error.code >= 500
+    if isinstance(error, urllib.error.URLError):
+        error = error.reason
+    return isinstance(error, (socket.timeout, TimeoutError, ConnectionResetError, http.client.IncompleteRead))
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Obtiene la espera sugerida por la cabecera Retry-After, si existe"""
+    headers = getattr(error, "headers", None)
+    value = headers.get("Retry-After") if headers else None
+    if value and value.strip().isdigit():
+        return float(value.strip())
+    return None
+
+
+class DownloadJob:
+    """Trabajo de descarga gestionado por la cola"""
+
+    def __init__(self, job_id: int, name: str, host: str, priority: int,
+                 func: Callable[["DownloadJob"], Any],
+                 on_success: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 retry: bool = True):
+        self.id = job_id
+        self.name = name
+        self.host = host
+        self.priority = priority
+        self.func = func
+        self.on_success = on_success
+        self.on_error = on_error
+        self.retry = retry
+        self.status = STATUS_QUEUED
+        self.progress = ""
+        self.error: Optional[Exception] = None
+        self.attempts = 0
+        self.ready_at = 0.0
+        self.cancel_event = threading.Event()
+        self._queue: Optional["DownloadQueue"] = None
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Cancela el trabajo (si está en curso se detiene en el siguiente bloque)"""
+        if self._queue:
+            self._queue.cancel(self)
+        else:
+            self.cancel_event.set()
+
+    def set_progress(self, message: str):
+        """Actualiza el texto de progreso y notifica a los observadores"""
+        self.progress = message
+        if self._queue:
+            self._queue._notify()
+
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+
+class DownloadQueue:
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 max_per_host: int = DEFAULT_MAX_PER_HOST,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self._jobs: List[DownloadJob] = []
+        self._pending: List[DownloadJob] = []
+        self._active_per_host: Dict[str, int] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Registra un callback que se invoca cuando cambia algún trabajo"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self):
+        for listener in list(self._listeners):
+            try:
+                listener()
+            except Exception:
+                pass
+
+    def submit(self, func: Callable[[DownloadJob], Any], name: str, url: str = "",
+               priority: int = PRIORITY_USER,
+               on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               retry: bool = True) -> DownloadJob:
+        """Encola ``func(job)``.
+
+        ``url`` determina el host usado para el límite por host. Si ``func``
+        lanza un error temporal se reintenta con espera exponencial (salvo
+        con ``retry=False``, para trabajos que no son descargas); el
+        resultado final se entrega a ``on_success`` u ``on_error``.
+        """
+        host = urllib.parse.urlparse(url).netloc or url or "local"
+        with self._condition:
+            job = DownloadJob(next(self._ids), name, host, priority, func, on_success, on_error, retry)
+            job._queue = self
+            self._jobs.append(job)
+            self._pending.append(job)
+            self._ensure_workers()
+            self._condition.notify()
+        self._notify()
+        return job
+
+    def cancel(self, job: DownloadJob):
+        """Cancela un trabajo pendiente o en curso"""
+        with self._condition:
+            job.cancel_event.set()
+            was_pending = job in self._pending
+            if was_pending:
+                self._pending.remove(job)
+                job.status = STATUS_CANCELLED
+        if was_pending:
+            self._finish(job)
+            self._run_callback(job, job.on_error, DownloadCancelledError(f"{job.name} was cancelled"))
+
+    def cancel_all(self):
+        for job in self.get_jobs():
+            if not job.is_finished():
+                self.cancel(job)
+
+    def get_jobs(self) -> List[DownloadJob]:
+        """Devuelve una copia de la lista de trabajos"""
+        with self._condition:
+            return list(self._jobs)
+
+    def get_job(self, job_id: int) -> Optional[DownloadJob]:
+        with self._condition:
+            return next((job for job in self._jobs if job.id == job_id), None)
+
+    def clear_finished(self):
+        """Elimina de la lista los trabajos terminados"""
+        with self._condition:
+            self._jobs = [job for job in self._jobs if not job.is_finished()]
+        self._notify()
+
+    def _finish(self, job: DownloadJob):
+        """Notifica el final de un trabajo y olvida los terminados más antiguos"""
+        with self._condition:
+            finished = [other for other in self._jobs if other.is_finished()]
+            if len(finished) > MAX_FINISHED_JOBS:
+                forgotten = set(finished[:len(finished) - MAX_FINISHED_JOBS])
+                self._jobs = [other for other in self._jobs if other not in forgotten]
+        self._notify()
+
+    def _run_callback(self, job: DownloadJob, callback: Optional[Callable[[Any], None]], value: Any):
+        """Invoca un callback sin que un error en él detenga el hilo de trabajo"""
+        if callback is None:
+            return
+        try:
+            callback(value)
+        except Exception:
+            logging.exception("Error in callback of download job %s", job.name)
+
+    def _ensure_workers(self):
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(self) -> DownloadJob:
+        """Espera hasta que haya un trabajo listo y con capacidad en su host"""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                ready = [
+                    job for job in self._pending
+                    if job.ready_at <= now
+                    and self._active_per_host.get(job.host, 0) < self.max_per_host
+                ]
+                if ready:
+                    job = min(ready, key=lambda j: (j.priority, j.id))
+                    self._pending.remove(job)
+                    self._active_per_host[job.host] = self._active_per_host.get(job.host, 0) + 1
+                    job.status = STATUS_RUNNING
+                    job.attempts += 1
+                    return job
+
+                waiting = [job.ready_at for job in self._pending if job.ready_at > now]
+                timeout = max(0.05, min(waiting) - now) if waiting else None
+                self._condition.wait(timeout)
+
+    def _release(self, job: DownloadJob):
+        with self._condition:
+            self._active_per_host[job.host] -= 1
+            if not self._active_per_host[job.host]:
+                del self._active_per_host[job.host]
+            self._condition.notify_all()
+
+    def _backoff_delay(self, job: DownloadJob, error: Exception) -> float:
+        suggested = _retry_after(error)
+        if suggested is not None:
+            return min(suggested, BACKOFF_MAX_SECONDS)
+        delay = BACKOFF_BASE_SECONDS * (2 ** (job.attempts - 1))
+        return min(delay, BACKOFF_MAX_SECONDS) * random.uniform(0.8, 1.2)
+
+    def _worker_loop(self):
+        while True:
+            job = self._next_job()
+            self._notify()
+            try:
+                if job.is_cancelled():
+                    raise DownloadCancelledError(f"{job.name} was cancelled")
+                result = job.func(job)
+            except Exception as e:
+                self._release(job)
+                self._handle_failure(job, e)
+                continue
+
+            self._release(job)
+            job.status = STATUS_DONE
+            job.progress = ""
+            self._finish(job)
+            self._run_callback(job, job.on_success, result)
+
+    def _handle_failure(self, job: DownloadJob, error: Exception):
+        if job.is_cancelled() or isinstance(error, DownloadCancelledError):
+            job.status = STATUS_CANCELLED
+        elif job.retry and is_retryable_error(error) and job.attempts <= self.max_retries:
+            delay = self._backoff_delay(job, error)
+            with self._condition:
+                job.status = STATUS_RETRYING
+                job.progress = f"Retry {job.attempts}/{self.max_retries} in {delay:.0f}s: {error}"
+                job.ready_at = time.monotonic() + delay
+                self._pending.append(job)
+                self._condition.notify_all()
+            self._notify()
+            return
+        else:
+            job.status = STATUS_FAILED
+
+        job.error = error
+        job.progress = str(error)
+        self._finish(job)
+        self._run_callback(job, job.on_error, error)
+
+
+_default_queue: Optional[DownloadQueue] = None
+_default_queue_lock = threading.Lock()
+
+
+def get_download_queue() -> DownloadQueue:
+    """Devuelve la cola de descargas compartida por toda la aplicación"""
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = DownloadQueue()
+        return _default_queue
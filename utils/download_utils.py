@@ -0,0 +1,187 @@
+"""Motor de descargas compartido por los controladores.
+
+Descarga en bloques a un archivo ``.part`` con reanudación mediante
+cabeceras HTTP Range, calcula los hashes mientras se descarga, verifica
+los hashes publicados por el proveedor y renombra el archivo de forma
+atómica al terminar.
+"""
+import hashlib
+import os
+import threading
+import time
+import urllib.error
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils.http_client import get_http_client
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PART_SUFFIX = ".part"
+PROGRESS_INTERVAL = 0.25
+
+# Algoritmos que siempre se calculan: sha1 para resource packs y Modrinth,
+# sha256 para identificar el contenido de forma independiente del proveedor
+DEFAULT_HASH_ALGORITHMS = ("sha1", "sha256")
+SUPPORTED_HASH_ALGORITHMS = ("md5", "sha1", "sha256", "sha512")
+
+# Códigos de algoritmo usados por la API de CurseForge
+CURSEFORGE_HASH_ALGORITHMS = {1: "sha1", 2: "md5"}
+
+ProgressCallback = Callable[[int, Optional[int], float], None]
+
+
+class DownloadCancelledError(Exception):
+    """La descarga se canceló; el archivo ``.part`` se conserva para reanudarla"""
+
+
+def format_size(num_bytes: float) -> str:
+    """Formatea un tamaño en bytes de forma legible"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024 or unit == "GB":
+            if unit == "B":
+                return f"{int(num_bytes)} {unit}"
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+
+def format_progress(downloaded: int, total: Optional[int], speed: float) -> str:
+    """Construye un mensaje de progreso con bytes descargados y velocidad"""
+    if total:
+        percent = min(100, int(downloaded * 100 / total))
+        return f"{format_size(downloaded)} / {format_size(total)} ({percent}%) - {format_size(speed)}/s"
+    return f"{format_size(downloaded)} - {format_size(speed)}/s"
+
+
+def curseforge_hashes(file_data: Dict) -> Dict[str, str]:
+    """Convierte la lista de hashes de un archivo de CurseForge en un diccionario"""
+    hashes = {}
+    for entry in file_data.get("hashes") or []:
+        algorithm = CURSEFORGE_HASH_ALGORITHMS.get(entry.get("algo"))
+        if algorithm and entry.get("value"):
+            hashes[algorithm] = entry["value"]
+    return hashes
+
+
+def _select_algorithms(expected_hashes: Dict[str, str]) -> List[str]:
+    algorithms = list(DEFAULT_HASH_ALGORITHMS)
+    for algorithm in expected_hashes:
+        if algorithm in SUPPORTED_HASH_ALGORITHMS and algorithm not in algorithms:
+            algorithms.append(algorithm)
+    return algorithms
+
+
+def _new_hashers(algorithms: Iterable[str]) -> Dict:
+    return {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+
+
+def _hash_existing_part(part_path: str, hashers: Dict) -> int:
+    """Alimenta los hashers con el contenido ya descargado y devuelve su tamaño"""
+    size = 0
+    with open(part_path, "rb") as f:
+        while True:
+            data = f.read(DOWNLOAD_CHUNK_SIZE)
+            if not data:
+                break
+            for hasher in hashers.values():
+                hasher.update(data)
+            size += len(data)
+    return size
+
+
+def _open_request(url: str, headers: Dict[str, str], offset: int, timeout: float):
+    request_headers = dict(headers)
+    if offset:
+        request_headers["Range"] = f"bytes={offset}-"
+    return get_http_client().open(url, headers=request_headers, timeout=timeout)
+
+
+def download_file(
+    url: str,
+    target_path: str,
+    expected_hashes: Optional[Dict[str, str]] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 20,
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, str]:
+    """Descarga ``url`` en ``target_path`` y devuelve los hashes calculados.
+
+    Si existe un ``target_path.part`` de un intento anterior se reanuda la
+    descarga con una petición Range. ``expected_hashes`` (por ejemplo
+    ``{"sha512": "..."}``) se comprueba antes de renombrar el archivo; si no
+    coincide se elimina el ``.part`` y se lanza ``ValueError``.
+    ``progress_callback`` recibe (bytes descargados, total o None, bytes/s)
+    y se invoca desde el hilo que descarga. Si ``cancel_event`` se activa
+    se lanza ``DownloadCancelledError`` tras el bloque en curso.
+    """
+    expected_hashes = {k.lower(): v.lower() for k, v in (expected_hashes or {}).items() if v}
+    headers = headers or {}
+    part_path = target_path + PART_SUFFIX
+    algorithms = _select_algorithms(expected_hashes)
+
+    hashers = _new_hashers(algorithms)
+    offset = _hash_existing_part(part_path, hashers) if os.path.exists(part_path) else 0
+
+    try:
+        response = _open_request(url, headers, offset, timeout)
+    except urllib.error.HTTPError as e:
+        if e.code != 416 or not offset:
+            raise
+        # El rango no es válido (archivo remoto distinto): empezar de cero
+        offset = 0
+        hashers = _new_hashers(algorithms)
+        response = _open_request(url, headers, 0, timeout)
+
+    with response:
+        if offset and response.status != 206:
+            # El servidor ignoró el Range y envía el archivo completo
+            offset = 0
+            hashers = _new_hashers(algorithms)
+
+        length = response.headers.get("Content-Length")
+        total = int(length) + offset if length and length.isdigit() else None
+
+        downloaded = offset
+        started = time.monotonic()
+        last_report = 0.0
+        with open(part_path, "ab" if offset else "wb") as out_file:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise DownloadCancelledError(f"Download of {os.path.basename(target_path)} cancelled")
+                chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                out_file.write(chunk)
+                for hasher in hashers.values():
+                    hasher.update(chunk)
+                downloaded += len(chunk)
+
+                now = time.monotonic()
+                if progress_callback and now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    speed = (downloaded - offset) / max(now - started, 1e-6)
+                    progress_callback(downloaded, total, speed)
+
+            out_file.flush()
+            os.fsync(out_file.fileno())
+
+    if total is not None and downloaded < total:
+        raise IOError(f"Incomplete download: received {downloaded} of {total} bytes")
+
+    digests = {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+    for algorithm, expected in expected_hashes.items():
+        actual = digests.get(algorithm)
+        if actual is not None and actual != expected:
+            os.remove(part_path)
+            raise ValueError(
+                f"Hash mismatch for {os.path.basename(target_path)} ({algorithm}): "
+                f"expected {expected}, got {actual}"
+            )
+
+    os.replace(part_path, target_path)
+
+    if progress_callback:
+        elapsed = max(time.monotonic() - started, 1e-6)
+        progress_callback(downloaded, total or downloaded, (downloaded - offset) / elapsed)
+
+    return digests
@@ -0,0 +1,101 @@
+"""Detección de JAR duplicados en ``plugins/`` y ``mods/``.
+
+Dos JAR son duplicados si tienen el mismo contenido (mismo SHA-1) o si
+declaran el mismo id de plugin/mod, aunque sea con otra versión o en la otra
+carpeta (``Foo-1.2.jar`` junto a ``Foo-1.3.jar`` tras una actualización
+manual). De cada grupo se propone conservar la copia más nueva: la de
+versión mayor y, a igualdad, la modificada más recientemente.
+"""
+import os
+import re
+from typing import Dict, List, Tuple
+
+REASON_IDENTICAL = "identical"
+REASON_SAME_ID = "same_id"
+
+# Sufijos que indican una versión previa a la publicada
+_PRERELEASE = ("snapshot", "alpha", "beta", "pre", "rc", "dev")
+
+
+def version_sort_key(version: str) -> Tuple:
+    """Clave para ordenar versiones tipo ``1.10.2``, ``2.0-SNAPSHOT`` o ``v3.1b``
+
+    Los números se comparan como enteros y una versión con sufijo de
+    prelanzamiento queda por detrás de la misma versión sin él.
+    """
+    if not version or version == "Unknown":
+        return ((-1,),)
+    tokens = re.findall(r"\d+|[a-zA-Z]+", version.lower().lstrip("v"))
+    numbers = []
+    rest = []
+    for token in tokens:
+        if token.isdigit() and not rest:
+            numbers.append(int(token))
+        else:
+            rest.append(token)
+    prerelease = any(token.startswith(_PRERELEASE) for token in rest if not token.isdigit())
+    return (tuple(numbers), 0 if prerelease else 1)
+
+
+class DuplicateFile:
+    def __init__(self, file_path: str, metadata: Dict):
+        self.file_path = file_path
+        self.version = metadata.get("version") or "Unknown"
+        self.sha1 = metadata.get("sha1")
+        try:
+            self.modified = os.path.getmtime(file_path)
+        except OSError:
+            self.modified = 0.0
+
+    @property
+    def file_name(self) -> str:
+        return os.path.basename(self.file_path)
+
+
+class DuplicateGroup:
+    """Archivos que cargan el mismo plugin o mod"""
+
+    def __init__(self, name: str, reason: str, files: List[DuplicateFile]):
+        self.name = name
+        self.reason = reason
+        self.files = files
+
+    def newest(self) -> DuplicateFile:
+        return max(self.files, key=lambda item: (version_sort_key(item.version), item.modified))
+
+    def to_remove(self) -> List[DuplicateFile]:
+        keep = self.newest()
+        return [item for item in self.files if item is not keep]
+
+    def describe(self) -> str:
+        files = ", ".join(f"{item.file_name} ({item.version})" for item in self.files)
+        if self.reason == REASON_IDENTICAL:
+            return f"{self.name}: identical files {files}"
+        return f"{self.name}: {len(self.files)} versions installed: {files}"
+
+
+def find_duplicate_jars(metadata_by_path: Dict[str, Dict]) -> List[DuplicateGroup]:
+    """Agrupa los JAR duplicados de ``{ruta: metadatos}``
+
+    Cada archivo aparece como mucho en un grupo: se agrupan por id y los que
+    no tienen id conocido, por contenido.
+    """
+    by_id: Dict[str, List[str]] = {}
+    by_hash: Dict[str, List[str]] = {}
+    for file_path, metadata in metadata_by_path.items():
+        identifier = metadata.get("id") or metadata.get("name")
+        if identifier:
+            by_id.setdefault(str(identifier).lower(), []).append(file_path)
+        elif metadata.get("sha1"):
+            by_hash.setdefault(metadata["sha1"], []).append(file_path)
+
+    groups = []
+    for paths in list(by_id.values()) + list(by_hash.values()):
+        if len(paths) < 2:
+            continue
+        files = [DuplicateFile(path, metadata_by_path[path]) for path in sorted(paths)]
+        identical = len({item.sha1 for item in files}) == 1 and files[0].sha1 is not None
+        metadata = metadata_by_path[paths[0]]
+        name = metadata.get("name") or metadata.get("id") or files[0].file_name[:-4]
+        groups.append(DuplicateGroup(name, REASON_IDENTICAL if identical else REASON_SAME_ID, files))
+    return sorted(groups, key=lambda group: group.name.lower())
@@ -1,8 +1,10 @@
 """Utilidades para manejo de archivos y configuraciones"""
+import hashlib
 import json
 import logging
 import os
-from typing import Any, Dict, List, Union
+import threading
+from typing import Any, Dict, Iterable, List, Union
 
 
 JSONData = Union[Dict[str, Any], List[Any]]
@@ -22,17 +24,59 @@ def load_json_file(file_path: str) -> JSONData:
         raise
 
 
+def unique_temp_path(file_path: str) -> str:
+    """Ruta temporal junto a ``file_path`` propia de este proceso e hilo
+
+    Así dos escrituras simultáneas del mismo archivo nunca comparten el
+    temporal.
+    """
+    return f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def remove_quietly(file_path: str):
+    """Elimina un archivo si existe, ignorando errores"""
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+
+def atomic_write(file_path: str, data: Union[bytes, str]):
+    """Escribe un archivo de forma atómica (temporal único + ``os.replace``)
+
+    Si la escritura falla el temporal se elimina y la excepción se propaga;
+    el archivo anterior queda intacto.
+    """
+    tmp_path = unique_temp_path(file_path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data.encode("utf-8") if isinstance(data, str) else data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        remove_quietly(tmp_path)
+        raise
+
+
 def save_json_file(file_path: str, data: JSONData) -> bool:
-    """Guarda datos en un archivo JSON"""
+    """Guarda datos en un archivo JSON (escritura atómica: temporal + rename)"""
     try:
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=4)
+        atomic_write(file_path, json.dumps(data, indent=4))
         return True
     except Exception as e:
         logging.error("Error saving JSON file %s: %s", file_path, e)
         raise
 
 
+def hash_file(file_path: str, algorithms: Iterable[str] = ("sha1",), chunk_size: int = 1024 * 1024) -> Dict[str, str]:
+    """Calcula los hashes de un archivo leyéndolo una sola vez"""
+    hashers = {name: hashlib.new(name) for name in algorithms}
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            for hasher in hashers.values():
+                hasher.update(chunk)
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+
 def ensure_directory_exists(directory_path: str) -> bool:
     """Asegura que un directorio existe, lo crea si no existe"""
     try:
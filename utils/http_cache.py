@@ -0,0 +1,292 @@
+"""Caché en disco para respuestas de las APIs (Modrinth, Spiget, CurseForge, Paper).
+
+Las entradas se indexan por URL y por las cabeceras que alteran la
+respuesta. Se respeta ``Cache-Control`` (``no-store``, ``no-cache``,
+``max-age``) y ``Expires``; las entradas caducadas con ``ETag`` o
+``Last-Modified`` se revalidan con peticiones condicionales. Se pueden
+fijar TTL por prefijo de URL y el tamaño total está limitado: al superarlo
+se eliminan las entradas usadas hace más tiempo.
+"""
+import email.utils
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from utils.constants import (
+    CACHE_DIR,
+    CURSEFORGE_API_BASE_URL,
+    MODRINTH_API_BASE_URL,
+    PAPER_API_BASE_URL,
+    SPIGET_API_BASE_URL,
+)
+from utils.file_utils import atomic_write
+
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+DEFAULT_MAX_CACHE_BYTES = 50 * 1024 * 1024
+
+# Cabeceras de la petición que forman parte de la clave
+VARY_HEADERS = ("accept", "x-api-key")
+
+# Cabeceras de la respuesta que se guardan junto al cuerpo
+STORED_HEADERS = ("content-type", "etag", "last-modified", "cache-control")
+
+# TTL (segundos) por prefijo de URL; el prefijo más largo tiene prioridad
+DEFAULT_TTL_OVERRIDES = {
+    f"{MODRINTH_API_BASE_URL}/search": 300,
+    f"{MODRINTH_API_BASE_URL}/project": 600,
+    f"{MODRINTH_API_BASE_URL}/version": 600,
+    f"{SPIGET_API_BASE_URL}/search": 300,
+    f"{SPIGET_API_BASE_URL}/resources": 600,
+    f"{CURSEFORGE_API_BASE_URL}/mods/search": 300,
+    f"{CURSEFORGE_API_BASE_URL}/mods": 600,
+    f"{PAPER_API_BASE_URL}/projects": 600,
+}
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Convierte una cabecera Cache-Control en un diccionario de directivas"""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, argument = part.partition("=")
+        directives[name.strip().lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+class CacheEntry:
+    """Respuesta almacenada en la caché"""
+
+    def __init__(self, key: str, url: str, status: int, headers: Dict[str, str],
+                 body: bytes, stored_at: float, expires_at: float):
+        self.key = key
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Cabeceras para una petición condicional de revalidación"""
+        validators = {}
+        if self.headers.get("etag"):
+            validators["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            validators["If-Modified-Since"] = self.headers["last-modified"]
+        return validators
+
+
+class HttpCache:
+    def __init__(self, directory: str = HTTP_CACHE_DIR, max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+                 ttl_overrides: Optional[Dict[str, float]] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_overrides = dict(DEFAULT_TTL_OVERRIDES if ttl_overrides is None else ttl_overrides)
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self._metrics = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+    # Claves y rutas
+    def make_key(self, url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        lowered = {k.lower(): v for k, v in (headers or {}).items()}
+        parts = [url] + [f"{name}={lowered.get(name, '')}" for name in VARY_HEADERS]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def _ttl_override(self, url: str) -> Optional[float]:
+        matches = [prefix for prefix in self.ttl_overrides if url.startswith(prefix)]
+        if not matches:
+            return None
+        return self.ttl_overrides[max(matches, key=len)]
+
+    def set_ttl(self, url_prefix: str, seconds: float):
+        """Fija el TTL para las URLs que empiezan por ``url_prefix``"""
+        self.ttl_overrides[url_prefix] = seconds
+
+    # Métricas
+    def _count(self, name: str):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def record_hit(self):
+        self._count("hits")
+
+    def record_miss(self):
+        self._count("misses")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_ratio"] = metrics["hits"] / lookups if lookups else 0.0
+        return metrics
+
+    # Lectura y escritura
+    def lookup(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[CacheEntry]:
+        """Devuelve la entrada almacenada (fresca o no) o ``None``"""
+        key = self.make_key(url, headers)
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+            # El mtime marca el último uso para la expulsión LRU
+            os.utime(meta_path, None)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(key, meta.get("url", url), meta.get("status", 200), meta.get("headers", {}),
+                          body, meta.get("stored_at", 0.0), meta.get("expires_at", 0.0))
+
+    def _expires_at(self, url: str, headers: Dict[str, str], now: float) -> Optional[float]:
+        """Calcula la caducidad; ``None`` significa que no se debe almacenar"""
+        directives = parse_cache_control(headers.get("cache-control"))
+        override = self._ttl_override(url)
+        if "no-store" in directives:
+            return None
+        if override is not None:
+            return now + override
+        if "no-cache" in directives:
+            return now
+        max_age = directives.get("max-age")
+        if max_age and max_age.isdigit():
+            return now + int(max_age)
+        expires = headers.get("expires")
+        if expires:
+            try:
+                return email.utils.parsedate_to_datetime(expires).timestamp()
+            except (TypeError, ValueError):
+                return now
+        # Sin información de caducidad: solo se reutiliza tras revalidar
+        return now
+
+    def store(self, url: str, request_headers: Optional[Dict[str, str]], status: int,
+              response_headers: Any, body: bytes) -> Optional[CacheEntry]:
+        """Guarda una respuesta 200 si sus cabeceras lo permiten"""
+        if status != 200:
+            return None
+        headers = {}
+        for name in STORED_HEADERS + ("expires",):
+            value = response_headers.get(name)
+            if value:
+                headers[name] = value
+        now = time.time()
+        expires_at = self._expires_at(url, headers, now)
+        if expires_at is None:
+            return None
+        if expires_at <= now and not (headers.get("etag") or headers.get("last-modified")):
+            return None
+
+        key = self.make_key(url, request_headers)
+        meta = {"url": url, "status": status, "headers": headers, "stored_at": now, "expires_at": expires_at}
+        self._write(key, meta, body)
+        self._count("stores")
+        return CacheEntry(key, url, status, headers, body, now, expires_at)
+
+    def refresh(self, entry: CacheEntry, response_headers: Any) -> CacheEntry:
+        """Actualiza la caducidad de una entrada tras una respuesta 304"""
+        for name in STORED_HEADERS + ("expires",):
+            value = response_headers.get(name)
+            if value:
+                entry.headers[name] = value
+        now = time.time()
+        entry.stored_at = now
+        entry.expires_at = self._expires_at(entry.url, entry.headers, now) or now
+        meta = {"url": entry.url, "status": entry.status, "headers": entry.headers,
+                "stored_at": entry.stored_at, "expires_at": entry.expires_at}
+        meta_path, _ = self._paths(entry.key)
+        atomic_write(meta_path, json.dumps(meta).encode())
+        self._count("revalidated")
+        return entry
+
+    def _write(self, key: str, meta: Dict[str, Any], body: bytes):
+        meta_path, body_path = self._paths(key)
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            previous = self._entry_size(meta_path, body_path)
+            atomic_write(body_path, body)
+            atomic_write(meta_path, json.dumps(meta).encode())
+        except OSError:
+            return
+        added = self._entry_size(meta_path, body_path) - previous
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += added
+        self._evict_if_needed()
+
+    def _entry_size(self, *paths: str) -> int:
+        size = 0
+        for path in paths:
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    def _iter_entries(self) -> Iterable[Tuple[str, float, int]]:
+        """Recorre las entradas devolviendo (clave, último uso, tamaño)"""
+        if not os.path.isdir(self.directory):
+            return
+        for bucket in os.listdir(self.directory):
+            bucket_path = os.path.join(self.directory, bucket)
+            if not os.path.isdir(bucket_path):
+                continue
+            for filename in os.listdir(bucket_path):
+                if not filename.endswith(".json"):
+                    continue
+                key = filename[:-len(".json")]
+                meta_path, body_path = self._paths(key)
+                try:
+                    last_used = os.path.getmtime(meta_path)
+                except OSError:
+                    continue
+                yield key, last_used, self._entry_size(meta_path, body_path)
+
+    def _evict_if_needed(self):
+        with self._lock:
+            total = self._total_bytes
+        if total is None:
+            total = sum(size for _, _, size in self._iter_entries())
+        if total <= self.max_bytes:
+            with self._lock:
+                self._total_bytes = total
+            return
+
+        entries = sorted(self._iter_entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        evicted = 0
+        for key, _, size in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+        with self._lock:
+            self._total_bytes = total
+            self._metrics["evictions"] += evicted
+
+    def clear(self):
+        """Elimina todas las entradas"""
+        for key, _, _ in list(self._iter_entries()):
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        with self._lock:
+            self._total_bytes = 0
@@ -0,0 +1,390 @@
+"""Cliente HTTP compartido con conexiones persistentes.
+
+Mantiene un pool de conexiones keep-alive por host, añade las cabeceras
+por defecto (User-Agent, Accept-Encoding), aplica timeouts, descomprime
+respuestas gzip y registra métricas de tiempo por petición. Los errores se
+lanzan como ``urllib.error.HTTPError``/``URLError`` para que el código que
+ya los manejaba siga funcionando igual.
+"""
+import gzip
+import http.client
+import json
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.constants import HTTP_USER_AGENT
+from utils.http_cache import HttpCache
+
+DEFAULT_TIMEOUT = 10
+MAX_IDLE_CONNECTIONS_PER_HOST = 4
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# Errores que indican que una conexión reutilizada fue cerrada por el servidor
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+PoolKey = Tuple[str, str, int]
+
+
+class HttpResponse:
+    """Respuesta completa (cuerpo ya leído y descomprimido)"""
+
+    def __init__(self, url: str, status: int, reason: str, headers: Any,
+                 body: bytes, elapsed: float, from_cache: bool = False):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed
+        self.from_cache = from_cache
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode())
+
+
+class HttpStream:
+    """Respuesta en streaming; devuelve la conexión al pool al cerrarse"""
+
+    def __init__(self, client: "HttpClient", key: Optional[PoolKey], connection, response, url: str):
+        self._client = client
+        self._key = key
+        self._connection = connection
+        self._response = response
+        self.url = url
+        self.status = response.status
+        self.reason = getattr(response, "reason", "")
+        self.headers = response.headers
+
+    def read(self, amount: int = -1) -> bytes:
+        if amount is None or amount < 0:
+            return self._response.read()
+        return self._response.read(amount)
+
+    def close(self):
+        if self._response is None:
+            return
+        reusable = self._key is not None and self._response.isclosed() and not self._response.will_close
+        if not reusable:
+            self._response.close()
+        if self._connection is not None:
+            self._client._release(self._key, self._connection, reusable)
+        self._response = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class HttpClient:
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, default_headers: Optional[Dict[str, str]] = None,
+                 cache: Optional[HttpCache] = None):
+        self.timeout = timeout
+        self.cache = cache
+        self.default_headers = {
+            "User-Agent": HTTP_USER_AGENT,
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+        }
+        if default_headers:
+            self.default_headers.update(default_headers)
+        self._pools: Dict[PoolKey, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+        self._metrics = {
+            "requests": 0,
+            "errors": 0,
+            "new_connections": 0,
+            "reused_connections": 0,
+            "total_time": 0.0,
+            "bytes_received": 0,
+            "hosts": {},
+        }
+
+    # Pool de conexiones
+    def _pool_key(self, parsed: urllib.parse.ParseResult) -> PoolKey:
+        default_port = 443 if parsed.scheme == "https" else 80
+        return parsed.scheme, parsed.hostname or "", parsed.port or default_port
+
+    def _acquire(self, key: PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._pools.get(key)
+            if idle:
+                connection = idle.pop()
+                self._metrics["reused_connections"] += 1
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                connection.timeout = timeout
+                return connection, True
+            self._metrics["new_connections"] += 1
+
+        scheme, host, port = key
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        return connection, False
+
+    def _release(self, key: Optional[PoolKey], connection: http.client.HTTPConnection, reusable: bool):
+        if not reusable or key is None:
+            connection.close()
+            return
+        with self._lock:
+            idle = self._pools.setdefault(key, [])
+            if len(idle) < MAX_IDLE_CONNECTIONS_PER_HOST:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """Cierra todas las conexiones inactivas"""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for idle in pools.values():
+            for connection in idle:
+                connection.close()
+
+    # Métricas
+    def _record(self, host: str, elapsed: float, received: int, failed: bool = False):
+        with self._lock:
+            self._metrics["requests"] += 1
+            self._metrics["total_time"] += elapsed
+            self._metrics["bytes_received"] += received
+            if failed:
+                self._metrics["errors"] += 1
+            host_stats = self._metrics["hosts"].setdefault(host, {"requests": 0, "total_time": 0.0})
+            host_stats["requests"] += 1
+            host_stats["total_time"] += elapsed
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Devuelve una copia de las métricas acumuladas"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["hosts"] = {host: dict(stats) for host, stats in self._metrics["hosts"].items()}
+        metrics["average_time"] = metrics["total_time"] / metrics["requests"] if metrics["requests"] else 0.0
+        return metrics
+
+    # Peticiones
+    def _build_headers(self, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        merged = dict(self.default_headers)
+        if headers:
+            merged.update(headers)
+        return merged
+
+    def _uses_proxy(self, parsed: urllib.parse.ParseResult) -> bool:
+        if not urllib.request.getproxies().get(parsed.scheme):
+            return False
+        return not urllib.request.proxy_bypass(parsed.hostname or "")
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+              timeout: float) -> HttpStream:
+        """Envía una petición siguiendo redirecciones y devuelve la respuesta sin leer"""
+        for _ in range(MAX_REDIRECTS + 1):
+            parsed = urllib.parse.urlparse(url)
+            if parsed.scheme not in ("http", "https"):
+                raise urllib.error.URLError(f"Unsupported URL scheme: {parsed.scheme}")
+
+            if self._uses_proxy(parsed):
+                # Con proxy configurado se delega en urllib (sin reutilizar conexiones)
+                request = urllib.request.Request(url, data=body, headers=headers, method=method)
+                return HttpStream(self, None, None, urllib.request.urlopen(request, timeout=timeout), url)
+
+            key = self._pool_key(parsed)
+            path = parsed.path or "/"
+            if parsed.query:
+                path += "?" + parsed.query
+
+            response, connection = self._send_on_pool(key, method, path, headers, body, timeout)
+            stream = HttpStream(self, key, connection, response, url)
+
+            if response.status in REDIRECT_CODES and response.getheader("Location"):
+                location = urllib.parse.urljoin(url, response.getheader("Location"))
+                response.read()
+                stream.close()
+                if response.status == 303 or (response.status in (301, 302) and method == "POST"):
+                    method, body = "GET", None
+                url = location
+                continue
+
+            if response.status >= 400:
+                error_body = response.read()
+                stream.close()
+                raise urllib.error.HTTPError(url, response.status, response.reason, response.headers,
+                                             _BytesReader(error_body))
+            return stream
+
+        raise urllib.error.URLError(f"Too many redirects for {url}")
+
+    def _send_on_pool(self, key: PoolKey, method: str, path: str, headers: Dict[str, str],
+                      body: Optional[bytes], timeout: float):
+        connection, reused = self._acquire(key, timeout)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            return connection.getresponse(), connection
+        except STALE_CONNECTION_ERRORS:
+            connection.close()
+            if not reused:
+                raise
+        except Exception:
+            connection.close()
+            raise
+
+        # La conexión reutilizada estaba cerrada: reintentar con una nueva
+        connection, _ = self._acquire_new(key, timeout)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            return connection.getresponse(), connection
+        except Exception:
+            connection.close()
+            raise
+
+    def _acquire_new(self, key: PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        # Las demás conexiones inactivas del host probablemente también caducaron
+        with self._lock:
+            stale = self._pools.pop(key, [])
+        for connection in stale:
+            connection.close()
+        return self._acquire(key, timeout)
+
+    def _send_checked(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+                      timeout: float) -> HttpStream:
+        """Como ``_send`` pero traduce los errores de socket a ``URLError``"""
+        try:
+            return self._send(method, url, headers, body, timeout)
+        except (urllib.error.URLError, socket.timeout):
+            raise
+        except (OSError, http.client.HTTPException) as e:
+            raise urllib.error.URLError(e)
+
+    def open(self, url: str, headers: Optional[Dict[str, str]] = None, method: str = "GET",
+             body: Optional[bytes] = None, timeout: Optional[float] = None) -> HttpStream:
+        """Abre una respuesta en streaming (para descargas de archivos).
+
+        No se solicita compresión para que las cabeceras Range y
+        Content-Length se refieran a los bytes del archivo.
+        """
+        request_headers = self._build_headers(headers)
+        request_headers["Accept-Encoding"] = "identity"
+        host = urllib.parse.urlparse(url).netloc
+        started = time.monotonic()
+        try:
+            stream = self._send_checked(method, url, request_headers, body, timeout or self.timeout)
+        except Exception:
+            self._record(host, time.monotonic() - started, 0, failed=True)
+            raise
+        self._record(host, time.monotonic() - started, 0)
+        return stream
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                body: Optional[bytes] = None, timeout: Optional[float] = None,
+                use_cache: bool = True) -> HttpResponse:
+        """Realiza una petición y devuelve la respuesta completa.
+
+        Las peticiones GET pasan por la caché en disco (si hay una
+        configurada y ``use_cache`` es verdadero): una entrada fresca se
+        devuelve sin tocar la red y una caducada se revalida con
+        If-None-Match/If-Modified-Since.
+        """
+        request_headers = self._build_headers(headers)
+        cache = self.cache if use_cache and method == "GET" else None
+        cached = cache.lookup(url, request_headers) if cache else None
+        if cached is not None and cached.is_fresh():
+            cache.record_hit()
+            return HttpResponse(cached.url, cached.status, "OK", cached.headers, cached.body, 0.0, True)
+        if cached is not None:
+            request_headers.update(cached.validators())
+
+        response = self._request_network(method, url, request_headers, body, timeout)
+
+        if cache is None:
+            return response
+        if cached is not None and response.status == 304:
+            cache.refresh(cached, response.headers)
+            cache.record_hit()
+            return HttpResponse(cached.url, cached.status, "OK", cached.headers, cached.body,
+                                response.elapsed, True)
+        cache.record_miss()
+        cache.store(url, request_headers, response.status, response.headers, response.body)
+        return response
+
+    def _request_network(self, method: str, url: str, request_headers: Dict[str, str],
+                         body: Optional[bytes], timeout: Optional[float]) -> HttpResponse:
+        host = urllib.parse.urlparse(url).netloc
+        started = time.monotonic()
+        try:
+            with self._send_checked(method, url, request_headers, body, timeout or self.timeout) as stream:
+                data = stream.read()
+                status, reason, response_headers, final_url = stream.status, stream.reason, stream.headers, stream.url
+        except (urllib.error.URLError, socket.timeout):
+            self._record(host, time.monotonic() - started, 0, failed=True)
+            raise
+        except (OSError, http.client.HTTPException) as e:
+            self._record(host, time.monotonic() - started, 0, failed=True)
+            raise urllib.error.URLError(e)
+
+        received = len(data)
+        if (response_headers.get("Content-Encoding") or "").lower() == "gzip":
+            data = gzip.decompress(data)
+        elapsed = time.monotonic() - started
+        self._record(host, elapsed, received)
+        return HttpResponse(final_url, status, reason, response_headers, data, elapsed)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[float] = None, use_cache: bool = True) -> HttpResponse:
+        return self.request("GET", url, headers=headers, timeout=timeout, use_cache=use_cache)
+
+    def get_json(self, url: str, headers: Optional[Dict[str, str]] = None,
+                 timeout: Optional[float] = None, use_cache: bool = True) -> Any:
+        return self.get(url, headers=headers, timeout=timeout, use_cache=use_cache).json()
+
+    def post_json(self, url: str, payload: Any, headers: Optional[Dict[str, str]] = None,
+                  timeout: Optional[float] = None) -> Any:
+        request_headers = {"Content-Type": "application/json"}
+        if headers:
+            request_headers.update(headers)
+        body = json.dumps(payload).encode()
+        return self.request("POST", url, headers=request_headers, body=body, timeout=timeout).json()
+
+
+class _BytesReader:
+    """Objeto tipo archivo mínimo para el cuerpo de ``HTTPError``"""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self, *args) -> bytes:
+        data, self._data = self._data, b""
+        return data
+
+    def close(self):
+        pass
+
+
+_default_client: Optional[HttpClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Devuelve el cliente HTTP compartido por toda la aplicación"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient(cache=HttpCache())
+        return _default_client
@@ -0,0 +1,131 @@
+"""Carga de iconos de proyectos con un número fijo de hilos.
+
+La lista de resultados pide un icono cada vez que se dibuja una fila, así
+que aquí se evita repetir trabajo: cada URL se descarga una sola vez
+aunque se pida muchas veces mientras está en curso, los iconos ya
+decodificados se guardan en una caché LRU de tamaño limitado y los fallos
+también se recuerdan para no reintentarlos en cada redibujado. Las
+peticiones pendientes se atienden de la más reciente a la más antigua
+(las filas visibles ahora primero) y, si se acumulan demasiadas, se
+descartan las más antiguas.
+
+El módulo no depende de GTK: quien lo usa aporta la función que convierte
+los bytes en la imagen a mostrar.
+"""
+import base64
+import json
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.http_client import get_http_client
+
+ICON_WORKERS = 4
+MAX_CACHED_ICONS = 512
+MAX_PENDING_ICONS = 256
+
+# Valor guardado para las URL cuyo icono no se pudo obtener
+ICON_MISSING = object()
+
+IconCallback = Callable[[str, Any], None]
+
+
+def icon_bytes_from_body(body: bytes, url: str) -> bytes:
+    """Extrae la imagen de una respuesta; Spiget devuelve un JSON con la imagen en base64"""
+    if body[:1] == b"{":
+        data = json.loads(body.decode("utf-8")).get("data") or ""
+        body = base64.b64decode(data)
+    if not body:
+        raise ValueError(f"Empty icon at {url}")
+    return body
+
+
+def fetch_icon_bytes(url: str) -> bytes:
+    """Descarga un icono sin guardarlo en disco"""
+    return icon_bytes_from_body(get_http_client().get(url, use_cache=False).body, url)
+
+
+class IconLoader:
+    def __init__(self, decode: Callable[[bytes], Any], fetch: Callable[[str], bytes] = fetch_icon_bytes,
+                 workers: int = ICON_WORKERS, max_entries: int = MAX_CACHED_ICONS,
+                 max_pending: int = MAX_PENDING_ICONS):
+        self.decode = decode
+        self.fetch = fetch
+        self.workers = workers
+        self.max_entries = max_entries
+        self.max_pending = max_pending
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._callbacks: Dict[str, List[IconCallback]] = {}  # URL pendiente o en curso -> callbacks
+        self._pending: deque = deque()
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+
+    def get(self, url: str) -> Optional[Any]:
+        """Icono ya cargado (o ``ICON_MISSING``); None si todavía no se tiene"""
+        with self._condition:
+            value = self._cache.get(url)
+            if value is not None:
+                self._cache.move_to_end(url)
+            return value
+
+    def request(self, url: str, callback: Optional[IconCallback] = None) -> Optional[Any]:
+        """Pide un icono; si no está en caché se carga en segundo plano
+
+        ``callback(url, icon)`` se invoca desde un hilo de trabajo al
+        terminar (con ``ICON_MISSING`` si falla). Un mismo callback solo se
+        registra una vez por URL.
+        """
+        with self._condition:
+            value = self._cache.get(url)
+            if value is not None:
+                self._cache.move_to_end(url)
+                return value
+            callbacks = self._callbacks.get(url)
+            if callbacks is None:
+                callbacks = self._callbacks[url] = []
+                self._pending.append(url)
+                while len(self._pending) > self.max_pending:
+                    # Lo más antiguo ya no estará a la vista; se volverá a pedir si hace falta
+                    self._callbacks.pop(self._pending.popleft(), None)
+                self._ensure_workers()
+                self._condition.notify()
+            if callback is not None and callback not in callbacks:
+                callbacks.append(callback)
+        return None
+
+    def clear_pending(self):
+        """Olvida las peticiones que aún no han empezado (por ejemplo al cambiar de búsqueda)"""
+        with self._condition:
+            for url in self._pending:
+                self._callbacks.pop(url, None)
+            self._pending.clear()
+
+    def _ensure_workers(self):
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, daemon=True, name="icon-loader")
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                url = self._pending.pop()
+
+            try:
+                value = self.decode(self.fetch(url))
+            except Exception:
+                value = None
+            if value is None:
+                value = ICON_MISSING
+
+            with self._condition:
+                self._cache[url] = value
+                self._cache.move_to_end(url)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+                callbacks = self._callbacks.pop(url, [])
+            for callback in callbacks:
+                callback(url, value)
@@ -0,0 +1,345 @@
+"""Lectura de metadatos de JAR de plugins y mods con caché persistente.
+
+``read_jar_metadata`` abre el JAR una sola vez y extrae nombre, versión,
+tipo, clase principal, dependencias, orden de carga y hashes de ``plugin.yml``,
+``paper-plugin.yml``, ``fabric.mod.json``, ``quilt.mod.json`` o
+``mods.toml``. Los mods de Fabric/Quilt incluidos en ``META-INF/jars/``
+(como los módulos de fabric-api) se añaden a ``provides``. ``JarMetadataCache`` guarda el resultado indexado por
+(ruta, tamaño, mtime_ns, inodo), de modo que en un refresco solo se vuelven
+a leer los archivos nuevos o modificados y el resto cuesta un ``stat()``.
+"""
+import io
+import json
+import os
+import re
+import threading
+import time
+import zipfile
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+from utils.constants import CACHE_DIR
+from utils.file_utils import atomic_write, hash_file
+
+JAR_METADATA_CACHE_FILE = os.path.join(CACHE_DIR, "jar_metadata.json")
+JAR_METADATA_CACHE_VERSION = 5
+MAX_CACHE_ENTRIES = 5000
+NESTED_JARS_DIR = "META-INF/jars/"
+
+HASH_ALGORITHMS = ("sha1", "sha256", "sha512")
+
+# Dependencias que proporciona el propio juego o el loader
+BUILTIN_DEPENDENCIES = {"minecraft", "java", "fabricloader", "quilt_loader", "forge", "neoforge"}
+
+
+def _empty_metadata() -> Dict[str, Any]:
+    return {
+        "id": None,
+        "name": None,
+        "version": "Unknown",
+        "type": None,
+        "loader": None,
+        "main": None,
+        "dependencies": [],
+        "soft_dependencies": [],
+        "load_before": [],
+        "provides": [],
+        "api_version": None,
+        "environment": None,
+    }
+
+
+def _as_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [str(key) for key in value]
+    return [str(item) for item in value if item]
+
+
+def _parse_plugin_yml(text: str, loader: str) -> Dict[str, Any]:
+    """plugin.yml (Bukkit) y paper-plugin.yml (Paper)"""
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError:
+        data = None
+    if not isinstance(data, dict):
+        # YAML inválido: recuperar al menos los campos básicos
+        data = {}
+        for key in ("name", "version", "main"):
+            match = re.search(rf"^{key}:\s*(.+)$", text, re.MULTILINE)
+            if match:
+                data[key] = match.group(1).strip().strip("'\"")
+
+    meta = _empty_metadata()
+    meta.update(type="plugin", loader=loader)
+    meta["id"] = meta["name"] = str(data["name"]) if data.get("name") else None
+    if data.get("version") is not None:
+        meta["version"] = str(data["version"])
+    meta["main"] = data.get("main")
+    if data.get("api-version") is not None:
+        meta["api_version"] = str(data["api-version"])
+    meta["provides"] = _as_list(data.get("provides"))
+    meta["load_before"] = _as_list(data.get("loadbefore"))
+
+    if loader == "paper" and isinstance(data.get("dependencies"), dict):
+        # paper-plugin.yml: dependencies: {server: {Nombre: {required: true, load: BEFORE}}}
+        for section in data["dependencies"].values():
+            if not isinstance(section, dict):
+                continue
+            for name, options in section.items():
+                options = options if isinstance(options, dict) else {}
+                if options.get("required", True):
+                    meta["dependencies"].append(str(name))
+                elif str(options.get("load", "")).upper() != "BEFORE":
+                    meta["soft_dependencies"].append(str(name))
+                if str(options.get("load", "")).upper() == "BEFORE":
+                    meta["load_before"].append(str(name))
+    else:
+        meta["dependencies"] = _as_list(data.get("depend"))
+        meta["soft_dependencies"] = _as_list(data.get("softdepend"))
+    return meta
+
+
+def _parse_fabric_json(text: str, loader: str) -> Dict[str, Any]:
+    """fabric.mod.json y quilt.mod.json"""
+    data = json.loads(text)
+    if isinstance(data, dict) and loader == "quilt":
+        data = data.get("quilt_loader", data)
+    if not isinstance(data, dict):
+        return _empty_metadata()
+    meta = _empty_metadata()
+    meta.update(type="mod", loader=loader)
+    if loader == "quilt":
+        depends = [dep.get("id") if isinstance(dep, dict) else dep for dep in data.get("depends", [])]
+        meta["dependencies"] = [str(dep) for dep in depends if dep]
+        metadata = data.get("metadata") or {}
+        meta["name"] = metadata.get("name")
+        meta["environment"] = (data.get("minecraft") or {}).get("environment")
+        provides = [item.get("id") if isinstance(item, dict) else item for item in data.get("provides", [])]
+        meta["provides"] = [str(item) for item in provides if item]
+    else:
+        meta["dependencies"] = _as_list(data.get("depends"))
+        meta["soft_dependencies"] = _as_list(data.get("recommends")) + _as_list(data.get("suggests"))
+        meta["name"] = data.get("name")
+        meta["environment"] = data.get("environment")
+        meta["provides"] = _as_list(data.get("provides"))
+    meta["dependencies"] = [dep for dep in meta["dependencies"] if dep not in BUILTIN_DEPENDENCIES]
+    meta["soft_dependencies"] = [dep for dep in meta["soft_dependencies"] if dep not in BUILTIN_DEPENDENCIES]
+    meta["id"] = data.get("id")
+    meta["name"] = meta["name"] or meta["id"]
+    if data.get("version"):
+        meta["version"] = str(data["version"])
+    entrypoints = data.get("entrypoints") or {}
+    main = entrypoints.get("main") or entrypoints.get("server") or []
+    if main:
+        first = main[0]
+        meta["main"] = first.get("value") if isinstance(first, dict) else str(first)
+    return meta
+
+
+def _parse_mods_toml(text: str, loader: str, manifest: str = "") -> Dict[str, Any]:
+    """META-INF/mods.toml (Forge) y META-INF/neoforge.mods.toml (NeoForge)"""
+    meta = _empty_metadata()
+    meta.update(type="mod", loader=loader)
+
+    # Solo el primer bloque [[mods]] describe el mod principal del JAR
+    mods_block = re.split(r"^\s*\[\[mods\]\]\s*$", text, maxsplit=1, flags=re.MULTILINE)
+    block = re.split(r"^\s*\[", mods_block[1], maxsplit=1, flags=re.MULTILINE)[0] if len(mods_block) > 1 else text
+
+    def field(name: str) -> Optional[str]:
+        match = re.search(rf'^\s*{name}\s*=\s*"([^"]+)"', block, re.MULTILINE)
+        return match.group(1).strip() if match else None
+
+    meta["id"] = field("modId")
+    meta["name"] = field("displayName") or meta["id"]
+    if field("displayTest") == "IGNORE_SERVER_VERSION":
+        # El servidor no necesita tener el mod: solo funciona en el cliente
+        meta["environment"] = "client"
+    version = field("version")
+    if version and "${" in version:
+        # "${file.jarVersion}" se resuelve con el MANIFEST
+        match = re.search(r"^Implementation-Version:\s*(\S+)", manifest, re.MULTILINE)
+        version = match.group(1) if match else None
+    if version:
+        meta["version"] = version
+
+    for dep_block in re.split(r"^\s*\[\[dependencies\.[^\]]+\]\]\s*$", text, flags=re.MULTILINE)[1:]:
+        dep_block = re.split(r"^\s*\[", dep_block, maxsplit=1, flags=re.MULTILINE)[0]
+        mod_id = re.search(r'^\s*modId\s*=\s*"([^"]+)"', dep_block, re.MULTILINE)
+        if not mod_id or mod_id.group(1) in BUILTIN_DEPENDENCIES:
+            continue
+        mandatory = re.search(r"^\s*mandatory\s*=\s*(true|false)", dep_block, re.MULTILINE)
+        dep_type = re.search(r'^\s*type\s*=\s*"(\w+)"', dep_block, re.MULTILINE)
+        required = (mandatory.group(1) == "true") if mandatory else (
+            not dep_type or dep_type.group(1).lower() == "required"
+        )
+        (meta["dependencies"] if required else meta["soft_dependencies"]).append(mod_id.group(1))
+    return meta
+
+
+def _nested_mod_ids(jar: zipfile.ZipFile, names: Iterable[str]) -> List[str]:
+    """Ids de los mods de Fabric/Quilt incluidos en ``META-INF/jars/``
+
+    fabric-api, por ejemplo, trae así sus módulos (fabric-api-base,
+    fabric-networking-api-v1...), que otros mods piden como dependencia.
+    """
+    ids: List[str] = []
+    for name in sorted(names):
+        if not (name.startswith(NESTED_JARS_DIR) and name.endswith(".jar")):
+            continue
+        try:
+            with zipfile.ZipFile(io.BytesIO(jar.read(name)), "r") as nested:
+                nested_names = set(nested.namelist())
+                for descriptor, loader in (("fabric.mod.json", "fabric"), ("quilt.mod.json", "quilt")):
+                    if descriptor in nested_names:
+                        nested_meta = _parse_fabric_json(
+                            nested.read(descriptor).decode("utf-8", errors="ignore"), loader
+                        )
+                        if nested_meta["id"]:
+                            ids.append(str(nested_meta["id"]))
+                        ids.extend(nested_meta["provides"])
+                        break
+        except (OSError, ValueError, zipfile.BadZipFile, KeyError):
+            continue
+    return ids
+
+
+def read_jar_metadata(file_path: str, with_hashes: bool = True) -> Dict[str, Any]:
+    """Lee los metadatos de un JAR abriéndolo una sola vez
+
+    Nunca lanza por un JAR corrupto o sin descriptor: devuelve los campos
+    que se hayan podido obtener (``version`` es "Unknown" si no se conoce).
+    """
+    meta = _empty_metadata()
+    try:
+        with zipfile.ZipFile(file_path, "r") as jar:
+            names = set(jar.namelist())
+
+            def read(name: str) -> str:
+                return jar.read(name).decode("utf-8", errors="ignore")
+
+            if "paper-plugin.yml" in names:
+                meta = _parse_plugin_yml(read("paper-plugin.yml"), "paper")
+            elif "plugin.yml" in names:
+                meta = _parse_plugin_yml(read("plugin.yml"), "bukkit")
+            elif "fabric.mod.json" in names:
+                meta = _parse_fabric_json(read("fabric.mod.json"), "fabric")
+            elif "quilt.mod.json" in names:
+                meta = _parse_fabric_json(read("quilt.mod.json"), "quilt")
+            else:
+                for toml_file, loader in (("META-INF/neoforge.mods.toml", "neoforge"),
+                                          ("META-INF/mods.toml", "forge"), ("mods.toml", "forge")):
+                    if toml_file in names:
+                        manifest = read("META-INF/MANIFEST.MF") if "META-INF/MANIFEST.MF" in names else ""
+                        meta = _parse_mods_toml(read(toml_file), loader, manifest)
+                        break
+
+            if meta["loader"] in ("fabric", "quilt"):
+                nested = [mod_id for mod_id in _nested_mod_ids(jar, names) if mod_id != meta["id"]]
+                meta["provides"] = list(dict.fromkeys(meta["provides"] + nested))
+    except (OSError, ValueError, zipfile.BadZipFile, KeyError):
+        pass
+
+    if with_hashes:
+        try:
+            meta.update(hash_file(file_path, HASH_ALGORITHMS))
+        except OSError:
+            pass
+    return meta
+
+
+def _file_identity(file_path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+class JarMetadataCache:
+    """Caché persistente de ``read_jar_metadata`` indexada por identidad de archivo"""
+
+    def __init__(self, cache_file: str = JAR_METADATA_CACHE_FILE, max_entries: int = MAX_CACHE_ENTRIES):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+            if data.get("version") == JAR_METADATA_CACHE_VERSION:
+                self._entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def get(self, file_path: str) -> Dict[str, Any]:
+        """Metadatos del JAR; solo se lee si es nuevo o ha cambiado"""
+        path = os.path.abspath(file_path)
+        identity = _file_identity(path)
+        with self._lock:
+            self._load()
+            entry = self._entries.get(path)
+            if entry and identity and entry.get("identity") == identity:
+                self.hits += 1
+                entry["seen"] = time.time()
+                return dict(entry["metadata"])
+            self.misses += 1
+
+        metadata = read_jar_metadata(path)
+        if identity:
+            with self._lock:
+                self._entries[path] = {"identity": identity, "metadata": metadata, "seen": time.time()}
+                self._dirty = True
+        return dict(metadata)
+
+    def get_many(self, file_paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        return {path: self.get(path) for path in file_paths}
+
+    def forget(self, file_path: str):
+        with self._lock:
+            self._load()
+            if self._entries.pop(os.path.abspath(file_path), None) is not None:
+                self._dirty = True
+
+    def save(self):
+        """Escribe la caché si ha cambiado (escritura atómica)"""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            if len(self._entries) > self.max_entries:
+                # Conservar las entradas vistas más recientemente
+                newest = sorted(self._entries.items(), key=lambda item: item[1].get("seen", 0), reverse=True)
+                self._entries = dict(newest[:self.max_entries])
+            data = json.dumps({"version": JAR_METADATA_CACHE_VERSION, "entries": self._entries})
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            atomic_write(self.cache_file, data)
+        except OSError:
+            with self._lock:
+                self._dirty = True
+
+
+_default_cache: Optional[JarMetadataCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_jar_metadata_cache() -> JarMetadataCache:
+    """Devuelve la caché de metadatos de JAR compartida por toda la aplicación"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = JarMetadataCache()
+        return _default_cache
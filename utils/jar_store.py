@@ -0,0 +1,252 @@
+"""Almacén de JAR compartido por todos los servidores, direccionado por contenido.
+
+Cada archivo se guarda una sola vez como ``blobs/<sha256[:2]>/<sha256>`` en
+el directorio de datos del usuario. Un índice relaciona los hashes que
+publican los proveedores (sha1, sha512, md5) con el sha256, de modo que se
+puede saber si un archivo ya está en el almacén *antes* de descargarlo.
+Para instalar un archivo en ``plugins/`` o ``mods/`` se intenta un reflink
+(copia con copy-on-write en Btrfs/XFS), después un enlace duro y, si
+ninguno es posible, una copia normal. Los blobs son de solo lectura y las
+actualizaciones sustituyen el archivo con ``os.replace``, así que un enlace
+duro no se modifica sin querer; aun así el índice guarda el tamaño y el
+mtime de cada blob y, si han cambiado al instalarlo, se vuelve a comprobar
+su hash. Los archivos del usuario nunca se enlazan al almacén y los blobs
+que ningún servidor usa se pueden eliminar con ``collect_garbage``.
+"""
+import json
+import os
+import shutil
+import stat
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from utils.constants import USER_DATA_DIR
+from utils.file_utils import atomic_write, hash_file, remove_quietly, unique_temp_path
+
+JAR_STORE_DIR = os.path.join(USER_DATA_DIR, "jar_store")
+STORE_HASH_ALGORITHMS = ("sha1", "sha256", "sha512")
+ALIAS_ALGORITHMS = ("md5", "sha1", "sha512")
+
+# ioctl FICLONE de Linux (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+DEPLOY_REFLINK = "reflink"
+DEPLOY_HARDLINK = "hardlink"
+DEPLOY_COPY = "copy"
+
+# Los blobs más recientes no se eliminan: pueden estar a punto de instalarse
+GARBAGE_GRACE_SECONDS = 3600
+
+
+def _reflink(source_path: str, target_path: str) -> bool:
+    """Clona el archivo compartiendo bloques si el sistema de archivos lo permite"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source_path, "rb") as source, open(target_path, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        return True
+    except OSError:
+        try:
+            os.remove(target_path)
+        except OSError:
+            pass
+        return False
+
+
+def _blob_identity(path: str) -> List[int]:
+    stat_result = os.stat(path)
+    return [stat_result.st_size, stat_result.st_mtime_ns]
+
+
+class JarStore:
+    def __init__(self, directory: str = JAR_STORE_DIR, use_hardlinks: bool = True):
+        self.directory = directory
+        self.index_file = os.path.join(directory, "index.json")
+        self.use_hardlinks = use_hardlinks
+        self._lock = threading.Lock()
+        self._aliases: Optional[Dict[str, str]] = None
+        self._verified: Optional[Dict[str, List[int]]] = None
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.directory, "blobs", sha256[:2], sha256)
+
+    def _load(self):
+        if self._aliases is not None:
+            return
+        try:
+            with open(self.index_file, "r") as f:
+                data = json.load(f)
+            self._aliases = data.get("aliases", {})
+            self._verified = data.get("verified", {})
+        except (OSError, ValueError, AttributeError):
+            self._aliases, self._verified = {}, {}
+
+    def _save(self):
+        try:
+            atomic_write(self.index_file, json.dumps({"aliases": self._aliases, "verified": self._verified}))
+        except OSError:
+            pass
+
+    def find(self, hashes: Optional[Dict[str, str]]) -> Optional[str]:
+        """sha256 del archivo del almacén que coincide con alguno de los hashes"""
+        if not hashes:
+            return None
+        with self._lock:
+            self._load()
+            for algorithm, value in hashes.items():
+                if not value:
+                    continue
+                algorithm, value = algorithm.lower(), value.lower()
+                sha256 = value if algorithm == "sha256" else self._aliases.get(f"{algorithm}:{value}")
+                if sha256 and os.path.exists(self.blob_path(sha256)):
+                    return sha256
+        return None
+
+    def add(self, file_path: str, hashes: Optional[Dict[str, str]] = None) -> str:
+        """Guarda una copia de un archivo en el almacén y devuelve su sha256
+
+        Args:
+            file_path: Archivo a guardar
+            hashes: Hashes ya calculados (por ejemplo los de la descarga)
+        """
+        hashes = {algorithm.lower(): value.lower() for algorithm, value in (hashes or {}).items() if value}
+        if "sha256" not in hashes or "sha1" not in hashes:
+            hashes.update(hash_file(file_path, STORE_HASH_ALGORITHMS))
+        sha256 = hashes["sha256"]
+
+        blob_path = self.blob_path(sha256)
+        identity = None
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = unique_temp_path(blob_path)
+            try:
+                # Nunca un enlace duro: el archivo del usuario podría cambiar después
+                self._place(file_path, tmp_path, allow_hardlink=False)
+                os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                os.replace(tmp_path, blob_path)
+            except BaseException:
+                remove_quietly(tmp_path)
+                raise
+            # Los hashes corresponden a lo que se acaba de copiar: el blob queda verificado
+            identity = _blob_identity(blob_path)
+
+        with self._lock:
+            self._load()
+            changed = False
+            if identity:
+                self._verified[sha256] = identity
+                changed = True
+            for algorithm in ALIAS_ALGORITHMS:
+                key = f"{algorithm}:{hashes[algorithm]}" if algorithm in hashes else None
+                if key and self._aliases.get(key) != sha256:
+                    self._aliases[key] = sha256
+                    changed = True
+            if changed:
+                self._save()
+        return sha256
+
+    def deploy(self, sha256: str, target_path: str) -> str:
+        """Instala un archivo del almacén en ``target_path`` y devuelve cómo se hizo
+
+        El hash del blob solo se recalcula si su tamaño o mtime ya no son
+        los de la última comprobación. Un blob que no coincide con su hash
+        se elimina y se lanza ``ValueError`` en lugar de instalar un archivo
+        alterado.
+        """
+        self._verify(sha256)
+        blob_path = self.blob_path(sha256)
+        tmp_path = unique_temp_path(target_path)
+        try:
+            method = self._place(blob_path, tmp_path, allow_hardlink=self.use_hardlinks)
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            remove_quietly(tmp_path)
+            raise
+        return method
+
+    def _verify(self, sha256: str):
+        identity = _blob_identity(self.blob_path(sha256))
+        with self._lock:
+            self._load()
+            if self._verified.get(sha256) == identity:
+                return
+        if hash_file(self.blob_path(sha256), ("sha256",))["sha256"] != sha256:
+            self._remove_blob(sha256)
+            raise ValueError(f"Stored file {sha256[:12]} is corrupted and was removed from the jar store")
+        with self._lock:
+            self._verified[sha256] = identity
+            self._save()
+
+    def _place(self, source_path: str, target_path: str, allow_hardlink: bool) -> str:
+        if _reflink(source_path, target_path):
+            return DEPLOY_REFLINK
+        if allow_hardlink:
+            try:
+                os.link(source_path, target_path)
+                return DEPLOY_HARDLINK
+            except OSError:
+                pass
+        shutil.copyfile(source_path, target_path)
+        return DEPLOY_COPY
+
+    def _remove_blob(self, sha256: str):
+        try:
+            os.remove(self.blob_path(sha256))
+        except OSError:
+            pass
+        with self._lock:
+            self._load()
+            stale = [key for key, value in self._aliases.items() if value == sha256]
+            for key in stale:
+                del self._aliases[key]
+            if stale or self._verified.pop(sha256, None):
+                self._save()
+
+    def blob_hashes(self) -> Iterable[str]:
+        """sha256 de todos los blobs guardados"""
+        blobs_dir = os.path.join(self.directory, "blobs")
+        if not os.path.isdir(blobs_dir):
+            return
+        for bucket in os.listdir(blobs_dir):
+            bucket_path = os.path.join(blobs_dir, bucket)
+            if os.path.isdir(bucket_path):
+                for filename in os.listdir(bucket_path):
+                    if not filename.endswith(".tmp"):
+                        yield filename
+
+    def collect_garbage(self, referenced: Iterable[str], grace_seconds: float = GARBAGE_GRACE_SECONDS) -> int:
+        """Elimina los blobs cuyo sha256 no está en ``referenced``; devuelve cuántos
+
+        Los añadidos hace menos de ``grace_seconds`` se conservan.
+        """
+        referenced = set(referenced)
+        now = time.time()
+        removed = 0
+        for sha256 in list(self.blob_hashes()):
+            if sha256 in referenced:
+                continue
+            try:
+                if now - os.path.getmtime(self.blob_path(sha256)) < grace_seconds:
+                    continue
+            except OSError:
+                continue
+            self._remove_blob(sha256)
+            removed += 1
+        return removed
+
+
+_default_store: Optional[JarStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_jar_store() -> JarStore:
+    """Devuelve el almacén de JAR compartido por toda la aplicación"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = JarStore()
+        return _default_store
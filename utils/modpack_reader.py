@@ -0,0 +1,107 @@
+"""Lectura de modpacks de Modrinth (``.mrpack``) y CurseForge (zip con ``manifest.json``).
+
+Solo se conservan los archivos que necesita un servidor: en un ``.mrpack``
+se omiten los que declaran ``env.server: unsupported``; en un pack de
+CurseForge los archivos solo se conocen por id y se resuelven después con
+la API. Las carpetas ``overrides/`` (y ``server-overrides/`` en Modrinth)
+se copian sobre la carpeta del servidor.
+"""
+import json
+import os
+import re
+import shutil
+import zipfile
+from typing import Optional
+
+from models.modpack import Modpack, ModpackFile
+
+MODRINTH_INDEX = "modrinth.index.json"
+CURSEFORGE_MANIFEST = "manifest.json"
+
+# Claves de "dependencies" de un .mrpack que indican el loader
+_MRPACK_LOADERS = {"fabric-loader": "fabric", "quilt-loader": "quilt", "forge": "forge", "neoforge": "neoforge"}
+# https://cdn.modrinth.com/data/<project_id>/versions/<version_id>/<archivo>
+_MODRINTH_CDN_PROJECT = re.compile(r"/data/([A-Za-z0-9]+)/versions/")
+
+
+def safe_join(root: str, relative_path: str) -> str:
+    """Une ``relative_path`` a ``root`` rechazando rutas que salgan de él"""
+    normalized = os.path.normpath(relative_path.replace("\\", "/"))
+    if os.path.isabs(normalized) or normalized == ".." or normalized.startswith(".." + os.sep):
+        raise ValueError(f"Unsafe path in modpack: {relative_path}")
+    return os.path.join(root, normalized)
+
+
+def _read_mrpack(pack: zipfile.ZipFile) -> Modpack:
+    index = json.loads(pack.read(MODRINTH_INDEX).decode("utf-8"))
+    dependencies = index.get("dependencies") or {}
+    loader_key = next((key for key in _MRPACK_LOADERS if key in dependencies), None)
+    modpack = Modpack(
+        index.get("name", "Modpack"), index.get("versionId", ""), "Modrinth", dependencies.get("minecraft"),
+        _MRPACK_LOADERS.get(loader_key), dependencies.get(loader_key) if loader_key else None,
+    )
+    for entry in index.get("files", []):
+        path = entry.get("path", "")
+        if (entry.get("env") or {}).get("server") == "unsupported":
+            modpack.client_only_files.append(path)
+            continue
+        urls = entry.get("downloads") or []
+        project = next((project_id for project_id in map(project_id_from_url, urls) if project_id), None)
+        modpack.files.append(ModpackFile(path, urls, entry.get("hashes"), entry.get("fileSize"), project))
+    modpack.override_dirs = ["overrides", "server-overrides"]
+    return modpack
+
+
+def _read_curseforge(pack: zipfile.ZipFile) -> Modpack:
+    manifest = json.loads(pack.read(CURSEFORGE_MANIFEST).decode("utf-8"))
+    if manifest.get("manifestType") != "minecraftModpack":
+        raise ValueError("manifest.json is not a CurseForge modpack manifest")
+    minecraft = manifest.get("minecraft") or {}
+    loaders = minecraft.get("modLoaders") or []
+    primary = next((item for item in loaders if item.get("primary")), loaders[0] if loaders else {})
+    loader, _, loader_version = str(primary.get("id", "")).partition("-")
+    modpack = Modpack(
+        manifest.get("name", "Modpack"), manifest.get("version", ""), "CurseForge",
+        minecraft.get("version"), loader or None, loader_version or None,
+    )
+    for entry in manifest.get("files", []):
+        if entry.get("required", True) and entry.get("fileID"):
+            modpack.files.append(ModpackFile("", project_id=str(entry.get("projectID")), file_id=int(entry["fileID"])))
+    modpack.override_dirs = [manifest.get("overrides") or "overrides"]
+    return modpack
+
+
+def read_modpack(pack_path: str) -> Modpack:
+    """Lee el índice de un modpack; lanza ``ValueError`` si el archivo no es uno"""
+    try:
+        with zipfile.ZipFile(pack_path, "r") as pack:
+            names = set(pack.namelist())
+            if MODRINTH_INDEX in names:
+                return _read_mrpack(pack)
+            if CURSEFORGE_MANIFEST in names:
+                return _read_curseforge(pack)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"{os.path.basename(pack_path)} is not a valid zip file") from e
+    raise ValueError(f"{os.path.basename(pack_path)} is not a Modrinth or CurseForge modpack")
+
+
+def extract_overrides(pack_path: str, modpack: Modpack, server_path: str) -> int:
+    """Copia las carpetas de overrides del pack en el servidor y devuelve cuántos archivos escribió"""
+    written = 0
+    with zipfile.ZipFile(pack_path, "r") as pack:
+        for override_dir in modpack.override_dirs:
+            prefix = override_dir.rstrip("/") + "/"
+            for info in pack.infolist():
+                if not info.filename.startswith(prefix) or info.is_dir():
+                    continue
+                target_path = safe_join(server_path, info.filename[len(prefix):])
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                with pack.open(info) as source, open(target_path, "wb") as target:
+                    shutil.copyfileobj(source, target)
+                written += 1
+    return written
+
+
+def project_id_from_url(url: str) -> Optional[str]:
+    match = _MODRINTH_CDN_PROJECT.search(url or "")
+    return match.group(1) if match else None
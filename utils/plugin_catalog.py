@@ -0,0 +1,345 @@
+"""Catálogo local de proyectos para buscar sin conexión.
+
+Guarda en SQLite los metadatos de los proyectos de Modrinth, Spigot y
+CurseForge (nombre, slug, descripción, categorías, última versión, icono...)
+con un índice FTS5 de trigramas, de modo que una búsqueda local tarda unos
+milisegundos y tolera erratas: se buscan los proyectos que comparten algún
+trigrama con la consulta y se ordenan por parecido y descargas. Si la
+versión de SQLite no tiene FTS5 con trigramas se recurre a ``LIKE``.
+
+El catálogo se llena con cada búsqueda online, con una sincronización
+incremental en segundo plano y con instantáneas importadas (JSON, opcionalmente
+comprimido con gzip) para equipos sin acceso a internet.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional
+
+from models.plugin import Plugin
+from utils.constants import CACHE_DIR
+from utils.file_utils import atomic_write
+
+CATALOG_FILE = os.path.join(CACHE_DIR, "catalog.sqlite3")
+SNAPSHOT_VERSION = 1
+
+# Candidatos que devuelve el índice antes de ordenarlos por parecido
+MAX_CANDIDATES = 500
+# Parecido mínimo con el nombre o slug (salvo que la consulta aparezca en la descripción)
+MIN_SIMILARITY = 0.5
+
+PROJECT_FIELDS = (
+    "source", "project_id", "name", "slug", "description", "project_type", "categories",
+    "latest_version", "icon_url", "author", "downloads", "client_only", "updated_at",
+)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def trigrams(text: str) -> set:
+    """Trigramas de un texto normalizado (minúsculas, solo letras y números)"""
+    grams = set()
+    for word in _NON_ALNUM.sub(" ", (text or "").lower()).split():
+        grams.update(word[i:i + 3] for i in range(max(1, len(word) - 2)))
+    return grams
+
+
+class PluginCatalog:
+    def __init__(self, db_path: str = CATALOG_FILE):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self.has_fts = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if os.path.dirname(self.db_path):
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._create_schema(connection)
+            self._connection = connection
+        return self._connection
+
+    def _create_schema(self, connection: sqlite3.Connection):
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS projects (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                project_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                slug TEXT NOT NULL DEFAULT '',
+                description TEXT NOT NULL DEFAULT '',
+                project_type TEXT NOT NULL DEFAULT 'plugin',
+                categories TEXT NOT NULL DEFAULT '',
+                latest_version TEXT NOT NULL DEFAULT '',
+                icon_url TEXT NOT NULL DEFAULT '',
+                author TEXT NOT NULL DEFAULT '',
+                downloads INTEGER NOT NULL DEFAULT 0,
+                client_only INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL DEFAULT 0,
+                UNIQUE (source, project_id)
+            );
+            CREATE TABLE IF NOT EXISTS sync_state (
+                source TEXT PRIMARY KEY,
+                synced_at REAL NOT NULL,
+                cursor REAL NOT NULL DEFAULT 0
+            );
+        """)
+        try:
+            connection.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+                    name, slug, description, categories,
+                    content='projects', content_rowid='id', tokenize='trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS projects_ai AFTER INSERT ON projects BEGIN
+                    INSERT INTO projects_fts(rowid, name, slug, description, categories)
+                    VALUES (new.id, new.name, new.slug, new.description, new.categories);
+                END;
+                CREATE TRIGGER IF NOT EXISTS projects_ad AFTER DELETE ON projects BEGIN
+                    INSERT INTO projects_fts(projects_fts, rowid, name, slug, description, categories)
+                    VALUES ('delete', old.id, old.name, old.slug, old.description, old.categories);
+                END;
+                CREATE TRIGGER IF NOT EXISTS projects_au AFTER UPDATE ON projects BEGIN
+                    INSERT INTO projects_fts(projects_fts, rowid, name, slug, description, categories)
+                    VALUES ('delete', old.id, old.name, old.slug, old.description, old.categories);
+                    INSERT INTO projects_fts(rowid, name, slug, description, categories)
+                    VALUES (new.id, new.name, new.slug, new.description, new.categories);
+                END;
+            """)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logging.warning("SQLite without FTS5 trigram support, catalog search uses LIKE: %s", e)
+            self.has_fts = False
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    # Escritura
+
+    def add_projects(self, projects: Iterable[Dict]) -> int:
+        """Inserta o actualiza proyectos (diccionarios con ``PROJECT_FIELDS``)
+
+        Los campos vacíos no sobrescriben lo que ya se sabía: una búsqueda
+        online no trae categorías pero no debe borrar las de una sincronización.
+        """
+        rows = []
+        for project in projects:
+            if not project.get("source") or not project.get("project_id") or not project.get("name"):
+                continue
+            categories = project.get("categories") or ""
+            if not isinstance(categories, str):
+                categories = " ".join(categories)
+            rows.append((
+                project["source"], str(project["project_id"]), project["name"], project.get("slug") or "",
+                project.get("description") or "", project.get("project_type") or "plugin", categories,
+                project.get("latest_version") or "", project.get("icon_url") or "", project.get("author") or "",
+                int(project.get("downloads") or 0), int(bool(project.get("client_only"))),
+                float(project.get("updated_at") or 0),
+            ))
+        if not rows:
+            return 0
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(f"""
+                    INSERT INTO projects ({", ".join(PROJECT_FIELDS)})
+                    VALUES ({", ".join("?" for _ in PROJECT_FIELDS)})
+                    ON CONFLICT (source, project_id) DO UPDATE SET
+                        name = excluded.name,
+                        slug = COALESCE(NULLIF(excluded.slug, ''), slug),
+                        description = COALESCE(NULLIF(excluded.description, ''), description),
+                        project_type = excluded.project_type,
+                        categories = COALESCE(NULLIF(excluded.categories, ''), categories),
+                        latest_version = COALESCE(NULLIF(excluded.latest_version, ''), latest_version),
+                        icon_url = COALESCE(NULLIF(excluded.icon_url, ''), icon_url),
+                        author = COALESCE(NULLIF(excluded.author, ''), author),
+                        downloads = MAX(excluded.downloads, downloads),
+                        client_only = excluded.client_only,
+                        updated_at = MAX(excluded.updated_at, updated_at)
+                """, rows)
+        return len(rows)
+
+    def add_plugins(self, plugins: Iterable[Plugin]) -> int:
+        """Guarda resultados de una búsqueda online"""
+        return self.add_projects(plugin_to_project(plugin) for plugin in plugins)
+
+    # Consulta
+
+    def count(self, source: Optional[str] = None) -> int:
+        with self._lock:
+            connection = self._connect()
+            if source:
+                return connection.execute("SELECT COUNT(*) FROM projects WHERE source = ?", (source,)).fetchone()[0]
+            return connection.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def search(self, query: str, search_type: str = "", source: Optional[str] = None,
+               limit: int = 20, offset: int = 0) -> List[Plugin]:
+        """Busca proyectos en el catálogo, de más a menos parecidos a la consulta"""
+        filters = []
+        params: List = []
+        if search_type in ("plugin", "mod"):
+            filters.append("p.project_type = ?")
+            params.append(search_type)
+        if source:
+            filters.append("p.source = ?")
+            params.append(source)
+
+        query_grams = trigrams(query)
+        with self._lock:
+            connection = self._connect()
+            if not query.strip():
+                where = f"WHERE {' AND '.join(filters)}" if filters else ""
+                rows = connection.execute(
+                    f"SELECT p.* FROM projects p {where} ORDER BY p.downloads DESC LIMIT ? OFFSET ?",
+                    params + [limit, offset],
+                ).fetchall()
+                return [row_to_plugin(row) for row in rows]
+            if self.has_fts and any(len(gram) == 3 for gram in query_grams):
+                match = " OR ".join(f'"{gram}"' for gram in sorted(query_grams) if len(gram) == 3)
+                where = " AND ".join(["projects_fts MATCH ?"] + filters)
+                rows = connection.execute(
+                    f"""SELECT p.* FROM projects_fts JOIN projects p ON p.id = projects_fts.rowid
+                        WHERE {where} ORDER BY bm25(projects_fts, 10.0, 10.0, 1.0, 2.0) LIMIT ?""",
+                    [match] + params + [MAX_CANDIDATES],
+                ).fetchall()
+            else:
+                pattern = f"%{query.strip().lower()}%"
+                where = " AND ".join(["(lower(p.name) LIKE ? OR lower(p.slug) LIKE ? OR lower(p.description) LIKE ?)"]
+                                     + filters)
+                rows = connection.execute(
+                    f"SELECT p.* FROM projects p WHERE {where} ORDER BY p.downloads DESC LIMIT ?",
+                    [pattern, pattern, pattern] + params + [MAX_CANDIDATES],
+                ).fetchall()
+
+        needle = query.strip().lower()
+        scored = []
+        for row in rows:
+            similarity = 1.0
+            if query_grams:
+                # Trigramas compartidos para consultas parciales y parecido de la cadena para erratas
+                similarity = max(
+                    len(query_grams & trigrams(f"{row['name']} {row['slug']}")) / len(query_grams),
+                    SequenceMatcher(None, needle, row["name"].lower()).ratio(),
+                )
+            if similarity < MIN_SIMILARITY and needle not in row["description"].lower():
+                continue
+            # Los nombres que contienen la consulta tal cual van primero
+            exact = needle in row["name"].lower() or needle in row["slug"].lower()
+            scored.append((not exact, -round(similarity, 1), -row["downloads"], row))
+        scored.sort(key=lambda item: item[:3])
+        return [row_to_plugin(item[3]) for item in scored[offset:offset + limit]]
+
+    # Sincronización
+
+    def sync_state(self, source: str) -> Dict[str, float]:
+        """Momento de la última sincronización de una fuente y su cursor (fecha del último cambio visto)"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT synced_at, cursor FROM sync_state WHERE source = ?", (source,)
+            ).fetchone()
+        return {"synced_at": row["synced_at"], "cursor": row["cursor"]} if row else {"synced_at": 0.0, "cursor": 0.0}
+
+    def set_sync_state(self, source: str, cursor: float, synced_at: Optional[float] = None):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO sync_state (source, synced_at, cursor) VALUES (?, ?, ?)",
+                    (source, synced_at or time.time(), cursor),
+                )
+
+    # Instantáneas
+
+    def export_snapshot(self, file_path: str) -> int:
+        """Escribe todo el catálogo en un archivo JSON (gzip si termina en .gz)"""
+        with self._lock:
+            rows = self._connect().execute(f"SELECT {', '.join(PROJECT_FIELDS)} FROM projects").fetchall()
+        data = {"version": SNAPSHOT_VERSION, "exported_at": time.time(), "projects": [dict(row) for row in rows]}
+        content = json.dumps(data).encode("utf-8")
+        atomic_write(file_path, gzip.compress(content) if file_path.endswith(".gz") else content)
+        return len(rows)
+
+    def import_snapshot(self, file_path: str) -> int:
+        """Añade al catálogo los proyectos de una instantánea; lanza ``ValueError`` si no es válida"""
+        opener = gzip.open if file_path.endswith(".gz") else open
+        try:
+            with opener(file_path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Could not read catalog snapshot: {e}") from e
+        if not isinstance(data, dict) or not isinstance(data.get("projects"), list):
+            raise ValueError("Not a catalog snapshot")
+        if data.get("version", SNAPSHOT_VERSION) > SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported catalog snapshot version {data.get('version')}")
+        return self.add_projects(project for project in data["projects"] if isinstance(project, dict))
+
+
+def parse_timestamp(value) -> float:
+    """Convierte fechas ISO 8601 (Modrinth, CurseForge) o epoch en segundos o milisegundos (Spiget)"""
+    if isinstance(value, (int, float)):
+        return value / 1000.0 if value > 1e11 else float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def plugin_to_project(plugin: Plugin) -> Dict:
+    return {
+        "source": plugin.source,
+        "project_id": plugin.project_id,
+        "name": plugin.name,
+        "slug": plugin.slug,
+        "description": plugin.description,
+        "project_type": plugin.project_type,
+        "latest_version": plugin.version if plugin.version not in ("Latest", "Unknown") else "",
+        "icon_url": plugin.icon_url,
+        "author": plugin.author,
+        "downloads": plugin.downloads,
+        "client_only": plugin.client_only,
+    }
+
+
+def row_to_plugin(row) -> Plugin:
+    source = row["source"]
+    plugin = Plugin(
+        name=row["name"],
+        source=source,
+        version=row["latest_version"] or "Latest",
+        description=row["description"],
+        install_method=source if source != "Modrinth" else "Manual",
+    )
+    plugin.project_id = row["project_id"]
+    plugin.project_type = sys.intern(row["project_type"])
+    plugin.icon_url = row["icon_url"]
+    plugin.slug = row["slug"]
+    plugin.author = row["author"]
+    plugin.downloads = row["downloads"]
+    plugin.client_only = bool(row["client_only"])
+    return plugin
+
+
+_default_catalog: Optional[PluginCatalog] = None
+_default_catalog_lock = threading.Lock()
+
+
+def get_plugin_catalog() -> PluginCatalog:
+    """Devuelve el catálogo local compartido por toda la aplicación"""
+    global _default_catalog
+    with _default_catalog_lock:
+        if _default_catalog is None:
+            _default_catalog = PluginCatalog()
+        return _default_catalog
@@ -0,0 +1,121 @@
+"""Metadatos de instalación de plugins (``.plugin_metadata.json``) en memoria.
+
+Cada servidor tiene un único ``PluginMetadataStore`` que lee el archivo una
+vez y mantiene las entradas en memoria protegidas por un lock, de modo que
+varias descargas simultáneas no se pisan los cambios. Las escrituras se
+agrupan: tras un cambio se espera ``SAVE_DELAY_SECONDS`` y se guarda una
+sola instantánea de forma atómica (archivo temporal + ``os.replace``). Al
+salir de la aplicación se escriben los cambios pendientes.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+from utils.file_utils import atomic_write
+
+PLUGIN_METADATA_FILE = ".plugin_metadata.json"
+SAVE_DELAY_SECONDS = 0.5
+
+
+class PluginMetadataStore:
+    def __init__(self, file_path: str, save_delay: float = SAVE_DELAY_SECONDS):
+        self.file_path = file_path
+        self.save_delay = save_delay
+        self._lock = threading.RLock()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._dirty = False
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        try:
+            with open(self.file_path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.error("Error loading plugin metadata %s: %s", self.file_path, e)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copia de todas las entradas"""
+        with self._lock:
+            self._load()
+            return copy.deepcopy(self._entries)
+
+    def get(self, plugin_name: str) -> Optional[Dict]:
+        with self._lock:
+            self._load()
+            entry = self._entries.get(plugin_name)
+            return dict(entry) if isinstance(entry, dict) else None
+
+    def set(self, plugin_name: str, entry: Dict):
+        self.modify(lambda entries: entries.__setitem__(plugin_name, dict(entry)))
+
+    def remove(self, plugin_name: str) -> Optional[Dict]:
+        removed = []
+        self.modify(lambda entries: removed.append(entries.pop(plugin_name, None)))
+        return removed[0]
+
+    def modify(self, change: Callable[[Dict[str, Dict]], None]):
+        """Aplica ``change`` a las entradas bajo el lock y programa el guardado
+
+        Permite hacer varios cambios relacionados de forma atómica (por
+        ejemplo renombrar una entrada al actualizar un plugin).
+        """
+        with self._lock:
+            self._load()
+            change(self._entries)
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> bool:
+        """Escribe ahora los cambios pendientes"""
+        # El archivo es pequeño: se escribe con el lock tomado para que una
+        # instantánea antigua nunca sobrescriba a otra más reciente
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return True
+            try:
+                atomic_write(self.file_path, json.dumps(self._entries, indent=4))
+            except OSError as e:
+                logging.error("Error saving plugin metadata %s: %s", self.file_path, e)
+                return False
+            self._dirty = False
+            return True
+
+
+_stores: Dict[str, PluginMetadataStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_plugin_metadata_store(server_path: str) -> PluginMetadataStore:
+    """Devuelve el almacén de metadatos de un servidor (uno por carpeta)"""
+    file_path = os.path.join(os.path.abspath(server_path), PLUGIN_METADATA_FILE)
+    with _stores_lock:
+        store = _stores.get(file_path)
+        if store is None:
+            store = _stores[file_path] = PluginMetadataStore(file_path)
+        return store
+
+
+@atexit.register
+def flush_all_plugin_metadata():
+    """Guarda los cambios pendientes de todos los servidores"""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
@@ -0,0 +1,198 @@
+"""Utilidades para combinar resultados de búsqueda de varias fuentes.
+
+Un mismo proyecto suele publicarse en Modrinth, Spigot y CurseForge. Los
+resultados se agrupan por slug o nombre normalizado (y por autor cuando
+ambas fuentes lo indican) y se ordenan con *reciprocal rank fusion*: cada
+fuente aporta ``1 / (RRF_K + posición)``, de modo que un proyecto bien
+situado en varias fuentes sube en la lista combinada.
+"""
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.plugin import Plugin
+
+RRF_K = 60
+
+# Resultados pedidos a cada fuente por página
+SEARCH_PAGE_SIZE = 20
+
+SEARCH_CACHE_SIZE = 64
+SEARCH_CACHE_TTL_SECONDS = 300
+
+# Fuente preferida cuando un proyecto aparece en varias (se instala desde ella)
+SOURCE_PREFERENCE = ("Modrinth", "CurseForge", "Spigot")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+# Sufijos habituales que no distinguen proyectos ("EssentialsX Plugin", "Foo [1.20]")
+_NOISE = re.compile(r"\[[^\]]*\]|\([^)]*\)|\b(plugin|mod|spigot|paper|bukkit|fabric|forge)\b")
+
+
+def normalize_name(value: Optional[str]) -> str:
+    """Normaliza un nombre o slug para compararlo entre fuentes"""
+    value = (value or "").lower()
+    stripped = _NOISE.sub(" ", value)
+    normalized = _NON_ALNUM.sub("", stripped)
+    # Si el nombre solo contenía palabras genéricas se conserva el original
+    return normalized or _NON_ALNUM.sub("", value)
+
+
+def _keys(plugin: Plugin) -> List[str]:
+    keys = []
+    for value in (plugin.slug, plugin.name):
+        key = normalize_name(value)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def _same_author(a: Plugin, b: Plugin) -> bool:
+    """Los autores solo se comparan si ambas fuentes los conocen"""
+    author_a = normalize_name(a.author)
+    author_b = normalize_name(b.author)
+    return not author_a or not author_b or author_a == author_b
+
+
+def _source_order(source: str) -> int:
+    return SOURCE_PREFERENCE.index(source) if source in SOURCE_PREFERENCE else len(SOURCE_PREFERENCE)
+
+
+def _group_results(results_by_source: Dict[str, Sequence[Plugin]], groups: List[Dict]) -> List[Dict]:
+    """Añade los resultados a ``groups`` agrupando duplicados; devuelve los grupos nuevos"""
+    index: Dict[str, List[Dict]] = {}
+    for group in groups:
+        for key in _keys(group["plugin"]):
+            index.setdefault(key, []).append(group)
+
+    new_groups: List[Dict] = []
+    for source in sorted(results_by_source, key=_source_order):
+        for rank, plugin in enumerate(results_by_source[source]):
+            keys = _keys(plugin)
+            group = None
+            for key in keys:
+                group = next(
+                    (g for g in index.get(key, ())
+                     if source not in g["sources"] and _same_author(g["plugin"], plugin)),
+                    None,
+                )
+                if group:
+                    break
+
+            score = 1.0 / (RRF_K + rank + 1)
+            if group is None:
+                # Se trabaja sobre una copia: el original puede seguir en la caché de búsquedas
+                group = {"plugin": copy.copy(plugin), "sources": [source], "score": score,
+                         "downloads": plugin.downloads or 0}
+                groups.append(group)
+                new_groups.append(group)
+            else:
+                group["sources"].append(source)
+                group["score"] += score
+                group["downloads"] += plugin.downloads or 0
+                if not group["plugin"].author and plugin.author:
+                    group["plugin"].author = plugin.author
+            group["plugin"].also_on = group["sources"][1:]
+            for key in keys:
+                bucket = index.setdefault(key, [])
+                if group not in bucket:
+                    bucket.append(group)
+    return new_groups
+
+
+def _ranked(groups: List[Dict]) -> List[Plugin]:
+    groups.sort(key=lambda g: (-g["score"], -g["downloads"]))
+    return [group["plugin"] for group in groups]
+
+
+def merge_search_results(results_by_source: Dict[str, Sequence[Plugin]]) -> List[Plugin]:
+    """Combina, deduplica y ordena los resultados de varias fuentes.
+
+    Cada resultado combinado es una copia del ``Plugin`` de la fuente
+    preferida e incluye ``also_on`` con las demás fuentes en las que se
+    encontró; los originales no se modifican.
+    """
+    return _ranked(_group_results(results_by_source, []))
+
+
+def append_search_results(shown: Sequence[Plugin], results_by_source: Dict[str, Sequence[Plugin]]) -> List[Plugin]:
+    """Devuelve los resultados de una página nueva que no están ya en ``shown``.
+
+    Los duplicados de proyectos ya mostrados solo actualizan su ``also_on``;
+    el resto se devuelve ordenado para añadirlo al final de la lista.
+    """
+    groups = [
+        {"plugin": plugin, "sources": [plugin.source] + list(plugin.also_on),
+         "score": 0.0, "downloads": 0}
+        for plugin in shown
+    ]
+    return _ranked(_group_results(results_by_source, groups))
+
+
+def matches_query(plugin: Plugin, query: str) -> bool:
+    """Indica si el nombre o slug del plugin contiene la consulta"""
+    needle = _NON_ALNUM.sub("", query.lower())
+    if not needle:
+        return True
+    return any(needle in _NON_ALNUM.sub("", (value or "").lower())
+               for value in (plugin.name, plugin.slug))
+
+
+class SearchResultCache:
+    """Caché LRU en memoria de resultados por (fuente, tipo, consulta).
+
+    Permite volver al instante a una consulta ya hecha (por ejemplo al
+    borrar caracteres) y ofrecer resultados provisionales filtrando los de
+    la consulta más larga que sea prefijo de la nueva.
+    """
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_SIZE, ttl: float = SEARCH_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, List[Plugin]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(source: str, search_type: str, query: str) -> Tuple[str, str, str]:
+        return source, search_type or "", " ".join(query.lower().split())
+
+    def get(self, source: str, search_type: str, query: str) -> Optional[List[Plugin]]:
+        key = self._key(source, search_type, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return list(entry[1])
+
+    def put(self, source: str, search_type: str, query: str, plugins: List[Plugin]):
+        key = self._key(source, search_type, query)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(plugins))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_prefix(self, source: str, search_type: str, query: str) -> Optional[List[Plugin]]:
+        """Resultados provisionales a partir de la consulta prefijo más larga"""
+        source, search_type, query = self._key(source, search_type, query)
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                (key[2], plugins) for key, (stored_at, plugins) in self._entries.items()
+                if key[0] == source and key[1] == search_type and key[2]
+                and query.startswith(key[2]) and now - stored_at <= self.ttl
+            ]
+        if not candidates:
+            return None
+        _, plugins = max(candidates, key=lambda candidate: len(candidate[0]))
+        return [plugin for plugin in plugins if matches_query(plugin, query)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
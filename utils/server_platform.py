@@ -0,0 +1,196 @@
+"""Detección de la versión de Minecraft y la plataforma de un servidor.
+
+Se usa para pedir a Modrinth y CurseForge solo versiones compatibles
+(filtros ``game_versions``/``loaders`` y ``gameVersion``/``modLoaderType``).
+La información se obtiene, por orden, de ``version_history.json`` (Paper),
+del nombre del JAR del servidor, de su ``version.json`` interno y de las
+carpetas que crean los instaladores (``libraries/``, ``versions/``).
+"""
+import json
+import os
+import re
+import zipfile
+from typing import List, Optional, Tuple
+
+# Loaders de Modrinth aceptados por cada plataforma (el primero es el propio)
+MODRINTH_LOADERS = {
+    "paper": ("paper", "spigot", "bukkit"),
+    "purpur": ("purpur", "paper", "spigot", "bukkit"),
+    "folia": ("folia",),
+    "spigot": ("spigot", "bukkit"),
+    "bukkit": ("bukkit",),
+    "fabric": ("fabric",),
+    "quilt": ("quilt", "fabric"),
+    "forge": ("forge",),
+    "neoforge": ("neoforge",),
+}
+
+PLUGIN_PLATFORMS = ("paper", "purpur", "folia", "spigot", "bukkit")
+MOD_PLATFORMS = ("fabric", "quilt", "forge", "neoforge")
+
+# Valores de modLoaderType de la API de CurseForge
+CURSEFORGE_MOD_LOADER_TYPES = {"forge": 1, "fabric": 4, "quilt": 5, "neoforge": 6}
+
+_MC_VERSION = r"1\.\d+(?:\.\d+)?"
+
+# Patrones de nombre de JAR: (expresión, plataforma)
+_JAR_PATTERNS: List[Tuple[str, str]] = [
+    (rf"^paper-({_MC_VERSION})", "paper"),
+    (rf"^purpur-({_MC_VERSION})", "purpur"),
+    (rf"^folia-({_MC_VERSION})", "folia"),
+    (rf"^spigot-({_MC_VERSION})", "spigot"),
+    (rf"^(?:craft)?bukkit-({_MC_VERSION})", "bukkit"),
+    (rf"^fabric-server-mc\.({_MC_VERSION})", "fabric"),
+    (r"^fabric-server-launch", "fabric"),
+    (r"^quilt-server-launch", "quilt"),
+    (rf"^neoforge-({_MC_VERSION})?", "neoforge"),
+    (rf"^forge-({_MC_VERSION})", "forge"),
+    (rf"^minecraft_server\.({_MC_VERSION})", "vanilla"),
+]
+
+
+class ServerPlatform:
+    """Versión de Minecraft y plataforma detectadas (ambas pueden ser desconocidas)"""
+
+    def __init__(self, minecraft_version: Optional[str] = None, platform: Optional[str] = None):
+        self.minecraft_version = minecraft_version
+        self.platform = platform
+
+    def is_plugin_platform(self) -> bool:
+        return self.platform in PLUGIN_PLATFORMS
+
+    def is_mod_platform(self) -> bool:
+        return self.platform in MOD_PLATFORMS
+
+    def modrinth_loaders(self) -> List[str]:
+        return list(MODRINTH_LOADERS.get(self.platform, ()))
+
+    def game_versions(self) -> List[str]:
+        return [self.minecraft_version] if self.minecraft_version else []
+
+    def curseforge_mod_loader_type(self) -> Optional[int]:
+        return CURSEFORGE_MOD_LOADER_TYPES.get(self.platform)
+
+    def describe(self) -> str:
+        parts = [self.platform.capitalize() if self.platform else "Unknown platform"]
+        if self.minecraft_version:
+            parts.append(self.minecraft_version)
+        return " ".join(parts)
+
+    def __str__(self) -> str:
+        return f"ServerPlatform(platform='{self.platform}', minecraft_version='{self.minecraft_version}')"
+
+
+def _from_jar_name(jar_name: str) -> Tuple[Optional[str], Optional[str]]:
+    lower = os.path.basename(jar_name).lower()
+    for pattern, platform in _JAR_PATTERNS:
+        match = re.match(pattern, lower)
+        if match:
+            version = match.group(1) if match.groups() else None
+            return version, platform
+    return None, None
+
+
+def _from_jar_contents(jar_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Lee ``version.json`` (servidores vanilla y Paperclip) y marcas de plataforma"""
+    version = platform = None
+    try:
+        with zipfile.ZipFile(jar_path, "r") as jar:
+            names = set(jar.namelist())
+            if "version.json" in names:
+                data = json.loads(jar.read("version.json").decode("utf-8", errors="ignore"))
+                version = data.get("id") or data.get("name")
+            if "io/papermc/paperclip/Main.class" in names or "io/papermc/paperclip/Paperclip.class" in names:
+                platform = "paper"
+            elif "net/fabricmc/loader/launch/server/FabricServerLauncher.class" in names:
+                platform = "fabric"
+    except (OSError, ValueError, zipfile.BadZipFile):
+        pass
+    if version and not re.fullmatch(_MC_VERSION, str(version)):
+        version = None
+    return version, platform
+
+
+def _from_paper_history(server_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Paper y derivados guardan ``"currentVersion": "git-Paper-496 (MC: 1.20.4)"``"""
+    try:
+        with open(os.path.join(server_path, "version_history.json"), "r") as f:
+            current = json.load(f).get("currentVersion", "")
+    except (OSError, ValueError, AttributeError):
+        return None, None
+    version = re.search(rf"MC: ({_MC_VERSION})", current)
+    platform = re.match(r"git-([A-Za-z]+)-", current)
+    platform = platform.group(1).lower() if platform else None
+    return (version.group(1) if version else None), (platform if platform in MODRINTH_LOADERS else None)
+
+
+def _from_folders(server_path: str) -> Tuple[Optional[str], Optional[str]]:
+    libraries = os.path.join(server_path, "libraries")
+    forge_dir = os.path.join(libraries, "net", "minecraftforge", "forge")
+    neoforge_dir = os.path.join(libraries, "net", "neoforged", "neoforge")
+    if os.path.isdir(neoforge_dir):
+        # Las versiones de NeoForge siguen a Minecraft: 20.4.x -> 1.20.4
+        for entry in sorted(os.listdir(neoforge_dir), reverse=True):
+            match = re.match(r"^(\d+)\.(\d+)\.", entry)
+            if match:
+                minor = match.group(2)
+                return f"1.{match.group(1)}" + (f".{minor}" if minor != "0" else ""), "neoforge"
+        return None, "neoforge"
+    if os.path.isdir(forge_dir):
+        for entry in sorted(os.listdir(forge_dir), reverse=True):
+            match = re.match(rf"^({_MC_VERSION})-", entry)
+            if match:
+                return match.group(1), "forge"
+        return None, "forge"
+    if os.path.isdir(os.path.join(server_path, ".fabric")) or os.path.exists(
+        os.path.join(server_path, "fabric-server-launcher.properties")
+    ):
+        return None, "fabric"
+
+    version = None
+    versions_dir = os.path.join(server_path, "versions")
+    if os.path.isdir(versions_dir):
+        candidates = [entry for entry in os.listdir(versions_dir) if re.fullmatch(_MC_VERSION, entry)]
+        if candidates:
+            version = max(candidates, key=lambda v: [int(part) for part in v.split(".")])
+    return version, None
+
+
+def detect_server_platform(server_path: str, jar_name: Optional[str] = None) -> ServerPlatform:
+    """Detecta la versión de Minecraft y la plataforma de un servidor
+
+    Args:
+        server_path: Carpeta del servidor
+        jar_name: JAR del servidor; si no se indica se revisan los JAR de la carpeta
+    """
+    version, platform = _from_paper_history(server_path)
+
+    if jar_name:
+        jars = [jar_name]
+    elif os.path.isdir(server_path):
+        jars = sorted(name for name in os.listdir(server_path) if name.lower().endswith(".jar"))
+    else:
+        jars = []
+
+    for jar in jars:
+        jar_version, jar_platform = _from_jar_name(jar)
+        if jar_version is None or jar_platform is None:
+            content_version, content_platform = _from_jar_contents(os.path.join(server_path, jar))
+            jar_version = jar_version or content_version
+            jar_platform = jar_platform or content_platform
+        version = version or jar_version
+        platform = platform or jar_platform
+        if version and platform:
+            break
+
+    if not (version and platform):
+        folder_version, folder_platform = _from_folders(server_path)
+        version = version or folder_version
+        platform = platform or folder_platform
+
+    if platform == "vanilla":
+        platform = None
+    if not platform and os.path.isdir(os.path.join(server_path, "plugins")):
+        # Sin pistas del JAR: una carpeta de plugins indica un servidor Bukkit
+        platform = "paper"
+    return ServerPlatform(version, platform)
@@ -0,0 +1,196 @@
+"""Perfil de arranque por plugin a partir de la salida del servidor.
+
+Bukkit/Spigot/Paper escriben una línea ``Loading <plugin> v<versión>`` al
+cargar cada plugin y otra ``Enabling <plugin> v<versión>`` al activarlo.
+La duración de cada fase es el tiempo hasta el siguiente evento (otro
+plugin, ``Preparing level``, ``Done (...)``...). La salida en directo usa la
+hora de llegada de cada línea; ``logs/latest.log`` solo tiene resolución de
+segundos salvo que el servidor registre milisegundos.
+"""
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+from utils.file_utils import atomic_write
+
+STARTUP_HISTORY_FILE = ".startup_profile.json"
+MAX_STARTUP_HISTORY = 20
+
+_TIMESTAMP_RE = re.compile(r"^\[(\d{2}):(\d{2}):(\d{2})(?:[.,](\d{1,3}))?")
+_PLUGIN_EVENT_RE = re.compile(
+    r"\]:\s+(?:\[[^\]]+\]\s+)?(Loading|Enabling)\s+(?:server plugin\s+)?(.+?)\s+v(\S+)\s*$"
+)
+# Líneas del servidor que cierran la fase del último plugin
+_BOUNDARY_RE = re.compile(r"\]:\s+(?:Preparing level|Preparing start region|Done \(|Disabling |Stopping server)")
+_DONE_RE = re.compile(r"\]:\s+Done \((\d+(?:\.\d+)?)s\)!")
+
+
+class PluginTiming:
+    """Tiempos de carga y activación de un plugin en un arranque"""
+
+    def __init__(self, name: str, version: str = "", load_seconds: float = 0.0, enable_seconds: float = 0.0):
+        self.name = name
+        self.version = version
+        self.load_seconds = load_seconds
+        self.enable_seconds = enable_seconds
+
+    @property
+    def total_seconds(self) -> float:
+        return self.load_seconds + self.enable_seconds
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "version": self.version,
+                "load": round(self.load_seconds, 3), "enable": round(self.enable_seconds, 3)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PluginTiming":
+        return cls(data.get("name", ""), data.get("version", ""),
+                   float(data.get("load", 0.0)), float(data.get("enable", 0.0)))
+
+
+class StartupProfile:
+    """Resultado de analizar un arranque del servidor"""
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.time()
+        self.timings: Dict[str, PluginTiming] = {}
+        self.total_seconds: Optional[float] = None  # Valor de "Done (X.XXXs)!"
+        self.complete = False
+
+    def ranked(self) -> List[PluginTiming]:
+        """Plugins ordenados del más lento al más rápido"""
+        return sorted(self.timings.values(), key=lambda timing: timing.total_seconds, reverse=True)
+
+    def plugins_seconds(self) -> float:
+        return sum(timing.total_seconds for timing in self.timings.values())
+
+    def to_dict(self) -> Dict:
+        return {"started_at": self.started_at, "total": self.total_seconds, "complete": self.complete,
+                "plugins": [timing.to_dict() for timing in self.timings.values()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StartupProfile":
+        profile = cls(data.get("started_at"))
+        profile.total_seconds = data.get("total")
+        profile.complete = bool(data.get("complete"))
+        for item in data.get("plugins", []):
+            timing = PluginTiming.from_dict(item)
+            profile.timings[timing.name] = timing
+        return profile
+
+
+class StartupProfiler:
+    """Analiza la salida de un arranque línea a línea"""
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.profile = StartupProfile(started_at)
+        self._open: Optional[PluginTiming] = None
+        self._open_phase: Optional[str] = None
+        self._open_since = 0.0
+        self._last_clock: Optional[float] = None
+        self._day_offset = 0.0
+
+    def _parse_clock(self, line: str) -> Optional[float]:
+        match = _TIMESTAMP_RE.match(line)
+        if not match:
+            return None
+        hours, minutes, seconds, millis = match.groups()
+        clock = int(hours) * 3600 + int(minutes) * 60 + int(seconds) + (int(millis.ljust(3, "0")) / 1000 if millis else 0)
+        if self._last_clock is not None and clock + self._day_offset < self._last_clock - 43200:
+            # El arranque ha pasado de medianoche
+            self._day_offset += 86400
+        return clock + self._day_offset
+
+    def _close(self, now: float):
+        if self._open is not None:
+            elapsed = max(0.0, now - self._open_since)
+            if self._open_phase == "Loading":
+                self._open.load_seconds += elapsed
+            else:
+                self._open.enable_seconds += elapsed
+        self._open = None
+        self._open_phase = None
+
+    def feed_line(self, line: str, timestamp: Optional[float] = None) -> bool:
+        """Procesa una línea; devuelve True cuando el servidor termina de arrancar
+
+        ``timestamp`` es la hora de llegada de la línea; si no se indica se usa
+        la marca ``[HH:MM:SS]`` de la propia línea.
+        """
+        if self.profile.complete:
+            return False
+        now = timestamp if timestamp is not None else self._parse_clock(line)
+        if now is None:
+            return False
+        self._last_clock = now
+
+        event = _PLUGIN_EVENT_RE.search(line)
+        if event:
+            phase, name, version = event.groups()
+            self._close(now)
+            timing = self.profile.timings.get(name)
+            if timing is None:
+                timing = self.profile.timings[name] = PluginTiming(name, version)
+            self._open, self._open_phase, self._open_since = timing, phase, now
+            return False
+
+        if _BOUNDARY_RE.search(line):
+            self._close(now)
+            done = _DONE_RE.search(line)
+            if done:
+                self.profile.total_seconds = float(done.group(1))
+                self.profile.complete = True
+                return True
+        return False
+
+
+def profile_log_file(log_path: str) -> Optional[StartupProfile]:
+    """Analiza el arranque registrado en un log (normalmente ``logs/latest.log``)"""
+    try:
+        started_at = os.path.getmtime(log_path)
+        profiler = StartupProfiler(started_at)
+        with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if profiler.feed_line(line):
+                    break
+    except OSError:
+        return None
+    return profiler.profile if profiler.profile.timings else None
+
+
+def _history_path(server_path: str) -> str:
+    return os.path.join(server_path, STARTUP_HISTORY_FILE)
+
+
+def load_startup_history(server_path: str) -> List[StartupProfile]:
+    """Arranques guardados de un servidor, del más reciente al más antiguo"""
+    try:
+        with open(_history_path(server_path), "r") as f:
+            data = json.load(f)
+        return [StartupProfile.from_dict(item) for item in data.get("runs", [])]
+    except (OSError, ValueError, AttributeError):
+        return []
+
+
+def save_startup_profile(server_path: str, profile: StartupProfile, max_runs: int = MAX_STARTUP_HISTORY) -> bool:
+    """Añade un arranque al historial del servidor (escritura atómica)"""
+    history = [profile] + load_startup_history(server_path)
+    data = json.dumps({"runs": [run.to_dict() for run in history[:max_runs]]}, indent=4)
+    try:
+        atomic_write(_history_path(server_path), data)
+        return True
+    except OSError:
+        return False
+
+
+def average_timings(history: List[StartupProfile]) -> Dict[str, float]:
+    """Tiempo medio (carga + activación) de cada plugin en los arranques completos"""
+    totals: Dict[str, List[float]] = {}
+    for run in history:
+        if not run.complete:
+            continue
+        for timing in run.timings.values():
+            totals.setdefault(timing.name, []).append(timing.total_seconds)
+    return {name: sum(values) / len(values) for name, values in totals.items()}
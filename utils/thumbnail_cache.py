@@ -0,0 +1,225 @@
+"""Caché en disco de miniaturas de iconos de proyectos.
+
+Cada icono se guarda ya escalado (24 y 48 px, en PNG) bajo la carpeta de
+caché del usuario, indexado por el hash de su URL, de modo que al volver a
+abrir la página los iconos se muestran sin descargar ni reescalar nada.
+Pasado ``revalidate_after`` la miniatura se revalida con una petición
+condicional (If-None-Match/If-Modified-Since); si el servidor responde 304
+o no hay red se sigue usando la copia guardada. El tamaño total está
+limitado y al superarlo se eliminan los iconos usados hace más tiempo.
+
+El escalado lo aporta quien usa la caché (la vista lo hace con GdkPixbuf),
+así que el módulo no depende de GTK.
+"""
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from utils.constants import CACHE_DIR
+from utils.file_utils import atomic_write
+from utils.http_client import get_http_client
+from utils.icon_loader import icon_bytes_from_body
+
+ICON_CACHE_DIR = os.path.join(CACHE_DIR, "icons")
+DEFAULT_MAX_THUMBNAIL_BYTES = 20 * 1024 * 1024
+REVALIDATE_AFTER = 7 * 24 * 3600
+THUMBNAIL_SIZES = (24, 48)
+
+# scale(datos originales, tamaño) -> PNG de tamaño x tamaño
+ScaleFunction = Callable[[bytes, int], bytes]
+
+
+class ThumbnailCache:
+    def __init__(self, directory: str = ICON_CACHE_DIR, max_bytes: int = DEFAULT_MAX_THUMBNAIL_BYTES,
+                 revalidate_after: float = REVALIDATE_AFTER, sizes: Tuple[int, ...] = THUMBNAIL_SIZES,
+                 http: Any = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.sizes = tuple(sizes)
+        self.http = http
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    # Claves y rutas
+    def make_key(self, url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _thumbnail_path(self, key: str, size: int) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}-{size}.png")
+
+    def _entry_paths(self, key: str) -> Tuple[str, ...]:
+        return (self._meta_path(key),) + tuple(self._thumbnail_path(key, size) for size in self.sizes)
+
+    # Lectura
+    def _read_meta(self, key: str) -> Dict[str, Any]:
+        try:
+            with open(self._meta_path(key), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def lookup(self, url: str, size: int) -> Optional[bytes]:
+        """Devuelve la miniatura guardada (fresca o no) o ``None``"""
+        key = self.make_key(url)
+        try:
+            with open(self._thumbnail_path(key, size), "rb") as f:
+                data = f.read()
+            # El mtime marca el último uso para la expulsión LRU
+            os.utime(self._meta_path(key), None)
+        except OSError:
+            return None
+        return data or None
+
+    def get_thumbnail(self, url: str, size: int, scale: ScaleFunction) -> bytes:
+        """Devuelve el PNG de ``size`` px del icono, descargándolo solo si hace falta
+
+        Se ejecuta en un hilo de trabajo: puede hacer una petición de red y
+        llamar a ``scale``. Lanza una excepción si no hay copia guardada y
+        el icono no se puede obtener.
+        """
+        key = self.make_key(url)
+        meta = self._read_meta(key)
+        cached = self.lookup(url, size) if meta else None
+        now = time.time()
+        if cached is not None and now - meta.get("checked_at", 0.0) < self.revalidate_after:
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        http = self.http or get_http_client()
+        try:
+            response = http.get(url, headers=headers, use_cache=False)
+        except (urllib.error.URLError, socket.timeout, OSError):
+            # Sin red se sigue mostrando la copia guardada
+            if cached is not None:
+                return cached
+            raise
+
+        if cached is not None and response.status == 304:
+            meta["checked_at"] = now
+            meta["etag"] = response.headers.get("etag") or meta.get("etag")
+            meta["last_modified"] = response.headers.get("last-modified") or meta.get("last_modified")
+            self._write_meta(key, meta)
+            return cached
+
+        original = icon_bytes_from_body(response.body, url)
+        thumbnails = {thumbnail_size: scale(original, thumbnail_size)
+                      for thumbnail_size in set(self.sizes) | {size}}
+        meta = {"url": url, "checked_at": now, "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified")}
+        self._write(key, meta, thumbnails)
+        return thumbnails[size]
+
+    # Escritura
+    def _write_meta(self, key: str, meta: Dict[str, Any]):
+        try:
+            atomic_write(self._meta_path(key), json.dumps(meta))
+        except OSError:
+            pass
+
+    def _write(self, key: str, meta: Dict[str, Any], thumbnails: Dict[int, bytes]):
+        paths = self._entry_paths(key)
+        try:
+            os.makedirs(os.path.dirname(paths[0]), exist_ok=True)
+            previous = self._entry_size(*paths)
+            for size, data in thumbnails.items():
+                if size in self.sizes:
+                    atomic_write(self._thumbnail_path(key, size), data)
+            # Los metadatos van al final: sin ellos la entrada no se considera completa
+            atomic_write(paths[0], json.dumps(meta))
+        except OSError:
+            return
+        added = self._entry_size(*paths) - previous
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += added
+        self._evict_if_needed()
+
+    # Expulsión
+    def _entry_size(self, *paths: str) -> int:
+        size = 0
+        for path in paths:
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    def _iter_entries(self) -> Iterable[Tuple[str, float, int]]:
+        """Recorre los iconos guardados devolviendo (clave, último uso, tamaño)"""
+        if not os.path.isdir(self.directory):
+            return
+        for bucket in os.listdir(self.directory):
+            bucket_path = os.path.join(self.directory, bucket)
+            if not os.path.isdir(bucket_path):
+                continue
+            for filename in os.listdir(bucket_path):
+                if not filename.endswith(".json"):
+                    continue
+                key = filename[:-len(".json")]
+                try:
+                    last_used = os.path.getmtime(self._meta_path(key))
+                except OSError:
+                    continue
+                yield key, last_used, self._entry_size(*self._entry_paths(key))
+
+    def _evict_if_needed(self):
+        with self._lock:
+            total = self._total_bytes
+        if total is None:
+            total = sum(size for _, _, size in self._iter_entries())
+        if total <= self.max_bytes:
+            with self._lock:
+                self._total_bytes = total
+            return
+
+        entries = sorted(self._iter_entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for key, _, size in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            self._remove(key)
+            total -= size
+        with self._lock:
+            self._total_bytes = total
+
+    def _remove(self, key: str):
+        for path in self._entry_paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Elimina todas las miniaturas"""
+        for key, _, _ in list(self._iter_entries()):
+            self._remove(key)
+        with self._lock:
+            self._total_bytes = 0
+
+
+_default_cache: Optional[ThumbnailCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Devuelve la caché de miniaturas compartida por toda la aplicación"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ThumbnailCache()
+        return _default_cache
@@ -0,0 +1,152 @@
+"""
+Download Queue Page for the Minecraft Server Manager
+Shows queued, running and finished downloads and allows cancelling them
+"""
+import gi
+import gettext
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk, GLib
+
+_ = gettext.gettext
+
+from utils.download_queue import DownloadQueue
+from utils.http_client import get_http_client
+
+
+class DownloadQueuePage:
+    """Handles the download queue UI"""
+
+    def __init__(self, download_queue: DownloadQueue):
+        self.download_queue = download_queue
+        self.job_store = None
+        self.job_view = None
+        self.summary_label = None
+        self._refresh_pending = False
+
+        self.download_queue.add_listener(self._on_queue_changed)
+
+    def create_page(self):
+        """Crea la página de la cola de descargas"""
+        page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        page.set_margin_left(12)
+        page.set_margin_right(12)
+        page.set_margin_top(12)
+        page.set_margin_bottom(12)
+
+        title_label = Gtk.Label()
+        title_label.set_markup(_("<b>Downloads</b>"))
+        title_label.set_halign(Gtk.Align.START)
+        title_label.set_margin_bottom(12)
+        page.pack_start(title_label, False, False, 0)
+
+        self.summary_label = Gtk.Label(label=_("No downloads."))
+        self.summary_label.set_halign(Gtk.Align.START)
+        page.pack_start(self.summary_label, False, False, 0)
+
+        self.job_store = Gtk.ListStore(int, str, str, str, str)  # id, name, host, status, progress
+        self.job_view = Gtk.TreeView(model=self.job_store)
+
+        columns = [(_("Name"), 1), (_("Host"), 2), (_("Status"), 3), (_("Progress"), 4)]
+        for title, index in columns:
+            renderer = Gtk.CellRendererText()
+            column = Gtk.TreeViewColumn(title, renderer, text=index)
+            if index in (1, 4):
+                column.set_expand(True)
+            self.job_view.append_column(column)
+
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_hexpand(True)
+        scrolled.set_vexpand(True)
+        scrolled.add(self.job_view)
+        page.pack_start(scrolled, True, True, 0)
+
+        hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        page.pack_start(hbox, False, False, 0)
+
+        cancel_button = Gtk.Button(label=_("Cancel Selected"))
+        cancel_button.set_image(Gtk.Image.new_from_icon_name("process-stop-symbolic", Gtk.IconSize.BUTTON))
+        cancel_button.set_always_show_image(True)
+        cancel_button.connect("clicked", self._on_cancel_clicked)
+        hbox.pack_start(cancel_button, False, False, 0)
+
+        cancel_all_button = Gtk.Button(label=_("Cancel All"))
+        cancel_all_button.connect("clicked", self._on_cancel_all_clicked)
+        hbox.pack_start(cancel_all_button, False, False, 0)
+
+        clear_button = Gtk.Button(label=_("Clear Finished"))
+        clear_button.set_image(Gtk.Image.new_from_icon_name("edit-clear-symbolic", Gtk.IconSize.BUTTON))
+        clear_button.set_always_show_image(True)
+        clear_button.connect("clicked", self._on_clear_clicked)
+        hbox.pack_start(clear_button, False, False, 0)
+
+        self.refresh()
+        return page
+
+    def _on_queue_changed(self):
+        """Se llama desde hilos de trabajo; agrupa los cambios en un único refresco"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            GLib.idle_add(self.refresh)
+
+    def refresh(self):
+        """Vuelve a pintar la lista de trabajos"""
+        self._refresh_pending = False
+        if self.job_store is None:
+            return False
+
+        jobs = self.download_queue.get_jobs()
+        rows = {row[0]: row.iter for row in self.job_store}
+        current_ids = set()
+        for job in jobs:
+            current_ids.add(job.id)
+            values = [job.id, job.name, job.host, _(job.status), job.progress]
+            if job.id in rows:
+                self.job_store.set_row(rows[job.id], values)
+            else:
+                self.job_store.append(values)
+
+        for job_id, treeiter in rows.items():
+            if job_id not in current_ids:
+                self.job_store.remove(treeiter)
+
+        active = sum(1 for job in jobs if not job.is_finished())
+        if jobs:
+            summary = _("{active} active, {total} total").format(active=active, total=len(jobs))
+        else:
+            summary = _("No downloads.")
+
+        client = get_http_client()
+        metrics = client.get_metrics()
+        if metrics["requests"]:
+            summary += "  •  " + _(
+                "HTTP: {requests} requests, {average:.0f} ms average, {reused} reused connections"
+            ).format(
+                requests=metrics["requests"],
+                average=metrics["average_time"] * 1000,
+                reused=metrics["reused_connections"],
+            )
+        if client.cache:
+            cache_metrics = client.cache.get_metrics()
+            if cache_metrics["hits"] or cache_metrics["misses"]:
+                summary += "  •  " + _("Cache: {hits} hits, {misses} misses ({ratio:.0%})").format(
+                    hits=cache_metrics["hits"],
+                    misses=cache_metrics["misses"],
+                    ratio=cache_metrics["hit_ratio"],
+                )
+        self.summary_label.set_text(summary)
+        return False
+
+    def _on_cancel_clicked(self, widget):
+        selection = self.job_view.get_selection()
+        model, treeiter = selection.get_selected()
+        if not treeiter:
+            return
+        job = self.download_queue.get_job(model[treeiter][0])
+        if job and not job.is_finished():
+            job.cancel()
+
+    def _on_cancel_all_clicked(self, widget):
+        self.download_queue.cancel_all()
+
+    def _on_clear_clicked(self, widget):
+        self.download_queue.clear_finished()
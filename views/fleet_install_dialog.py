@@ -0,0 +1,104 @@
+"""
+Diálogo para elegir en qué servidores se instala o actualiza un proyecto
+"""
+import gi
+import gettext
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
+
+_ = gettext.gettext
+
+from typing import Callable, List, Optional
+
+from models.server import MinecraftServer
+
+
+class FleetInstallDialog(Gtk.Dialog):
+    def __init__(self, parent, plugin_name: str, servers: List[MinecraftServer],
+                 selected_server: Optional[MinecraftServer] = None,
+                 is_starting: Optional[Callable[[MinecraftServer], bool]] = None):
+        super().__init__(title=_("Install {name} on Servers").format(name=plugin_name), parent=parent,
+                         flags=Gtk.DialogFlags.MODAL)
+        self.servers = servers
+        self.selected_server = selected_server
+        self.is_starting = is_starting
+
+        self.add_button(_("Cancel"), Gtk.ResponseType.CANCEL)
+        self.install_button = self.add_button(_("Install"), Gtk.ResponseType.OK)
+        self.set_default_size(480, 360)
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Configura la lista de servidores"""
+        box = self.get_content_area()
+        box.set_spacing(6)
+        box.set_border_width(10)
+
+        summary_label = Gtk.Label(
+            label=_("The file is downloaded once and installed on every selected server.\n"
+                    "Running and starting servers are skipped.")
+        )
+        summary_label.set_halign(Gtk.Align.START)
+        box.pack_start(summary_label, False, False, 0)
+
+        # selected, name, status, index
+        self.store = Gtk.ListStore(bool, str, str, int)
+        for index, server in enumerate(self.servers):
+            if server.is_running:
+                status = _("Running")
+            elif self._is_busy(server):
+                status = _("Starting")
+            else:
+                status = ""
+            selected = not self._is_busy(server) and (self.selected_server is None or server is self.selected_server)
+            self.store.append([selected, server.name, status, index])
+
+        view = Gtk.TreeView(model=self.store)
+
+        toggle_renderer = Gtk.CellRendererToggle()
+        toggle_renderer.connect("toggled", self._on_toggled)
+        view.append_column(Gtk.TreeViewColumn("", toggle_renderer, active=0))
+
+        for title, index in [(_("Server"), 1), (_("Status"), 2)]:
+            renderer = Gtk.CellRendererText()
+            column = Gtk.TreeViewColumn(title, renderer, text=index)
+            if index == 1:
+                column.set_expand(True)
+            view.append_column(column)
+
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_hexpand(True)
+        scrolled.set_vexpand(True)
+        scrolled.add(view)
+        box.pack_start(scrolled, True, True, 0)
+
+        select_all_button = Gtk.CheckButton(label=_("Select all stopped servers"))
+        select_all_button.connect("toggled", self._on_select_all_toggled)
+        box.pack_start(select_all_button, False, False, 0)
+
+        self._update_install_button()
+        self.show_all()
+
+    def _is_busy(self, server: MinecraftServer) -> bool:
+        """Indica si el servidor está en marcha o arrancando"""
+        return server.is_running or bool(self.is_starting and self.is_starting(server))
+
+    def _on_toggled(self, renderer, path):
+        row = self.store[path]
+        # Los servidores en marcha o arrancando no se pueden modificar
+        if not self._is_busy(self.servers[row[3]]):
+            row[0] = not row[0]
+        self._update_install_button()
+
+    def _on_select_all_toggled(self, button):
+        for row in self.store:
+            row[0] = button.get_active() and not self._is_busy(self.servers[row[3]])
+        self._update_install_button()
+
+    def _update_install_button(self):
+        self.install_button.set_sensitive(any(row[0] for row in self.store))
+
+    def get_selected_servers(self) -> List[MinecraftServer]:
+        """Devuelve los servidores marcados"""
+        return [self.servers[row[3]] for row in self.store if row[0]]
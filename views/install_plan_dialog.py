@@ -0,0 +1,73 @@
+"""
+Diálogo que muestra el plan de instalación de un proyecto y sus dependencias
+"""
+import gi
+import gettext
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
+
+_ = gettext.gettext
+
+from models.install_plan import InstallPlan
+
+
+class InstallPlanDialog(Gtk.Dialog):
+    def __init__(self, parent, plan: InstallPlan):
+        super().__init__(title=_("Install {name}").format(name=plan.root.name), parent=parent,
+                         flags=Gtk.DialogFlags.MODAL)
+        self.plan = plan
+
+        self.add_button(_("Cancel"), Gtk.ResponseType.CANCEL)
+        self.add_button(_("Install"), Gtk.ResponseType.OK)
+        self.set_default_response(Gtk.ResponseType.OK)
+        self.set_default_size(560, 360)
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Configura la lista de proyectos a instalar"""
+        box = self.get_content_area()
+        box.set_spacing(6)
+        box.set_border_width(10)
+
+        summary_label = Gtk.Label(
+            label=_("{count} projects will be downloaded:").format(count=len(self.plan.items))
+        )
+        summary_label.set_halign(Gtk.Align.START)
+        box.pack_start(summary_label, False, False, 0)
+
+        store = Gtk.ListStore(str, str, str, str)  # name, version, type, reason
+        for item in self.plan.items:
+            reason = _("Required by {name}").format(name=item.required_by) if item.is_dependency() else _("Selected")
+            store.append([item.name, item.version_number, item.project_type.capitalize(), reason])
+        for name in self.plan.already_installed:
+            store.append([name, "", "", _("Already installed")])
+
+        view = Gtk.TreeView(model=store)
+        columns = [(_("Name"), 0), (_("Version"), 1), (_("Type"), 2), (_("Reason"), 3)]
+        for title, index in columns:
+            renderer = Gtk.CellRendererText()
+            column = Gtk.TreeViewColumn(title, renderer, text=index)
+            if index == 0:
+                column.set_expand(True)
+            view.append_column(column)
+
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_hexpand(True)
+        scrolled.set_vexpand(True)
+        scrolled.add(view)
+        box.pack_start(scrolled, True, True, 0)
+
+        if self.plan.warnings:
+            warnings_label = Gtk.Label(label="\n".join(f"⚠ {warning}" for warning in self.plan.warnings))
+            warnings_label.set_halign(Gtk.Align.START)
+            warnings_label.set_line_wrap(True)
+            box.pack_start(warnings_label, False, False, 0)
+
+        self.show_all()
+
+    def run_and_get_response(self) -> bool:
+        """Ejecuta el diálogo y retorna True si se confirma la instalación"""
+        response = self.run()
+        self.destroy()
+        return response == Gtk.ResponseType.OK
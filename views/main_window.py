@@ -23,6 +23,7 @@ from views.resource_pack_page import ResourcePackPage
 from views.config_editor_page import ConfigEditorPage
 from views.log_viewer_page import LogViewerPage
 from views.port_analysis_page import PortAnalysisPage
+from views.download_queue_page import DownloadQueuePage
 from models.server import MinecraftServer
 
 
@@ -67,7 +68,7 @@ class MinecraftServerManager(Gtk.Window):
             self, self.server_controller, self.download_controller, self.console_manager
         )
         self.plugin_management_page = PluginManagementPage(
-            self, self.console_manager, self.plugin_controller
+            self, self.console_manager, self.plugin_controller, self.server_controller
         )
         self.player_management_page = PlayerManagementPage(
             self, self.console_manager, self.player_controller
@@ -80,6 +81,7 @@ class MinecraftServerManager(Gtk.Window):
         )
         self.log_viewer_page = LogViewerPage(self.server_controller)
         self.port_analysis_page = PortAnalysisPage(self.server_controller)
+        self.download_queue_page = DownloadQueuePage(self.plugin_controller.download_queue)
         
         # Configurar callbacks
         self._setup_callbacks()
@@ -89,6 +91,7 @@ class MinecraftServerManager(Gtk.Window):
         # Server controller callbacks
         self.server_controller.set_console_callback(self.console_manager.log_to_console)
         self.server_controller.set_server_finished_callback(self._on_server_finished)
+        self.server_controller.set_startup_profile_callback(self.plugin_management_page.on_startup_profile)
         
         # Download controller callbacks
         self.download_controller.set_download_callback(self.console_manager.log_to_console)
@@ -96,10 +99,12 @@ class MinecraftServerManager(Gtk.Window):
         # Plugin controller callbacks
         self.plugin_controller.set_search_callback(self.console_manager.log_to_console)
         self.plugin_controller.set_plugins_updated_callback(self.plugin_management_page.on_plugins_updated)
+        self.plugin_controller.set_progress_callback(self.plugin_management_page.on_download_progress)
 
         # Resource pack controller callbacks
         self.resource_pack_controller.set_log_callback(self.console_manager.log_to_console)
         self.resource_pack_controller.set_packs_updated_callback(self.resource_pack_page.on_packs_updated)
+        self.resource_pack_controller.set_progress_callback(self.resource_pack_page.on_download_progress)
 
     def _setup_ui(self):
         """Configura la interfaz de usuario principal"""
@@ -153,6 +158,7 @@ class MinecraftServerManager(Gtk.Window):
         self.config_row = sidebar_widgets['config_row']
         self.port_row = sidebar_widgets['port_row']
         self.logs_row = sidebar_widgets['logs_row']
+        self.downloads_row = sidebar_widgets['downloads_row']
         
     def _create_sidebar_row(self, label_text, icon_name):
         """Crea una fila para la barra lateral - DEPRECATED, use UISetup.create_sidebar_row"""
@@ -171,6 +177,7 @@ class MinecraftServerManager(Gtk.Window):
         config_page = self.config_editor_page.create_page()
         port_page = self.port_analysis_page.create_page()
         log_page = self.log_viewer_page.create_page()
+        downloads_page = self.download_queue_page.create_page()
 
         self.content_stack.add_named(server_page, "server_management")
         self.content_stack.add_named(plugin_page, "plugin_manager")
@@ -179,6 +186,7 @@ class MinecraftServerManager(Gtk.Window):
         self.content_stack.add_named(config_page, "config_editor")
         self.content_stack.add_named(port_page, "port_analyzer")
         self.content_stack.add_named(log_page, "log_viewer")
+        self.content_stack.add_named(downloads_page, "downloads")
         
         # Ahora que todo está configurado, conectar la señal y hacer selección inicial
         self.sidebar_list.connect("row-selected", self._on_sidebar_selection_changed)
@@ -205,11 +213,19 @@ class MinecraftServerManager(Gtk.Window):
             self.content_stack.set_visible_child_name("port_analyzer")
         elif page_name == _("Logs"):
             self.content_stack.set_visible_child_name("log_viewer")
+        elif page_name == _("Downloads"):
+            self.content_stack.set_visible_child_name("downloads")
 
     def _load_initial_data(self):
         """Carga los datos iniciales"""
         self.server_controller.load_servers()
         self._refresh_server_list()
+        # Refrescar el catálogo de búsqueda sin conexión en segundo plano
+        self.plugin_controller.sync_catalog()
+        # Y liberar los JAR del almacén compartido que ya no usa ningún servidor
+        self.plugin_controller.collect_jar_store_garbage(
+            [server.path for server in self.server_controller.get_servers()]
+        )
         self.console_manager.log_to_console(_("Welcome to the Minecraft Server Manager console!\n"))
         self.console_manager.log_to_console(_("Server output will appear here.\n"))
 
@@ -265,7 +281,8 @@ class MinecraftServerManager(Gtk.Window):
         """Actualiza el estado de los botones del header"""
         if self.selected_server:
             is_running = self.server_controller.is_server_running(self.selected_server)
-            can_start = not is_running and self.selected_server.has_jar_file()
+            is_starting = self.server_controller.is_server_starting(self.selected_server)
+            can_start = not is_running and not is_starting and self.selected_server.has_jar_file()
             
             self.header_start_button.set_sensitive(can_start)
             self.header_stop_button.set_sensitive(is_running)
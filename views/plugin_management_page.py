@@ -5,29 +5,48 @@ Contains all UI and logic related to plugin management
 import gi
 import gettext
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GdkPixbuf, GLib
-import urllib.request
-import threading
+from gi.repository import Gtk, GdkPixbuf, GLib, GObject
+import bisect
 import os
-import tempfile
 
 _ = gettext.gettext
 
 from models.server import MinecraftServer
 from models.plugin import Plugin
+from utils.icon_loader import ICON_MISSING, IconLoader
+from utils.thumbnail_cache import get_thumbnail_cache
+from views.fleet_install_dialog import FleetInstallDialog
+from views.install_plan_dialog import InstallPlanDialog
+from views.plugin_updates_dialog import PluginUpdatesDialog
+from views.startup_profile_dialog import StartupProfileDialog
+
+# Espera tras la última tecla antes de lanzar la búsqueda automática
+SEARCH_DEBOUNCE_MS = 300
+SEARCH_MIN_QUERY_LENGTH = 3
+RESULT_ICON_SIZE = 24
 
 
 class PluginManagementPage:
     """Handles plugin management UI and events"""
     
-    def __init__(self, parent_window, console_manager, plugin_controller):
+    def __init__(self, parent_window, console_manager, plugin_controller, server_controller=None):
         self.parent_window = parent_window
         self.console_manager = console_manager
         self.plugin_controller = plugin_controller
+        self.server_controller = server_controller
         self.selected_server = None
+        self.download_progress_label = None
+        self.scan_progress_bar = None
+        self._search_timeout_id = None
+        self._replace_search_rows = True  # La próxima respuesta de búsqueda sustituye la lista entera
+        self._scanned_indices = []  # Índices de los JAR ya mostrados durante el escaneo, ordenados
+        self._local_plugins = {}  # Ruta -> Plugin del último escaneo en segundo plano
         
-        # Caché de iconos descargados
-        self.icon_cache = {}
+        # Iconos de los resultados: pocos hilos, una descarga por URL, caché LRU en memoria
+        # y miniaturas ya escaladas en disco para no descargarlas en cada sesión
+        self.thumbnail_cache = get_thumbnail_cache()
+        self.icon_loader = IconLoader(self._decode_icon, self._fetch_icon_thumbnail)
+        self._icon_rows = {}  # URL -> filas que esperan ese icono (para redibujar solo esas)
         self.default_plugin_icon = None
         self.default_mod_icon = None
         
@@ -35,6 +54,7 @@ class PluginManagementPage:
         self._create_default_icons()
         
         self.plugin_controller.set_plugins_updated_callback(self.on_plugins_updated)
+        self.plugin_controller.set_plugin_scanned_callback(self.on_plugin_scanned)
     
     def _create_default_icons(self):
         """Crea iconos por defecto desde los iconos del sistema"""
@@ -103,54 +123,74 @@ class PluginManagementPage:
         else:
             cell.set_property("icon-name", "package-x-generic")
 
-    def _render_online_icon_cell(self, column, cell, model, iter, data):
-        """Renderiza el icono según el tipo de plugin/mod online, descargándolo de la fuente si está disponible"""
-        plugin_type = model[iter][0]
-        plugin_name = model[iter][1]
-        
-        # Intentar obtener la URL del icono de forma segura
-        try:
-            icon_url = model[iter][5]
-        except (IndexError, TypeError):
-            icon_url = ""
-        
-        # Si tenemos una URL de icono, intentar descargarlo
-        if icon_url and icon_url in self.icon_cache:
-            # Ya está en caché
-            cell.set_property("pixbuf", self.icon_cache[icon_url])
-        elif icon_url:
-            # Descargar icono en un hilo separado
-            self._download_icon_async(icon_url, plugin_name, cell, plugin_type)
-            # Mientras tanto, usar icono por defecto
-            default_icon = self.default_plugin_icon if plugin_type == "plugin" else self.default_mod_icon
-            cell.set_property("pixbuf", default_icon)
-        else:
-            # Sin URL de icono, usar icono por defecto basado en el tipo
-            default_icon = self.default_plugin_icon if plugin_type == "plugin" else self.default_mod_icon
-            cell.set_property("pixbuf", default_icon)
-    
-    def _download_icon_async(self, icon_url, plugin_name, cell, plugin_type):
-        """Descarga un icono de forma asíncrona usando urllib y actualiza la celda"""
-
-        def download_icon():
-            try:
-                with urllib.request.urlopen(icon_url) as response:
-                    data = response.read()
+    def _render_name_cell(self, column, cell, model, iter, data):
+        """Muestra el nombre y marca los mods que solo sirven en el cliente"""
+        markup = GLib.markup_escape_text(model[iter][1])
+        if model[iter][6]:
+            markup += ' <span foreground="gray"><i>' + GLib.markup_escape_text(_("(client-only)")) + '</i></span>'
+        cell.set_property("markup", markup)
 
-                loader = GdkPixbuf.PixbufLoader.new()
-                loader.write(data)
-                loader.close()
-                pixbuf = loader.get_pixbuf()
-                scaled_pixbuf = pixbuf.scale_simple(24, 24, GdkPixbuf.InterpType.BILINEAR)
+    def _render_search_text_cell(self, column, cell, model, iter, get_text):
+        """Muestra un campo del resultado (la fila solo guarda el objeto Plugin)"""
+        cell.set_property("text", get_text(model[iter][0]))
 
-                self.icon_cache[icon_url] = scaled_pixbuf
-                GLib.idle_add(cell.set_property, "pixbuf", scaled_pixbuf)
-            except Exception:
-                default_icon = self.default_plugin_icon if plugin_type == "plugin" else self.default_mod_icon
-                self.icon_cache[icon_url] = default_icon
-                GLib.idle_add(cell.set_property, "pixbuf", default_icon)
-
-        threading.Thread(target=download_icon, daemon=True).start()
+    def _render_online_icon_cell(self, column, cell, model, iter, data):
+        """Renderiza el icono de un resultado; si aún no está cargado se pide y se muestra el de por defecto"""
+        plugin = model[iter][0]
+        plugin_type = plugin.project_type.lower()
+        icon_url = plugin.icon_url
+        default_icon = self.default_plugin_icon if plugin_type == "plugin" else self.default_mod_icon
+
+        pixbuf = self.icon_loader.get(icon_url) if icon_url else ICON_MISSING
+        if pixbuf is None:
+            # Recordar la fila para redibujarla cuando llegue el icono; una referencia
+            # que ya no es válida (o que ahora apunta a otra fila) se sustituye
+            path = model.get_path(iter)
+            waiting = self._icon_rows.setdefault(icon_url, {})
+            reference = waiting.get(path.to_string())
+            if reference is None or not reference.valid() or reference.get_path().compare(path) != 0:
+                waiting[path.to_string()] = Gtk.TreeRowReference.new(model, path)
+            pixbuf = self.icon_loader.request(icon_url, self._on_icon_loaded)
+        cell.set_property("pixbuf", default_icon if pixbuf is None or pixbuf is ICON_MISSING else pixbuf)
+
+    def _fetch_icon_thumbnail(self, icon_url):
+        """Obtiene la miniatura de un resultado desde la caché en disco (se ejecuta en un hilo del cargador)"""
+        return self.thumbnail_cache.get_thumbnail(icon_url, RESULT_ICON_SIZE, self._scale_icon)
+
+    def _scale_icon(self, data, size):
+        """Escala un icono descargado a size x size y lo devuelve como PNG"""
+        loader = GdkPixbuf.PixbufLoader.new()
+        loader.write(data)
+        loader.close()
+        pixbuf = loader.get_pixbuf()
+        if pixbuf is None:
+            raise ValueError("Unsupported icon format")
+        saved, buffer = pixbuf.scale_simple(size, size, GdkPixbuf.InterpType.BILINEAR).save_to_bufferv("png", [], [])
+        return buffer
+
+    def _decode_icon(self, data):
+        """Convierte la miniatura PNG en un pixbuf (se ejecuta en un hilo del cargador)"""
+        loader = GdkPixbuf.PixbufLoader.new()
+        loader.write(data)
+        loader.close()
+        return loader.get_pixbuf()
+
+    def _forget_pending_icons(self):
+        """Olvida los iconos pendientes de la lista de resultados (se llama al vaciarla)"""
+        self.icon_loader.clear_pending()
+        self._icon_rows.clear()
+
+    def _on_icon_loaded(self, icon_url, pixbuf):
+        GLib.idle_add(self._redraw_icon_rows, icon_url)
+
+    def _redraw_icon_rows(self, icon_url):
+        """Redibuja solo las filas que esperaban este icono"""
+        for row_reference in self._icon_rows.pop(icon_url, {}).values():
+            if row_reference.valid():
+                model = row_reference.get_model()
+                path = row_reference.get_path()
+                model.row_changed(path, model.get_iter(path))
+        return False
 
     def _detect_plugin_type(self, filename: str) -> str:
         """Detecta si un archivo es un plugin o mod basado en su ubicación y nombre"""
@@ -170,8 +210,8 @@ class PluginManagementPage:
 
         # Lista de plugins locales con iconos, versión y método de instalación
         self.local_plugin_store = Gtk.ListStore(
-            str, str, str, str, str, str
-        )  # type, icon_name, name, version, install_method, path
+            str, str, str, str, str, int, bool
+        )  # type, name, version, install_method, path, scan order, client_only
         self.local_plugin_view = Gtk.TreeView(model=self.local_plugin_store)
         
         # Columna de icono
@@ -189,19 +229,20 @@ class PluginManagementPage:
         
         # Columna de nombre
         name_renderer = Gtk.CellRendererText()
-        name_column = Gtk.TreeViewColumn(_("Plugin/Mod Name"), name_renderer, text=2)
+        name_column = Gtk.TreeViewColumn(_("Plugin/Mod Name"), name_renderer)
+        name_column.set_cell_data_func(name_renderer, self._render_name_cell)
         name_column.set_expand(True)
         self.local_plugin_view.append_column(name_column)
 
         # Columna de versión
         version_renderer = Gtk.CellRendererText()
-        version_column = Gtk.TreeViewColumn(_("Version"), version_renderer, text=3)
+        version_column = Gtk.TreeViewColumn(_("Version"), version_renderer, text=2)
         version_column.set_fixed_width(100)
         self.local_plugin_view.append_column(version_column)
 
         # Columna de método de instalación
         method_renderer = Gtk.CellRendererText()
-        method_column = Gtk.TreeViewColumn(_("Install Method"), method_renderer, text=4)
+        method_column = Gtk.TreeViewColumn(_("Install Method"), method_renderer, text=3)
         method_column.set_fixed_width(120)
         self.local_plugin_view.append_column(method_column)
 
@@ -211,6 +252,12 @@ class PluginManagementPage:
         scrolled.add(self.local_plugin_view)
         vbox.pack_start(scrolled, True, True, 0)
 
+        # Progreso de la lectura de los JAR (solo visible durante el escaneo)
+        self.scan_progress_bar = Gtk.ProgressBar()
+        self.scan_progress_bar.set_show_text(True)
+        self.scan_progress_bar.set_no_show_all(True)
+        vbox.pack_start(self.scan_progress_bar, False, False, 0)
+
         # Botones de plugins locales
         hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
         vbox.pack_start(hbox, False, False, 0)
@@ -221,6 +268,12 @@ class PluginManagementPage:
         add_button.connect("clicked", self._on_add_local_plugin_clicked)
         hbox.pack_start(add_button, False, False, 0)
 
+        modpack_button = Gtk.Button(label=_("Import Modpack"))
+        modpack_button.set_image(Gtk.Image.new_from_icon_name("package-x-generic-symbolic", Gtk.IconSize.BUTTON))
+        modpack_button.set_always_show_image(True)
+        modpack_button.connect("clicked", self._on_import_modpack_clicked)
+        hbox.pack_start(modpack_button, False, False, 0)
+
         remove_button = Gtk.Button(label=_("Remove Selected"))
         remove_button.set_image(Gtk.Image.new_from_icon_name("edit-delete-symbolic", Gtk.IconSize.BUTTON))
         remove_button.set_always_show_image(True)
@@ -231,6 +284,30 @@ class PluginManagementPage:
         update_button.connect("clicked", self._on_update_local_plugin_clicked)
         hbox.pack_start(update_button, False, False, 0)
 
+        self.check_updates_button = Gtk.Button(label=_("Check All for Updates"))
+        self.check_updates_button.set_image(Gtk.Image.new_from_icon_name("view-refresh-symbolic", Gtk.IconSize.BUTTON))
+        self.check_updates_button.set_always_show_image(True)
+        self.check_updates_button.connect("clicked", self._on_check_all_updates_clicked)
+        hbox.pack_start(self.check_updates_button, False, False, 0)
+
+        duplicates_button = Gtk.Button(label=_("Find Duplicates"))
+        duplicates_button.set_image(Gtk.Image.new_from_icon_name("edit-copy-symbolic", Gtk.IconSize.BUTTON))
+        duplicates_button.set_always_show_image(True)
+        duplicates_button.connect("clicked", self._on_find_duplicates_clicked)
+        hbox.pack_start(duplicates_button, False, False, 0)
+
+        client_mods_button = Gtk.Button(label=_("Audit Client Mods"))
+        client_mods_button.set_image(Gtk.Image.new_from_icon_name("computer-symbolic", Gtk.IconSize.BUTTON))
+        client_mods_button.set_always_show_image(True)
+        client_mods_button.connect("clicked", self._on_audit_client_mods_clicked)
+        hbox.pack_start(client_mods_button, False, False, 0)
+
+        startup_button = Gtk.Button(label=_("Startup Times"))
+        startup_button.set_image(Gtk.Image.new_from_icon_name("document-open-recent-symbolic", Gtk.IconSize.BUTTON))
+        startup_button.set_always_show_image(True)
+        startup_button.connect("clicked", self._on_startup_times_clicked)
+        hbox.pack_start(startup_button, False, False, 0)
+
     def _setup_online_search_section(self, container):
         """Configura la sección de búsqueda online"""
         frame = Gtk.Frame(label=_("Online Search"))
@@ -260,23 +337,34 @@ class PluginManagementPage:
         search_hbox.pack_start(source_label, False, False, 0)
 
         self.source_combo = Gtk.ComboBoxText()
+        self.source_combo.append("All", _("All Sources"))
         self.source_combo.append("Modrinth", _("Modrinth"))
         self.source_combo.append("Spigot", _("Spigot"))
         self.source_combo.append("CurseForge", _("CurseForge"))
         self.source_combo.set_active(0)
+        self.source_combo.connect("changed", self._on_search_entry_changed)
         search_hbox.pack_start(self.source_combo, False, False, 0)
 
         self.search_entry = Gtk.Entry()
         self.search_entry.set_placeholder_text(_("Search plugins/mods..."))
         self.search_entry.connect("activate", self._on_search_online_clicked)  # Buscar al presionar Enter
+        self.search_entry.connect("changed", self._on_search_entry_changed)  # Búsqueda mientras se escribe
         search_hbox.pack_start(self.search_entry, True, True, 0)
 
         search_button = Gtk.Button(label=_("Search Online"))
         search_button.connect("clicked", self._on_search_online_clicked)
         search_hbox.pack_start(search_button, False, False, 0)
 
+        # Buscar solo en el catálogo local (sin red)
+        self.offline_check = Gtk.CheckButton(label=_("Offline"))
+        self.offline_check.set_tooltip_text(_("Search the local catalog only, without using the network"))
+        self.offline_check.connect("toggled", self._on_search_entry_changed)
+        search_hbox.pack_start(self.offline_check, False, False, 0)
+
         # Lista de resultados con iconos y descripción
-        self.online_search_store = Gtk.ListStore(str, str, str, str, str, str, str)  # type, name, source, version, description, icon_url, project_id
+        # Cada fila guarda el resultado (Plugin); las columnas se calculan al dibujar y
+        # el icono sale de la caché del cargador, así no se duplican los datos
+        self.online_search_store = Gtk.ListStore(GObject.TYPE_PYOBJECT)
         self.online_search_view = Gtk.TreeView(model=self.online_search_store)
         
         # Columna de icono
@@ -287,13 +375,19 @@ class PluginManagementPage:
         self.online_search_view.append_column(icon_column)
         
         # Columnas de texto
-        columns = [(_("Type"), 0), (_("Name"), 1), (_("Source"), 2), (_("Version"), 3)]
-        for title, index in columns:
+        columns = [
+            (_("Type"), lambda plugin: plugin.project_type.capitalize()),  # Mod, Plugin
+            (_("Name"), lambda plugin: plugin.name),
+            (_("Source"), lambda plugin: plugin.source),
+            (_("Version"), lambda plugin: plugin.version),
+        ]
+        for index, (title, get_text) in enumerate(columns):
             renderer = Gtk.CellRendererText()
-            column = Gtk.TreeViewColumn(title, renderer, text=index)
-            if title == "Name":
+            column = Gtk.TreeViewColumn(title, renderer)
+            column.set_cell_data_func(renderer, self._render_search_text_cell, get_text)
+            if index == 1:
                 column.set_expand(True)  # Expandir la columna de nombre
-            elif title == "Type":
+            elif index == 0:
                 column.set_fixed_width(80)  # Ancho fijo para la columna de tipo
             self.online_search_view.append_column(column)
 
@@ -301,6 +395,8 @@ class PluginManagementPage:
         scrolled.set_hexpand(True)
         scrolled.set_vexpand(True)
         scrolled.add(self.online_search_view)
+        # Cargar la página siguiente al acercarse al final de la lista
+        scrolled.get_vadjustment().connect("value-changed", self._on_search_scrolled)
         vbox.pack_start(scrolled, True, True, 0)
 
         # Botones de búsqueda online
@@ -319,10 +415,31 @@ class PluginManagementPage:
         self.download_button.connect("clicked", self._on_download_online_plugin_clicked)
         hbox.pack_start(self.download_button, False, False, 0)
 
+        fleet_button = Gtk.Button(label=_("Install on Servers…"))
+        fleet_button.set_image(Gtk.Image.new_from_icon_name("network-server-symbolic", Gtk.IconSize.BUTTON))
+        fleet_button.set_always_show_image(True)
+        fleet_button.connect("clicked", self._on_install_on_servers_clicked)
+        hbox.pack_start(fleet_button, False, False, 0)
+
         info_button = Gtk.Button(label=_("View Info"))
         info_button.connect("clicked", self._on_view_plugin_info_clicked)
         hbox.pack_start(info_button, False, False, 0)
 
+        import_catalog_button = Gtk.Button(label=_("Import Catalog"))
+        import_catalog_button.set_tooltip_text(_("Import a catalog snapshot for offline search"))
+        import_catalog_button.connect("clicked", self._on_import_catalog_clicked)
+        hbox.pack_start(import_catalog_button, False, False, 0)
+
+        export_catalog_button = Gtk.Button(label=_("Export Catalog"))
+        export_catalog_button.set_tooltip_text(_("Save the local catalog to use it on another machine"))
+        export_catalog_button.connect("clicked", self._on_export_catalog_clicked)
+        hbox.pack_start(export_catalog_button, False, False, 0)
+
+        # Progreso de la descarga en curso (bytes y velocidad)
+        self.download_progress_label = Gtk.Label(label="")
+        self.download_progress_label.set_halign(Gtk.Align.START)
+        hbox.pack_start(self.download_progress_label, True, True, 0)
+
     # Event Handlers - Plugin Management
     def _on_add_local_plugin_clicked(self, widget):
         """Maneja el clic en añadir plugin local"""
@@ -367,6 +484,40 @@ class PluginManagementPage:
 
         dialog.destroy()
 
+    def _on_import_modpack_clicked(self, widget):
+        """Instala un modpack de Modrinth (.mrpack) o CurseForge (.zip) en el servidor"""
+        if not self.selected_server:
+            self.console_manager.log_to_console("Please select a server first.\n")
+            return
+        server_path = self.selected_server.path
+
+        dialog = Gtk.FileChooserDialog(
+            title=_("Select Modpack"),
+            parent=self.parent_window,
+            action=Gtk.FileChooserAction.OPEN,
+        )
+        dialog.add_button(_("Cancel"), Gtk.ResponseType.CANCEL)
+        dialog.add_button(_("Import"), Gtk.ResponseType.OK)
+
+        filter_pack = Gtk.FileFilter()
+        filter_pack.set_name(_("Modpacks (.mrpack, CurseForge .zip)"))
+        filter_pack.add_pattern("*.mrpack")
+        filter_pack.add_pattern("*.zip")
+        dialog.add_filter(filter_pack)
+
+        response = dialog.run()
+        pack_path = dialog.get_filename()
+        dialog.destroy()
+        if response != Gtk.ResponseType.OK or not pack_path:
+            return
+
+        def import_callback(success, message):
+            prefix = "✓" if success else "✗"
+            self.console_manager.log_to_console(f"{prefix} {message}\n")
+            self.plugin_controller.refresh_local_plugins(server_path)
+
+        self.plugin_controller.import_modpack(pack_path, server_path, import_callback)
+
     def _on_remove_local_plugin_clicked(self, widget):
         """Maneja el clic en eliminar plugin local"""
         selection = self.local_plugin_view.get_selection()
@@ -377,9 +528,9 @@ class PluginManagementPage:
             return
 
         plugin_type = model[treeiter][0]  # Tipo (plugin/mod)
-        plugin_name = model[treeiter][2]  # Nombre (índice 2)
-        install_method = model[treeiter][4]  # Método de instalación (índice 4)
-        plugin_path = model[treeiter][5]  # Ruta (índice 5)
+        plugin_name = model[treeiter][1]  # Nombre (índice 1)
+        install_method = model[treeiter][3]  # Método de instalación (índice 3)
+        plugin_path = model[treeiter][4]  # Ruta (índice 4)
         
         plugin = Plugin(plugin_name, "Local", file_path=plugin_path, install_method=install_method)
         if self.plugin_controller.remove_local_plugin(plugin, self.selected_server.path):
@@ -387,27 +538,90 @@ class PluginManagementPage:
 
     def _on_search_online_clicked(self, widget):
         """Maneja el clic en buscar online"""
-        query = self.search_entry.get_text()
+        self._cancel_pending_search()
+        query = self.search_entry.get_text().strip()
         if not query:
             self.console_manager.log_to_console("Please enter a search query.\n")
             return
 
-        # Obtener el tipo y la fuente seleccionados
-        search_type = self.search_type_combo.get_active_id()
         search_type_text = self.search_type_combo.get_active_text()
-        source = self.source_combo.get_active_id()
-
         self.console_manager.log_to_console(
-            f"Searching {source} for {search_type_text.lower()} with query: '{query}'\n"
+            f"Searching {self.source_combo.get_active_text()} for {search_type_text.lower()} with query: '{query}'\n"
         )
+        self._start_online_search(query)
 
-        self.online_search_store.clear()
-        if source == "Spigot":
-            self.plugin_controller.search_spigot_plugins(query, self._on_search_results)
-        elif source == "CurseForge":
-            self.plugin_controller.search_curseforge_plugins(query, self._on_search_results, search_type)
-        else:
-            self.plugin_controller.search_modrinth_plugins(query, self._on_search_results, search_type)
+    def _on_search_entry_changed(self, widget):
+        """Programa una búsqueda cuando el usuario deja de escribir"""
+        self._cancel_pending_search()
+        query = self.search_entry.get_text().strip()
+        if not query:
+            self.plugin_controller.cancel_search()
+            self._forget_pending_icons()
+            self.online_search_store.clear()
+            return
+        if len(query) < SEARCH_MIN_QUERY_LENGTH:
+            # Los resultados de una consulta más larga ya no corresponden a lo escrito
+            self.plugin_controller.cancel_search()
+            return
+        self._search_timeout_id = GLib.timeout_add(SEARCH_DEBOUNCE_MS, self._on_search_debounced)
+
+    def _on_search_debounced(self):
+        self._search_timeout_id = None
+        query = self.search_entry.get_text().strip()
+        if len(query) >= SEARCH_MIN_QUERY_LENGTH:
+            self._start_online_search(query)
+        return False
+
+    def _cancel_pending_search(self):
+        if self._search_timeout_id:
+            GLib.source_remove(self._search_timeout_id)
+            self._search_timeout_id = None
+
+    def _start_online_search(self, query):
+        """Lanza la búsqueda; la anterior se cancela y sus resultados se descartan"""
+        search_type = self.search_type_combo.get_active_id()
+        source = self.source_combo.get_active_id()
+        # Las fuentes se consultan en paralelo y la lista se actualiza según responden
+        sources = None if source == "All" else [source]
+        # La primera respuesta sustituye la lista; las siguientes solo la actualizan
+        self._replace_search_rows = True
+        self.plugin_controller.search_all_plugins(
+            query, self._on_search_results, search_type, sources, offline=self.offline_check.get_active()
+        )
+
+    def _catalog_file_dialog(self, title, action):
+        """Diálogo para elegir una instantánea del catálogo (.json o .json.gz)"""
+        dialog = Gtk.FileChooserDialog(title=title, parent=self.parent_window, action=action)
+        dialog.add_button(_("Cancel"), Gtk.ResponseType.CANCEL)
+        dialog.add_button(_("Save") if action == Gtk.FileChooserAction.SAVE else _("Open"), Gtk.ResponseType.OK)
+        filter_catalog = Gtk.FileFilter()
+        filter_catalog.set_name(_("Catalog snapshots"))
+        filter_catalog.add_pattern("*.json")
+        filter_catalog.add_pattern("*.json.gz")
+        dialog.add_filter(filter_catalog)
+        if action == Gtk.FileChooserAction.SAVE:
+            dialog.set_do_overwrite_confirmation(True)
+            dialog.set_current_name("catalog.json.gz")
+        response = dialog.run()
+        file_path = dialog.get_filename()
+        dialog.destroy()
+        return file_path if response == Gtk.ResponseType.OK else None
+
+    def _log_catalog_result(self, success, message):
+        prefix = "✓" if success else "✗"
+        self.console_manager.log_to_console(f"{prefix} {message}\n")
+
+    def _on_import_catalog_clicked(self, widget):
+        """Importa una instantánea del catálogo para buscar sin conexión"""
+        file_path = self._catalog_file_dialog(_("Import Catalog Snapshot"), Gtk.FileChooserAction.OPEN)
+        if file_path:
+            self.plugin_controller.import_catalog_snapshot(file_path, self._log_catalog_result)
+
+    def _on_export_catalog_clicked(self, widget):
+        """Guarda el catálogo local en un archivo"""
+        file_path = self._catalog_file_dialog(_("Export Catalog Snapshot"), Gtk.FileChooserAction.SAVE)
+        if file_path:
+            self.plugin_controller.export_catalog_snapshot(file_path, self._log_catalog_result)
 
     def _on_search_type_changed(self, combo):
         """Maneja el cambio en el tipo de búsqueda"""
@@ -418,6 +632,7 @@ class PluginManagementPage:
             self.search_entry.set_placeholder_text(_("Search mods..."))
         else:
             self.search_entry.set_placeholder_text(_("Search plugins/mods..."))
+        self._on_search_entry_changed(combo)
 
     def _on_download_online_plugin_clicked(self, widget):
         """Maneja el clic en descargar plugin online"""
@@ -432,16 +647,10 @@ class PluginManagementPage:
             self.console_manager.log_to_console("Please select a plugin to download.\n")
             return
 
-        plugin_type = model[treeiter][0]
-        plugin_name = model[treeiter][1]
-        plugin_source = model[treeiter][2]
-        plugin_version = model[treeiter][3]
-        
-        # Obtener el project_id de forma segura
-        try:
-            project_id = model[treeiter][6]
-        except (IndexError, TypeError):
-            project_id = ""
+        plugin = model[treeiter][0]
+        plugin_name = plugin.name
+        plugin_source = plugin.source
+        project_id = plugin.project_id
         
         if not project_id:
             self.console_manager.log_to_console("Error: No project ID available for download.\n")
@@ -510,12 +719,71 @@ class PluginManagementPage:
                 download_callback,
             )
         else:
-            self.plugin_controller.download_modrinth_plugin(
-                plugin_name,
-                project_id,
-                self.selected_server.path,
-                download_callback,
+            server_path = self.selected_server.path
+
+            # Resolver dependencias y mostrar el plan antes de descargar
+            def plan_callback(plan, message):
+                if plan is None:
+                    download_callback(False, message)
+                    return
+                if plan.needs_confirmation() and not InstallPlanDialog(self.parent_window, plan).run_and_get_response():
+                    self.console_manager.log_to_console(f"Installation of {plugin_name} cancelled.\n")
+                    self.download_spinner.stop()
+                    self.download_spinner.hide()
+                    self.download_label.show()
+                    self.download_button.set_sensitive(True)
+                    return
+                self.plugin_controller.install_plan(plan, server_path, download_callback)
+
+            self.plugin_controller.plan_modrinth_install(plugin_name, project_id, server_path, plan_callback)
+
+    def _on_install_on_servers_clicked(self, widget):
+        """Instala o actualiza el resultado seleccionado en varios servidores a la vez"""
+        servers = self.server_controller.get_servers() if self.server_controller else []
+        if not servers:
+            self.console_manager.log_to_console("No servers configured.\n")
+            return
+
+        model, treeiter = self.online_search_view.get_selection().get_selected()
+        if not treeiter:
+            self.console_manager.log_to_console("Please select a plugin to install.\n")
+            return
+        plugin = model[treeiter][0]
+        plugin_name, plugin_source, project_id = plugin.name, plugin.source, plugin.project_id
+        if not project_id:
+            self.console_manager.log_to_console("Error: No project ID available for download.\n")
+            return
+
+        is_starting = self.server_controller.is_server_starting
+        dialog = FleetInstallDialog(self.parent_window, plugin_name, servers, self.selected_server, is_starting)
+        response = dialog.run()
+        selected = dialog.get_selected_servers()
+        dialog.destroy()
+        if response != Gtk.ResponseType.OK or not selected:
+            return
+
+        def install_callback(results, message):
+            if results is None:
+                self.console_manager.log_to_console(f"✗ {message}\n")
+                return
+            self.console_manager.log_to_console(f"{message}\n")
+            if self.selected_server and any(
+                result.server_path == self.selected_server.path and result.succeeded() for result in results
+            ):
+                self.plugin_controller.refresh_local_plugins(self.selected_server.path)
+            dialog = Gtk.MessageDialog(
+                parent=self.parent_window,
+                flags=Gtk.DialogFlags.MODAL,
+                message_type=Gtk.MessageType.INFO if all(r.succeeded() for r in results) else Gtk.MessageType.WARNING,
+                buttons=Gtk.ButtonsType.OK,
+                text=message
             )
+            dialog.format_secondary_text("\n".join(result.describe() for result in results))
+            dialog.run()
+            dialog.destroy()
+
+        self.plugin_controller.install_on_servers(plugin_source, plugin_name, project_id, selected, install_callback,
+                                                  is_starting)
 
     def _on_update_local_plugin_clicked(self, widget):
         """Maneja el clic en actualizar plugin local"""
@@ -527,9 +795,9 @@ class PluginManagementPage:
             return
 
         plugin_type = model[treeiter][0]
-        plugin_name = model[treeiter][2]  # Nombre ahora en índice 2
-        install_method = model[treeiter][4]  # Método ahora en índice 4
-        plugin_path = model[treeiter][5]  # Ruta ahora en índice 5
+        plugin_name = model[treeiter][1]  # Nombre (índice 1)
+        install_method = model[treeiter][3]  # Método de instalación (índice 3)
+        plugin_path = model[treeiter][4]  # Ruta (índice 4)
         
         if install_method == "Manual":
             dialog = Gtk.MessageDialog(
@@ -550,9 +818,8 @@ class PluginManagementPage:
             dialog.destroy()
 
         else:
-            # Obtener el objeto Plugin para acceder a metadatos
-            plugins = self.plugin_controller.get_local_plugins(self.selected_server.path)
-            plugin_obj = next((p for p in plugins if p.name == plugin_name), None)
+            # El objeto Plugin (con sus metadatos) sale del último escaneo, sin volver a leer la carpeta
+            plugin_obj = self._local_plugins.get(plugin_path or plugin_name)
 
             if not plugin_obj or not plugin_obj.project_id:
                 self.console_manager.log_to_console(f"Cannot update {plugin_name}: missing project ID.\n")
@@ -605,6 +872,141 @@ class PluginManagementPage:
 
             self.plugin_controller.update_plugin(plugin_obj, self.selected_server.path, update_callback)
 
+    def _on_check_all_updates_clicked(self, widget):
+        """Comprueba de una vez las actualizaciones de todos los plugins y mods"""
+        if not self.selected_server:
+            self.console_manager.log_to_console("Please select a server first.\n")
+            return
+
+        self.check_updates_button.set_sensitive(False)
+        server_path = self.selected_server.path
+
+        def check_callback(updates, message):
+            self.check_updates_button.set_sensitive(True)
+            if updates is None:
+                self.console_manager.log_to_console(f"✗ Update check failed: {message}\n")
+                return
+            if not updates:
+                self.console_manager.log_to_console("No installed Modrinth, Spigot or CurseForge projects to check.\n")
+                return
+
+            dialog = PluginUpdatesDialog(self.parent_window, updates)
+            response = dialog.run()
+            selected = dialog.get_selected_updates()
+            dialog.destroy()
+            if response != Gtk.ResponseType.OK or not selected:
+                return
+
+            def update_callback(success, update_message):
+                if success:
+                    self.console_manager.log_to_console(f"✓ {update_message}\n")
+                    self.plugin_controller.refresh_local_plugins(server_path)
+                else:
+                    self.console_manager.log_to_console(f"✗ Update failed: {update_message}\n")
+
+            self.console_manager.log_to_console(f"Updating {len(selected)} plugins/mods...\n")
+            self.plugin_controller.apply_plugin_updates(server_path, selected, update_callback)
+
+        self.plugin_controller.check_all_updates(server_path, check_callback)
+
+    def _on_find_duplicates_clicked(self, widget):
+        """Busca JAR duplicados y ofrece conservar solo la copia más nueva"""
+        if not self.selected_server:
+            self.console_manager.log_to_console("Please select a server first.\n")
+            return
+        server_path = self.selected_server.path
+
+        def duplicates_callback(groups):
+            if not groups:
+                self.console_manager.log_to_console("No duplicate plugins or mods found.\n")
+                return
+            details = "\n".join(
+                _("{group}\n    → keep {file}").format(group=group.describe(), file=group.newest().file_name)
+                for group in groups
+            )
+            dialog = Gtk.MessageDialog(
+                parent=self.parent_window,
+                flags=Gtk.DialogFlags.MODAL,
+                message_type=Gtk.MessageType.WARNING,
+                buttons=Gtk.ButtonsType.NONE,
+                text=_("Found {count} duplicated plugins or mods").format(count=len(groups))
+            )
+            dialog.format_secondary_text(details)
+            dialog.add_button(_("Cancel"), Gtk.ResponseType.CANCEL)
+            dialog.add_button(_("Keep Newest"), Gtk.ResponseType.OK)
+            response = dialog.run()
+            dialog.destroy()
+            if response != Gtk.ResponseType.OK:
+                return
+            removed = self.plugin_controller.remove_duplicates(server_path, groups)
+            self.console_manager.log_to_console(f"✓ Removed {removed} duplicate files\n")
+            self.plugin_controller.refresh_local_plugins(server_path)
+
+        self.plugin_controller.find_duplicates(server_path, duplicates_callback)
+
+    def _on_audit_client_mods_clicked(self, widget):
+        """Busca mods que solo funcionan en el cliente y ofrece desactivarlos"""
+        if not self.selected_server:
+            self.console_manager.log_to_console("Please select a server first.\n")
+            return
+        server_path = self.selected_server.path
+
+        def audit_callback(mods):
+            if not mods:
+                self.console_manager.log_to_console("No client-only mods found.\n")
+                return
+            dialog = Gtk.MessageDialog(
+                parent=self.parent_window,
+                flags=Gtk.DialogFlags.MODAL,
+                message_type=Gtk.MessageType.WARNING,
+                buttons=Gtk.ButtonsType.NONE,
+                text=_("Found {count} client-only mods").format(count=len(mods))
+            )
+            dialog.format_secondary_text(
+                _("These mods only work on the game client and slow down the server:") + "\n\n"
+                + "\n".join(os.path.basename(mod.file_path) for mod in mods) + "\n\n"
+                + _("Disabled mods are renamed to .jar.disabled and can be restored later.")
+            )
+            dialog.add_button(_("Cancel"), Gtk.ResponseType.CANCEL)
+            dialog.add_button(_("Disable"), Gtk.ResponseType.OK)
+            response = dialog.run()
+            dialog.destroy()
+            if response != Gtk.ResponseType.OK:
+                return
+            disabled = self.plugin_controller.disable_mods(mods)
+            self.console_manager.log_to_console(f"✓ Disabled {disabled} client-only mods\n")
+            self.plugin_controller.refresh_local_plugins(server_path)
+
+        self.plugin_controller.audit_client_only_mods(server_path, audit_callback)
+
+    def _on_startup_times_clicked(self, widget):
+        """Muestra cuánto tarda cada plugin en cargar y activarse"""
+        if not self.selected_server:
+            self.console_manager.log_to_console("Please select a server first.\n")
+            return
+
+        def profiles_callback(history, message):
+            if not history:
+                self.console_manager.log_to_console(
+                    f"{message}. Start the server once to record plugin startup times.\n"
+                )
+                return
+            dialog = StartupProfileDialog(self.parent_window, history)
+            dialog.run()
+            dialog.destroy()
+
+        self.plugin_controller.load_startup_profiles(self.selected_server.path, profiles_callback)
+
+    def on_startup_profile(self, server_path, profile):
+        """Callback cuando un servidor termina de arrancar: resume los plugins más lentos"""
+        slowest = [timing for timing in profile.ranked()[:3] if timing.total_seconds > 0]
+        if not slowest:
+            return
+        details = ", ".join(f"{timing.name} {timing.total_seconds:.1f}s" for timing in slowest)
+        self.console_manager.log_to_console(
+            f"Plugins took {profile.plugins_seconds():.1f}s to start. Slowest: {details}\n"
+        )
+
     def _on_view_plugin_info_clicked(self, widget):
         """Maneja el clic en ver información del plugin"""
         selection = self.online_search_view.get_selection()
@@ -614,19 +1016,12 @@ class PluginManagementPage:
             self.console_manager.log_to_console("Please select a plugin to view info.\n")
             return
 
-        plugin_type = model[treeiter][0]
-        plugin_name = model[treeiter][1]
-        plugin_source = model[treeiter][2]
-        plugin_version = model[treeiter][3]
-        
-        # Intentar obtener la descripción de forma segura
-        try:
-            plugin_description = model[treeiter][4]
-            if not plugin_description:
-                plugin_description = "No description available"
-        except (IndexError, TypeError) as e:
-            plugin_description = "No description available"
-            self.console_manager.log_to_console(f"DEBUG: Error getting description: {e}\n")
+        plugin = model[treeiter][0]
+        plugin_type = plugin.project_type
+        plugin_name = plugin.name
+        plugin_source = plugin.source
+        plugin_version = plugin.version
+        plugin_description = self._search_result_description(plugin) or "No description available"
         
         dialog = Gtk.MessageDialog(
             parent=self.parent_window,
@@ -655,86 +1050,169 @@ class PluginManagementPage:
     def update_plugin_info(self, server: MinecraftServer):
         """Actualiza la información de plugins"""
         if server:
-            self.plugin_server_label.set_text(_("Managing plugins for: {name}").format(name=server.name))
+            platform = self.plugin_controller.get_server_platform(server.path)
+            self.plugin_server_label.set_text(
+                _("Managing plugins for: {name} ({platform})").format(name=server.name, platform=platform.describe())
+            )
         else:
             self.plugin_server_label.set_text(_("Select a server to manage plugins."))
 
+    def _local_plugin_row(self, plugin, index):
+        # El descriptor del JAR indica el tipo; el nombre es el último recurso
+        jar_metadata = plugin.jar_metadata or {}
+        plugin_type = jar_metadata.get("type") or self._detect_plugin_type(plugin.file_path or plugin.name)
+        return [
+            plugin_type,        # Tipo (índice 0, también decide el icono)
+            plugin.name,        # Nombre (índice 1)
+            plugin.version,     # Versión (índice 2)
+            plugin.get_install_method_display(),  # Método de instalación (índice 3)
+            plugin.file_path or "",  # Ruta (índice 4)
+            index,              # Orden en la carpeta (índice 5)
+            plugin.client_only  # Solo cliente (índice 6)
+        ]
+
+    def _fill_store(self, view, store, rows, replace=True):
+        """Añade muchas filas de una vez sin reordenar ni redibujar fila a fila
+        
+        Al reemplazar el contenido se desconecta el modelo de la vista durante
+        el llenado; al añadir al final se mantiene conectado para no perder la
+        posición del scroll.
+        """
+        sort_column, sort_order = store.get_sort_column_id()
+        if sort_column is not None:
+            store.set_sort_column_id(Gtk.TREE_SORTABLE_UNSORTED_SORT_COLUMN_ID, Gtk.SortType.ASCENDING)
+        if replace:
+            view.set_model(None)
+            store.clear()
+        columns = list(range(store.get_n_columns()))
+        for row in rows:
+            store.insert_with_valuesv(-1, columns, row)
+        if replace:
+            view.set_model(store)
+        if sort_column is not None:
+            store.set_sort_column_id(sort_column, sort_order)
+
+    def on_plugin_scanned(self, index, plugin, done, total):
+        """Callback por cada JAR leído: añade la fila en su posición final"""
+        if not self.local_plugin_store:
+            return
+        if done == 1:
+            # Primer resultado de un escaneo nuevo
+            self.local_plugin_store.clear()
+            self._scanned_indices = []
+            self._local_plugins = {}
+            self.scan_progress_bar.show()
+
+        # Los JAR llegan desordenados: la posición se busca en la lista ordenada de índices
+        position = bisect.bisect(self._scanned_indices, index)
+        self._scanned_indices.insert(position, index)
+        self.local_plugin_store.insert(position, self._local_plugin_row(plugin, index))
+        self._local_plugins[plugin.file_path or plugin.name] = plugin
+
+        self.scan_progress_bar.set_fraction(done / total)
+        self.scan_progress_bar.set_text(_("Reading {done} of {total} files...").format(done=done, total=total))
+
     def on_plugins_updated(self, plugins):
         """Callback cuando se actualizan los plugins"""
-        if self.local_plugin_store:
-            self.local_plugin_store.clear()
-            for plugin in plugins:
-                plugin_type = self._detect_plugin_type(plugin.file_path or plugin.name)
-                install_method = getattr(plugin, 'install_method', 'Manual')
-                display_method = plugin.get_install_method_display() if hasattr(plugin, 'get_install_method_display') else install_method
-                self.local_plugin_store.append([
-                    plugin_type,        # Tipo (índice 0)
-                    plugin_type,        # icon_name (índice 1, no se usa directamente)
-                    plugin.name,        # Nombre (índice 2)
-                    plugin.version,     # Versión (índice 3)
-                    display_method,     # Método de instalación (índice 4)
-                    plugin.file_path or ""  # Ruta (índice 5)
-                ])
+        if self.scan_progress_bar:
+            self.scan_progress_bar.hide()
+        self._local_plugins = {plugin.file_path or plugin.name: plugin for plugin in plugins}
+        if not self.local_plugin_store:
+            return
+        # Si las filas ya llegaron una a una durante el escaneo no hay que rehacer la lista
+        scanned_rows = len(self._scanned_indices)
+        self._scanned_indices = []
+        if scanned_rows == len(plugins) == len(self.local_plugin_store):
+            return
+        self._fill_store(
+            self.local_plugin_view, self.local_plugin_store,
+            [self._local_plugin_row(plugin, index) for index, plugin in enumerate(plugins)],
+        )
+
+    def on_download_progress(self, message):
+        """Callback con el progreso de la descarga en curso"""
+        if self.download_progress_label:
+            self.download_progress_label.set_text(message)
 
     def _on_search_results(self, plugins):
-        """Callback con resultados de búsqueda"""
+        """Callback con resultados de búsqueda (se llama cada vez que responde una fuente)"""
         if self.online_search_store:
-            self.online_search_store.clear()
-            for plugin in plugins:
-                # Determinar tipo basado en categorías de Modrinth
-                plugin_type = getattr(plugin, 'project_type', 'plugin')  # Default a plugin
-                plugin_type_display = plugin_type.capitalize()  # Capitalizar para mostrar (Mod, Plugin)
-                description = getattr(plugin, 'description', 'No description available')
-                icon_url = getattr(plugin, 'icon_url', '')
-                project_id = getattr(plugin, 'project_id', '')
-                
-                row_data = [
-                    plugin_type_display,  # Mostrar con mayúscula inicial
-                    plugin.name, 
-                    plugin.source, 
-                    plugin.version,
-                    description,
-                    icon_url,
-                    project_id
-                ]
-                
-                self.online_search_store.append(row_data)
-                
-                # Iniciar descarga de icono inmediatamente si hay URL
-                if icon_url and icon_url not in self.icon_cache:
-                    self._preload_icon(icon_url, plugin.name, plugin_type)
-    
-    def _preload_icon(self, icon_url, plugin_name, plugin_type):
-        """Precarga un icono para que esté disponible inmediatamente"""
-        def download_icon():
-            try:
-                # Crear un directorio temporal para los iconos
-                temp_dir = os.path.join(tempfile.gettempdir(), "minecraft_server_manager_icons")
-                os.makedirs(temp_dir, exist_ok=True)
-                
-                # Crear nombre de archivo basado en la URL
-                filename = os.path.join(temp_dir, f"{hash(icon_url)}.png")
-                
-                # Descargar el archivo
-                urllib.request.urlretrieve(icon_url, filename)
-                
-                # Cargar como pixbuf y redimensionar
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(filename)
-                scaled_pixbuf = pixbuf.scale_simple(24, 24, GdkPixbuf.InterpType.BILINEAR)
-                
-                # Guardar en caché
-                self.icon_cache[icon_url] = scaled_pixbuf
-                
-                # Forzar actualización de la vista
-                GLib.idle_add(self.online_search_view.queue_draw)
-                
-                # Limpiar archivo temporal
-                os.remove(filename)
-                
-            except Exception as e:
-                # En caso de error, usar icono por defecto
-                default_icon = self.default_plugin_icon if plugin_type == "plugin" else self.default_mod_icon
-                self.icon_cache[icon_url] = default_icon
+            rows = [self._search_result_row(p) for p in plugins]
+            if self._replace_search_rows or not self._update_search_rows(rows):
+                self._replace_search_rows = False
+                self._forget_pending_icons()
+                self._fill_store(self.online_search_view, self.online_search_store, rows)
+            # Si la primera página no llena la vista no habrá scroll: pedir más
+            GLib.idle_add(self._check_load_more)
+
+    def _update_search_rows(self, rows):
+        """Actualiza la lista de resultados en su sitio para conservar la selección y el scroll
         
-        # Ejecutar descarga en hilo separado
-        threading.Thread(target=download_icon, daemon=True).start()
+        Solo se insertan, mueven, cambian o quitan las filas afectadas.
+        Devuelve False si las filas no se pueden identificar (claves repetidas).
+        """
+        store = self.online_search_store
+        row_key = lambda row: (row[0].source, row[0].project_id or row[0].name)  # fuente y proyecto
+        wanted = {row_key(row) for row in rows}
+        if len(wanted) != len(rows):
+            return False
+
+        iters = {}
+        treeiter = store.get_iter_first()
+        while treeiter is not None:
+            next_iter = store.iter_next(treeiter)
+            key = row_key(store[treeiter])
+            if key in wanted and key not in iters:
+                iters[key] = treeiter
+            else:
+                store.remove(treeiter)
+            treeiter = next_iter
+
+        # Con una columna de orden elegida por el usuario la posición la decide el modelo
+        unsorted = store.get_sort_column_id()[0] is None
+        columns = list(range(store.get_n_columns()))
+        for position, row in enumerate(rows):
+            treeiter = iters.get(row_key(row))
+            if treeiter is None:
+                store.insert_with_valuesv(position, columns, row)
+                continue
+            if store[treeiter][0] is not row[0]:
+                store.set(treeiter, columns, row)
+            if unsorted and store.get_path(treeiter).get_indices()[0] != position:
+                store.move_before(treeiter, store.iter_nth_child(None, position))
+        return True
+
+    def _on_more_search_results(self, plugins):
+        """Callback con una página adicional de resultados"""
+        if self.online_search_store:
+            self._fill_store(
+                self.online_search_view, self.online_search_store, [self._search_result_row(p) for p in plugins],
+                replace=False,
+            )
+            GLib.idle_add(self._check_load_more)
+
+    def _search_result_row(self, plugin):
+        """Fila de la lista de resultados para un resultado de búsqueda"""
+        return [plugin]
+
+    def _search_result_description(self, plugin):
+        """Descripción de un resultado con los avisos de cliente y otras fuentes"""
+        description = plugin.description
+        # Indicar otras fuentes en las que también está el proyecto
+        if plugin.also_on:
+            description = f"{description}\n" + _("Also on: {sources}").format(sources=", ".join(plugin.also_on))
+        if plugin.client_only:
+            description = "⚠ " + _("Client-only: not needed on a server") + f"\n{description}"
+        return description
+
+    def _on_search_scrolled(self, adjustment):
+        """Pide la página siguiente cuando queda menos de media pantalla por ver"""
+        remaining = adjustment.get_upper() - (adjustment.get_value() + adjustment.get_page_size())
+        if remaining < adjustment.get_page_size() / 2:
+            self.plugin_controller.load_more_search_results(self._on_more_search_results)
+
+    def _check_load_more(self):
+        parent = self.online_search_view.get_parent() if self.online_search_view else None
+        if parent:
+            self._on_search_scrolled(parent.get_vadjustment())
+        return False
@@ -0,0 +1,79 @@
+"""
+Diálogo con las actualizaciones disponibles de plugins y mods
+"""
+import gi
+import gettext
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
+
+_ = gettext.gettext
+
+from typing import List
+
+from models.plugin_update import PluginUpdate
+
+
+class PluginUpdatesDialog(Gtk.Dialog):
+    def __init__(self, parent, updates: List[PluginUpdate]):
+        super().__init__(title=_("Plugin and Mod Updates"), parent=parent, flags=Gtk.DialogFlags.MODAL)
+        self.updates = updates
+
+        self.add_button(_("Close"), Gtk.ResponseType.CANCEL)
+        self.update_button = self.add_button(_("Update Selected"), Gtk.ResponseType.OK)
+        self.set_default_size(640, 420)
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Configura la tabla de actualizaciones"""
+        box = self.get_content_area()
+        box.set_spacing(6)
+        box.set_border_width(10)
+
+        available = [update for update in self.updates if update.has_update()]
+        summary = _("{available} of {total} projects have updates.").format(
+            available=len(available), total=len(self.updates)
+        )
+        summary_label = Gtk.Label(label=summary)
+        summary_label.set_halign(Gtk.Align.START)
+        box.pack_start(summary_label, False, False, 0)
+
+        # selected, name, current, latest, index, source
+        self.store = Gtk.ListStore(bool, str, str, str, int, str)
+        for index, update in enumerate(self.updates):
+            latest = update.latest_version if update.has_update() else _("Up to date")
+            self.store.append([update.has_update(), update.name, update.current_version, latest, index, update.source])
+
+        view = Gtk.TreeView(model=self.store)
+
+        toggle_renderer = Gtk.CellRendererToggle()
+        toggle_renderer.connect("toggled", self._on_toggled)
+        toggle_column = Gtk.TreeViewColumn("", toggle_renderer, active=0)
+        view.append_column(toggle_column)
+
+        columns = [(_("Name"), 1), (_("Source"), 5), (_("Installed"), 2), (_("Latest"), 3)]
+        for title, index in columns:
+            renderer = Gtk.CellRendererText()
+            column = Gtk.TreeViewColumn(title, renderer, text=index)
+            if index == 1:
+                column.set_expand(True)
+            view.append_column(column)
+
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_hexpand(True)
+        scrolled.set_vexpand(True)
+        scrolled.add(view)
+        box.pack_start(scrolled, True, True, 0)
+
+        self.update_button.set_sensitive(bool(available))
+        self.show_all()
+
+    def _on_toggled(self, renderer, path):
+        row = self.store[path]
+        # Solo se pueden marcar las filas con actualización
+        if self.updates[row[4]].has_update():
+            row[0] = not row[0]
+
+    def get_selected_updates(self) -> List[PluginUpdate]:
+        """Devuelve las actualizaciones marcadas"""
+        return [self.updates[row[4]] for row in self.store if row[0]]
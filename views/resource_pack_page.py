@@ -19,6 +19,7 @@ class ResourcePackPage:
         self.console_manager = console_manager
         self.resource_pack_controller = resource_pack_controller
         self.selected_server = None
+        self.progress_label = None
 
     def create_page(self):
         page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
@@ -80,6 +81,10 @@ class ResourcePackPage:
 
         page.pack_start(controls_box, False, False, 0)
 
+        self.progress_label = Gtk.Label(label="")
+        self.progress_label.set_halign(Gtk.Align.START)
+        page.pack_start(self.progress_label, False, False, 0)
+
         return page
 
     def select_server(self, server: MinecraftServer):
@@ -105,6 +110,11 @@ class ResourcePackPage:
         else:
             self.active_pack_label.set_text(_("Active pack: None"))
 
+    def on_download_progress(self, message):
+        """Muestra el progreso de la descarga en curso"""
+        if self.progress_label:
+            self.progress_label.set_text(message)
+
     def on_download_clicked(self, widget):
         if not self.selected_server:
             return
@@ -397,7 +397,12 @@ class ServerManagementPage:
         if not self._check_and_handle_eula():
             return
 
-        self.server_controller.start_server(self.selected_server)
+        # El proceso se lanza tras la revisión de dependencias, que se hace en segundo plano;
+        # mientras tanto el botón de inicio queda desactivado
+        self.server_controller.start_server(self.selected_server, self._update_parent_buttons)
+        self._update_parent_buttons()
+
+    def _update_parent_buttons(self, *args):
         # Notificar al parent window para actualizar botones
         if hasattr(self.parent_window, '_update_header_buttons'):
             self.parent_window._update_header_buttons()
@@ -0,0 +1,87 @@
+"""
+Diálogo con el tiempo de carga y activación de cada plugin al arrancar
+"""
+import gi
+import gettext
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
+
+_ = gettext.gettext
+
+from typing import List
+
+from utils.startup_profiler import StartupProfile, average_timings
+
+
+class StartupProfileDialog(Gtk.Dialog):
+    def __init__(self, parent, history: List[StartupProfile]):
+        super().__init__(title=_("Plugin Startup Times"), parent=parent, flags=Gtk.DialogFlags.MODAL)
+        self.history = history
+
+        self.add_button(_("Close"), Gtk.ResponseType.CLOSE)
+        self.set_default_size(680, 440)
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Configura la tabla de tiempos del último arranque"""
+        box = self.get_content_area()
+        box.set_spacing(6)
+        box.set_border_width(10)
+
+        latest = self.history[0]
+        previous = next((run for run in self.history[1:] if run.complete), None)
+        averages = average_timings(self.history)
+        runs = sum(1 for run in self.history if run.complete)
+
+        if latest.total_seconds is not None:
+            summary = _("Last startup took {total:.1f}s; plugins took {plugins:.1f}s. Averages over {runs} startups.").format(
+                total=latest.total_seconds, plugins=latest.plugins_seconds(), runs=runs
+            )
+        else:
+            summary = _("The last startup did not finish; plugins took {plugins:.1f}s.").format(
+                plugins=latest.plugins_seconds()
+            )
+        summary_label = Gtk.Label(label=summary)
+        summary_label.set_halign(Gtk.Align.START)
+        summary_label.set_line_wrap(True)
+        box.pack_start(summary_label, False, False, 0)
+
+        # name, version, load, enable, total, average, change, total (para ordenar)
+        store = Gtk.ListStore(str, str, str, str, str, str, str, float)
+        for timing in latest.ranked():
+            average = averages.get(timing.name)
+            change = ""
+            if previous and timing.name in previous.timings:
+                delta = timing.total_seconds - previous.timings[timing.name].total_seconds
+                change = f"{delta:+.2f}s"
+            store.append([
+                timing.name,
+                timing.version,
+                f"{timing.load_seconds:.2f}s",
+                f"{timing.enable_seconds:.2f}s",
+                f"{timing.total_seconds:.2f}s",
+                f"{average:.2f}s" if average is not None else "",
+                change,
+                timing.total_seconds,
+            ])
+
+        view = Gtk.TreeView(model=store)
+        columns = [(_("Plugin"), 0), (_("Version"), 1), (_("Load"), 2), (_("Enable"), 3),
+                   (_("Total"), 4), (_("Average"), 5), (_("Since Last"), 6)]
+        for title, index in columns:
+            renderer = Gtk.CellRendererText()
+            column = Gtk.TreeViewColumn(title, renderer, text=index)
+            if index == 0:
+                column.set_expand(True)
+            if index == 4:
+                column.set_sort_column_id(7)
+            view.append_column(column)
+
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_hexpand(True)
+        scrolled.set_vexpand(True)
+        scrolled.add(view)
+        box.pack_start(scrolled, True, True, 0)
+
+        self.show_all()
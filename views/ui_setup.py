@@ -168,6 +168,7 @@ class UISetup:
         config_row = UISetup.create_sidebar_row(_("Config Editor"), "preferences-system")
         port_row = UISetup.create_sidebar_row(_("Port Analyzer"), "network-server")
         logs_row = UISetup.create_sidebar_row(_("Logs"), "text-x-log")
+        downloads_row = UISetup.create_sidebar_row(_("Downloads"), "folder-download")
 
         sidebar_list.add(server_row)
         sidebar_list.add(plugin_row)
@@ -176,6 +177,7 @@ class UISetup:
         sidebar_list.add(config_row)
         sidebar_list.add(port_row)
         sidebar_list.add(logs_row)
+        sidebar_list.add(downloads_row)
 
         sidebar_box.pack_start(sidebar_list, True, True, 0)  # Asegurando que la lista ocupe espacio en el contenedor
 
@@ -191,7 +193,8 @@ class UISetup:
             'resource_row': resource_row,
             'config_row': config_row,
             'port_row': port_row,
-            'logs_row': logs_row
+            'logs_row': logs_row,
+            'downloads_row': downloads_row
         }
 
     @staticmethod